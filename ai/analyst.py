@@ -1,15 +1,92 @@
 from google import genai
+import asyncio
 import json
-from config.config import GEMINI_API_KEY
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from config.config import GEMINI_API_KEY, AI_TIMEOUT_SECONDS, AI_MAX_CONCURRENCY
 
 class AIAnalyst:
+    # V16.0: Model calls run on a dedicated thread pool, never on the event loop.
+    # One pool and one concurrency limit are shared by every analyst in the process.
+    _executor = ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY, thread_name_prefix="ai")
+    _limits = {}  # event loop -> asyncio.Semaphore
+
     def __init__(self):
         if GEMINI_API_KEY:
-            self.client = genai.Client(api_key=GEMINI_API_KEY)
+            # V16.0: HTTP-level timeout, so an abandoned call also frees its worker thread
+            self.client = genai.Client(api_key=GEMINI_API_KEY,
+                                       http_options={'timeout': int(AI_TIMEOUT_SECONDS * 1000)})
             self.model_id = 'gemini-2.0-flash' # Upgrading to the latest standard
         else:
             self.client = None
 
+    @classmethod
+    def _semaphore(cls) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = cls._limits.get(loop)
+        if semaphore is None:
+            # Drop limits of closed loops (one per test run / restart)
+            cls._limits = {l: sem for l, sem in cls._limits.items() if not l.is_closed()}
+            semaphore = cls._limits[loop] = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+        return semaphore
+
+    async def _call(self, prompt: str, timeout: Optional[float] = None, config: Optional[dict] = None):
+        """
+        V16.0: Non-blocking model call. Waits for a concurrency slot, runs the
+        synchronous client on the AI thread pool and gives up after `timeout`
+        seconds (asyncio.TimeoutError), queueing included. Cancelling the
+        caller abandons the call.
+        """
+        timeout = AI_TIMEOUT_SECONDS if timeout is None else timeout
+        kwargs = {'model': self.model_id, 'contents': prompt}
+        if config is not None:
+            kwargs['config'] = config
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        semaphore = self._semaphore()
+        # With a free slot the call is submitted before the first suspension,
+        # so a caller that started it as a task overlaps it after one yield
+        if semaphore.locked():
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        else:
+            await semaphore.acquire()
+        future = loop.run_in_executor(
+            self._executor, lambda: self.client.models.generate_content(**kwargs)
+        )
+        # The slot is held until the worker thread is really free, not just until
+        # the caller stops waiting, so hung requests cannot over-fill the pool
+        future.add_done_callback(lambda _: semaphore.release())
+        return await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - loop.time()))
+
+    async def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """Free-text completion of `prompt`."""
+        response = await self._call(prompt, timeout)
+        return response.text.strip()
+
+    async def generate_json(self, prompt: str, schema: dict, timeout: Optional[float] = None,
+                            max_output_tokens: Optional[int] = None) -> Tuple[Any, Dict[str, int]]:
+        """
+        V16.0: JSON-mode completion constrained to the response `schema`.
+        Returns the decoded JSON and the call's token usage.
+        """
+        config = {'response_mime_type': 'application/json', 'response_schema': schema}
+        if max_output_tokens:
+            config['max_output_tokens'] = max_output_tokens
+        response = await self._call(prompt, timeout, config)
+        parsed = getattr(response, 'parsed', None)
+        if parsed is None:
+            parsed = json.loads(response.text)
+        return parsed, self.usage(response)
+
+    @staticmethod
+    def usage(response) -> Dict[str, int]:
+        """Prompt and output token counts reported for a response (0 when not reported)."""
+        meta = getattr(response, 'usage_metadata', None)
+        return {
+            'prompt': getattr(meta, 'prompt_token_count', None) or 0,
+            'output': getattr(meta, 'candidates_token_count', None) or 0
+        }
+
     async def validate_signal(self, data: dict) -> dict:
         """
         Passes signal data to Gemini for institutional validation.
@@ -36,12 +113,8 @@ class AIAnalyst:
         """
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt
-            )
             # Basic parsing of JSON from AI response
-            raw_text = response.text.strip()
+            raw_text = await self.generate(prompt)
             if "```json" in raw_text:
                 raw_text = raw_text.split("```json")[1].split("```")[0].strip()
             
@@ -73,10 +146,6 @@ class AIAnalyst:
         """
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt
-            )
-            return response.text.strip()
-        except:
+            return await self.generate(prompt)
+        except Exception:
             return "Market awaiting fundamental clarity."
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from typing import Optional
+
+from config.config import AI_RATIONALE_DRAIN_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class RationaleDispatcher:
+    """
+    V16.0: Second phase of a two-phase alert.
+
+    The signal is delivered first with its rule-based details. `dispatch()` then
+    generates the AI rationale in a background task and posts it as a reply to
+    the delivered message, so time-to-first-alert never waits on the model.
+    """
+
+    def __init__(self, telegram, analyst):
+        self.telegram = telegram
+        self.analyst = analyst
+        self.sent = 0
+        self.failed = 0
+        self._tasks = set()
+
+    def will_follow(self, news_events: list) -> bool:
+        """True when a delivered alert gets a rationale reply (no model client or no news: it doesn't)."""
+        return bool(self.analyst.client and news_events)
+
+    def dispatch(self, message, signal: dict, news_events: list) -> Optional[asyncio.Task]:
+        """Schedules the rationale reply for a delivered alert (None when there is nothing to add)."""
+        if message is None or not self.will_follow(news_events):
+            return None  # Nothing delivered, or the analyst would only return its canned text
+        task = asyncio.ensure_future(self._follow_up(message, signal, news_events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _follow_up(self, message, signal: dict, news_events: list):
+        try:
+            rationale = await self.analyst.get_market_sentiment(news_events, signal['symbol'])
+            if await self.telegram.send_reply(message, f"🧠 *AI Market Analysis:*\n• {rationale}"):
+                self.sent += 1
+                return
+        except Exception as e:
+            logger.error(f"AI rationale for {signal.get('symbol')} failed: {e}")
+        self.failed += 1
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def drain(self, timeout: float = AI_RATIONALE_DRAIN_SECONDS):
+        """Waits up to `timeout` seconds for outstanding rationales (single-shot runs exit after this)."""
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
@@ -2,6 +2,8 @@ import asyncio
 import telegram
 from config.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
 
+RATIONALE_PENDING = "_AI rationale follows as a reply._"
+
 class TelegramService:
     def __init__(self):
         self.bot = telegram.Bot(token=TELEGRAM_BOT_TOKEN) if TELEGRAM_BOT_TOKEN else None
@@ -10,15 +12,36 @@ class TelegramService:
     async def send_signal(self, message: str):
         """
         Sends a signal message to Telegram.
+        V16.0: Returns the sent message (None on failure) so follow-ups can reply to it.
         """
         if not self.bot or not self.chat_id:
             print("[ALERTS] Telegram credentials missing. Check your .env or GitHub Secrets.")
-            return
+            return None
 
         try:
-            await self.bot.send_message(chat_id=self.chat_id, text=message, parse_mode='Markdown')
+            return await self.bot.send_message(chat_id=self.chat_id, text=message, parse_mode='Markdown')
         except Exception as e:
             print(f"[ALERTS] Error sending Telegram message: {e}")
+            return None
+
+    async def send_reply(self, message, text: str) -> bool:
+        """
+        V16.0: Posts `text` as a reply to a previously sent message.
+        """
+        if not self.bot or not self.chat_id or message is None:
+            return False
+
+        try:
+            await self.bot.send_message(
+                chat_id=self.chat_id,
+                text=text,
+                reply_to_message_id=message.message_id,
+                parse_mode='Markdown'
+            )
+            return True
+        except Exception as e:
+            print(f"[ALERTS] Error sending Telegram reply: {e}")
+            return False
 
     async def test_connection(self):
         """
@@ -42,20 +65,24 @@ class TelegramService:
     async def send_chart(self, photo, caption: str):
         """
         Sends a chart image with caption.
+        V16.0: Returns the sent message (None on failure).
         """
         if not self.bot or not self.chat_id:
             print("Telegram credentials missing. Chart not sent.")
-            return
+            return None
 
         try:
             # Telegram requires file pointer to be at start
             photo.seek(0) 
-            await self.bot.send_photo(chat_id=self.chat_id, photo=photo, caption=caption, parse_mode='Markdown')
+            return await self.bot.send_photo(chat_id=self.chat_id, photo=photo, caption=caption, parse_mode='Markdown')
         except Exception as e:
             print(f"Error sending Telegram chart: {e}")
-    def format_signal(self, data: dict) -> str:
+            return None
+    def format_signal(self, data: dict, rationale_follows: bool = False) -> str:
         """
         Formats signal data into the strict Telegram format.
+        V16.0: Without 'ai_logic' the AI section only promises a reply when
+        `rationale_follows`; otherwise it is left out.
         """
         header = "⚡ *SMC TOP-DOWN SETUP*"
         emoji = "⚡" # Default emoji
@@ -65,6 +92,8 @@ class TelegramService:
         # Pre-process strings to avoid backslashes in f-string (Fix for Python 3.11)
         symbol_safe = data['symbol'].replace('=X', '').replace('_', '\\_')
         event_safe = data['liquidity_event'].replace('_', '\\_')
+        ai_logic = data.get('ai_logic') or (RATIONALE_PENDING if rationale_follows else None)
+        ai_section = f"🧠 *AI Market Analysis:*\n• {ai_logic}\n" if ai_logic else ""
         
         return f"""
 {emoji} *NEW {data['setup_quality']} SETUP* {"💎 (LAYERING RECOMMENDED)" if data['setup_quality'] == "A+" else ""}
@@ -84,9 +113,7 @@ _Total Vol: {sum(l['lots'] for l in data['layers']):.2f}_
 *Liquidity Event:*
 • {event_safe}
 
-🧠 *AI Market Analysis:*
-• {data['ai_logic']}
-{data.get('confluence', '')}
+{ai_section}{data.get('confluence', '')}
 
 *Entry Zone:*
 • {data['entry_zone']}
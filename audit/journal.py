@@ -6,8 +6,20 @@ import pandas as pd
 class SignalJournal:
     def __init__(self, db_path="database/signals.db"):
         self.db_path = db_path
+        self.listeners = []
         self._init_db()
 
+    def subscribe(self, callback):
+        """V16.0: Registers callback(event, payload) for 'open' and 'result' writes."""
+        self.listeners.append(callback)
+
+    def _emit(self, event, payload):
+        for callback in self.listeners:
+            try:
+                callback(event, payload)
+            except Exception as e:
+                print(f"Journal listener error: {e}")
+
     def _init_db(self):
         # Ensure database directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
@@ -38,12 +50,13 @@ class SignalJournal:
                 pass # Already exists
 
     def log_signal(self, signal_data):
+        timestamp = datetime.now().isoformat()
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+            cursor = conn.execute("""
                 INSERT INTO signals (timestamp, symbol, direction, entry_price, sl, tp0, tp1, tp2, confidence, session, strategy_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                datetime.now().isoformat(),
+                timestamp,
                 signal_data['symbol'],
                 signal_data['direction'],
                 signal_data['entry_price'],
@@ -55,7 +68,7 @@ class SignalJournal:
                 signal_data['session'],
                 signal_data.get('strategy_id', 'unknown')
             ))
-            
+
         # Also log to CSV for PerformanceAnalyzer audit
         csv_path = "audit/journal_v8.csv"
         df = pd.DataFrame([{
@@ -71,6 +84,8 @@ class SignalJournal:
         else:
             df.to_csv(csv_path, mode='a', header=False, index=False)
 
+        self._emit('open', {'id': cursor.lastrowid, 'symbol': signal_data['symbol'], 'timestamp': timestamp})
+
     def get_pending_signals(self):
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
@@ -84,6 +99,12 @@ class SignalJournal:
                 SET status = ?, result_pips = ? 
                 WHERE id = ?
             """, (status, pips, signal_id))
+            if self.listeners:
+                row = conn.execute("SELECT symbol, timestamp FROM signals WHERE id = ?", (signal_id,)).fetchone()
+        if self.listeners:
+            symbol, timestamp = row if row else (None, None)
+            self._emit('result', {'id': signal_id, 'symbol': symbol, 'timestamp': timestamp,
+                                  'status': status, 'pips': pips})
 
     def get_todays_stats(self):
         today = datetime.now().strftime("%Y-%m-%d")
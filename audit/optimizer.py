@@ -4,6 +4,9 @@ import os
 from config.config import ATR_MULTIPLIER
 
 class AutoOptimizer:
+    RESOLVED = ('WIN', 'LOSS', 'BE', 'WIN_PARTIAL', 'PARTIAL_LOSS')
+    AUDIT_CSV = "research/audit_results_v8.csv"
+
     def __init__(self, db_path="database/signals.db"):
         self.db_path = db_path
 
@@ -17,12 +20,13 @@ class AutoOptimizer:
             if os.path.exists(self.db_path):
                 with sqlite3.connect(self.db_path) as conn:
                     # Get last 50 trades
-                    query = "SELECT symbol, status FROM signals WHERE status IN ('WIN', 'LOSS', 'BE', 'WIN_PARTIAL', 'PARTIAL_LOSS') ORDER BY id DESC LIMIT 50"
-                    df = pd.read_sql_query(query, conn)
+                    placeholders = ",".join("?" * len(self.RESOLVED))
+                    query = f"SELECT symbol, status FROM signals WHERE status IN ({placeholders}) ORDER BY id DESC LIMIT 50"
+                    df = pd.read_sql_query(query, conn, params=self.RESOLVED)
             
             # Fallback to backtest CSV for iterative research
-            if df.empty and os.path.exists("research/audit_results_v8.csv"):
-                df = pd.read_csv("research/audit_results_v8.csv")
+            if df.empty and os.path.exists(self.AUDIT_CSV):
+                df = pd.read_csv(self.AUDIT_CSV)
                 if 'res' in df.columns: df = df.rename(columns={'res': 'status'})
                 
             if df.empty:
@@ -60,6 +64,93 @@ class AutoOptimizer:
 
     @classmethod
     def get_multiplier_for_symbol(cls, symbol, db_path="database/signals.db"):
-        opt = cls(db_path)
-        mults = opt.get_optimized_multipliers()
-        return mults.get(symbol, ATR_MULTIPLIER)
+        # V16.0: Served from the long-lived cache; recomputed only when trades resolve
+        return MultiplierCache.for_journal(db_path).get(symbol)
+
+
+class MultiplierCache:
+    """
+    Long-lived AutoOptimizer multipliers, recomputed only when the journal's
+    resolved-trade count changes (or the backtest CSV changes while the journal
+    has none).
+
+    Lookups are dict reads. The DB is only consulted for a COUNT after SQLite
+    reports a commit (`PRAGMA data_version` on a held connection); 'result'
+    events from an in-process SignalJournal force a recompute directly.
+    """
+    _shared = {}
+
+    def __init__(self, db_path="database/signals.db"):
+        self.optimizer = AutoOptimizer(db_path)
+        self.db_path = db_path
+        self._multipliers = {}
+        self._source = None   # (resolved count, CSV stamp) the multipliers were computed from
+        self._count = None
+        self._conn = None
+        self._version = None
+        self._dirty = True
+        self._stats = {'hits': 0, 'misses': 0, 'count_queries': 0}
+
+    @classmethod
+    def for_journal(cls, db_path="database/signals.db"):
+        """Process-wide cache for a journal DB, created on first use."""
+        key = os.path.abspath(db_path)
+        cache = cls._shared.get(key)
+        if cache is None:
+            cache = cls._shared[key] = cls(db_path)
+        return cache
+
+    def on_journal_event(self, event, payload):
+        """SignalJournal listener: a resolved trade invalidates the multipliers."""
+        if event == 'result':
+            self._dirty = True
+
+    def _resolved_count(self):
+        """Resolved trades in the journal, re-counted only after a commit."""
+        if self._conn is None:
+            if not os.path.exists(self.db_path):
+                return 0
+            try:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            except sqlite3.Error:
+                return 0
+        try:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._version or self._count is None:
+                placeholders = ",".join("?" * len(AutoOptimizer.RESOLVED))
+                self._count = self._conn.execute(
+                    f"SELECT COUNT(*) FROM signals WHERE status IN ({placeholders})", AutoOptimizer.RESOLVED
+                ).fetchone()[0]
+                self._version = version
+                self._stats['count_queries'] += 1
+        except sqlite3.Error:
+            self._count = 0
+        return self._count
+
+    def _csv_stamp(self):
+        try:
+            stat = os.stat(AutoOptimizer.AUDIT_CSV)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def multipliers(self) -> dict:
+        """Current symbol -> TP multiplier map (shared; do not mutate)."""
+        count = self._resolved_count()
+        source = (count, self._csv_stamp() if count == 0 else None)
+        if self._dirty or source != self._source:
+            self._multipliers = self.optimizer.get_optimized_multipliers()
+            self._source = source
+            self._dirty = False
+            self._stats['misses'] += 1
+        else:
+            self._stats['hits'] += 1
+        return self._multipliers
+
+    def get(self, symbol) -> float:
+        return self.multipliers().get(symbol, ATR_MULTIPLIER)
+
+    def stats(self) -> dict:
+        """Lookup counters and hit rate since start."""
+        lookups = self._stats['hits'] + self._stats['misses']
+        return dict(self._stats, lookups=lookups, hit_rate=round(self._stats['hits'] / lookups, 3) if lookups else 0.0)
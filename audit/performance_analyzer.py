@@ -1,60 +1,195 @@
+import csv
 import json
 import os
-import pandas as pd
-from typing import Dict
+from typing import Dict, Optional
+
+DEFAULT_STRATEGIES = ("smc_institutional", "breakout_master", "price_action_specialist")
+
+
+def _default_weights() -> Dict[str, float]:
+    return {sid: 1.0 for sid in DEFAULT_STRATEGIES}
+
+
+def _file_stamp(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+class StrategyWeights:
+    """
+    V16.0: Memory-resident strategy multipliers.
+
+    `get()` is a dict read. The weights file is reloaded only when its mtime
+    changes (checked by `refresh()`, once per scan cycle) or on `reload()`.
+    Win rates are kept as per-strategy counters fed by tailing the journal CSV
+    from the last byte read, so appended rows never re-read the whole file.
+    """
+    _shared: Dict[tuple, 'StrategyWeights'] = {}
+
+    def __init__(self, journal_path: str = "audit/journal_v8.csv", weights_path: str = "audit/strategy_weights.json"):
+        self.journal_path = journal_path
+        self.weights_path = weights_path
+        self.weights: Dict[str, float] = {}
+        self._weights_stamp = None
+        self._reset_journal()
+        self.reload()
+
+    @classmethod
+    def shared(cls, journal_path: str = "audit/journal_v8.csv", weights_path: str = "audit/strategy_weights.json") -> 'StrategyWeights':
+        """Process-wide service for a journal/weights pair, created on first use."""
+        key = (os.path.abspath(journal_path), os.path.abspath(weights_path))
+        service = cls._shared.get(key)
+        if service is None:
+            service = cls._shared[key] = cls(journal_path, weights_path)
+        return service
+
+    def _reset_journal(self):
+        self._counts = {}     # strategy_id -> [wins, rows]
+        self._columns = None  # CSV header
+        self._offset = 0      # bytes of the journal consumed so far
+        self._tail = b""      # last bytes consumed, to detect a rewritten file
+
+    # Weights file --------------------------------------------------------------
+
+    def get(self, strategy_id: str) -> float:
+        return self.weights.get(strategy_id, 1.0)
+
+    def reload(self):
+        """Re-reads the weights file (explicit reload event)."""
+        self._weights_stamp = _file_stamp(self.weights_path)
+        try:
+            with open(self.weights_path, 'r') as f:
+                self.weights = json.load(f)
+        except (OSError, ValueError):
+            self.weights = {}
+
+    def refresh(self) -> bool:
+        """Picks up external weight edits and journal appends; True if weights changed."""
+        changed = False
+        if _file_stamp(self.weights_path) != self._weights_stamp:
+            self.reload()
+            changed = True
+        if self._columns is not None and _file_stamp(self.journal_path) is not None:
+            changed = self.update() is not None or changed
+        return changed
+
+    def on_journal_event(self, event: str, payload: dict):
+        """SignalJournal listener: a logged signal appended a journal row."""
+        if event == 'open':
+            self.update()
+
+    # Journal counters ------------------------------------------------------------
+
+    def _read_new_rows(self) -> Optional[list]:
+        """Rows appended since the last read (all rows after a rewrite), or None if nothing new."""
+        size = os.path.getsize(self.journal_path)
+        with open(self.journal_path, 'rb') as f:
+            if self._offset:
+                f.seek(self._offset - len(self._tail))
+                if size < self._offset or f.read(len(self._tail)) != self._tail:
+                    self._reset_journal()
+            if size == self._offset:
+                return None
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+
+        # Only consume complete lines; a partial last line is read next time
+        end = chunk.rfind(b"\n") + 1
+        if end == 0:
+            return None
+        self._offset += end
+        self._tail = chunk[max(0, end - 64):end]
+
+        rows = list(csv.reader(chunk[:end].decode('utf-8').splitlines()))
+        if self._columns is None and rows:
+            self._columns = rows.pop(0)
+        return rows
+
+    def update(self) -> Optional[Dict[str, float]]:
+        """
+        Folds newly appended journal rows into the counters and, if any arrived,
+        recomputes and saves the weights. Returns the new weights or None.
+        """
+        if not os.path.exists(self.journal_path):
+            return None
+        rows = self._read_new_rows()
+        if not rows or 'strategy_id' not in self._columns or 'res' not in self._columns:
+            return None
+
+        sid_col, res_col = self._columns.index('strategy_id'), self._columns.index('res')
+        for row in rows:
+            if len(row) <= max(sid_col, res_col) or not row[sid_col]:
+                continue
+            counts = self._counts.setdefault(row[sid_col], [0, 0])
+            counts[0] += row[res_col] == 'WIN'
+            counts[1] += 1
+
+        weights = {}
+        for strategy_id, (wins, total) in sorted(self._counts.items()):
+            win_rate = wins / total
+            # Dynamic multiplier:
+            # > 35% WR: Boost (up to 1.5)
+            # 25-35% WR: Neutral (1.0)
+            # < 25% WR: Penalize (drop to 0.7)
+            if win_rate > 0.35:
+                multiplier = 1.0 + (win_rate * 0.5)
+            elif win_rate < 0.25:
+                multiplier = 0.7
+            else:
+                multiplier = 1.0
+            weights[strategy_id] = round(multiplier, 2)
+
+        # Ensure defaults for new strategies
+        for sid in DEFAULT_STRATEGIES:
+            weights.setdefault(sid, 1.0)
+
+        if weights != self.weights:
+            # Stable key order and no rewrite when nothing changed keep the file diff-free
+            with open(self.weights_path, 'w') as f:
+                json.dump(weights, f, sort_keys=True)
+            self._weights_stamp = _file_stamp(self.weights_path)
+        self.weights = weights
+        return weights
+
+    @property
+    def has_strategy_column(self) -> bool:
+        """True once the journal header has been read and carries a strategy_id column."""
+        return self._columns is not None and 'strategy_id' in self._columns
+
 
 class PerformanceAnalyzer:
     def __init__(self, journal_path: str = "audit/journal_v8.csv"):
         self.journal_path = journal_path
         self.weights_path = "audit/strategy_weights.json"
 
+    @property
+    def service(self) -> StrategyWeights:
+        return StrategyWeights.shared(self.journal_path, self.weights_path)
+
     def calculate_weights(self) -> Dict[str, float]:
         """
         Analyzes the journal and returns a dictionary of strategy weights.
         """
         if not os.path.exists(self.journal_path):
-            return {"smc_institutional": 1.0, "breakout_master": 1.0, "price_action_specialist": 1.0}
+            return _default_weights()
 
         try:
-            df = pd.read_csv(self.journal_path)
-            if 'strategy_id' not in df.columns:
-                return {"smc_institutional": 1.0, "breakout_master": 1.0, "price_action_specialist": 1.0}
-
-            # Calculate win rate per strategy
-            stats = df.groupby('strategy_id')['res'].apply(lambda x: (x == 'WIN').sum() / len(x))
-            
-            weights = {}
-            for strategy_id, win_rate in stats.items():
-                # Dynamic multiplier: 
-                # > 35% WR: Boost (up to 1.5)
-                # 25-35% WR: Neutral (1.0)
-                # < 25% WR: Penalize (drop to 0.7)
-                if win_rate > 0.35:
-                    multiplier = 1.0 + (win_rate * 0.5)
-                elif win_rate < 0.25:
-                    multiplier = 0.7
-                else:
-                    multiplier = 1.0
-                weights[strategy_id] = round(multiplier, 2)
-            
-            # Ensure defaults for new strategies
-            for sid in ["smc_institutional", "breakout_master", "price_action_specialist"]:
-                if sid not in weights:
-                    weights[sid] = 1.0
-                    
-            with open(self.weights_path, 'w') as f:
-                json.dump(weights, f)
-                
-            return weights
+            service = self.service
+            weights = service.update()
+            if weights is not None:
+                return weights
+            if not service.has_strategy_column:
+                return _default_weights()
+            # Journal unchanged since the last pass
+            return dict(service.weights)
         except Exception as e:
             print(f"Error calculating weights: {e}")
-            return {"smc_institutional": 1.0, "breakout_master": 1.0, "price_action_specialist": 1.0}
+            return _default_weights()
 
     @staticmethod
     def get_strategy_multiplier(strategy_id: str) -> float:
-        weights_path = "audit/strategy_weights.json"
-        if os.path.exists(weights_path):
-            with open(weights_path, 'r') as f:
-                weights = json.load(f)
-                return weights.get(strategy_id, 1.0)
-        return 1.0
+        # V16.0: In-memory lookup; StrategyWeights.refresh() picks up file changes
+        return StrategyWeights.shared().get(strategy_id)
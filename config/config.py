@@ -50,6 +50,32 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# AI GRADING (V16.0)
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "8")) # Per-call budget for a model response
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "4")) # Model calls in flight across the process
+AI_BATCH_WINDOW = float(os.getenv("AI_BATCH_WINDOW", "0.05")) # Seconds to coalesce setups into one model call (0 disables)
+AI_BATCH_SIZE = 20 # Setups per batched prompt
+AI_OUTPUT_TOKENS_PER_SETUP = 64 # Response token cap per graded setup (JSON mode)
+AI_CACHE_PATH = "database/ai_cache.db" # Persistent grade cache shared by all strategies and restarts
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "300")) # Seconds a grade stays valid
+AI_CACHE_MAX_ENTRIES = 5000 # LRU cap
+AI_CACHE_RSI_BUCKET = 5 # RSI points per cache bucket
+AI_GRADER_MODE = os.getenv("AI_GRADER_MODE", "live") # live | record | replay | surrogate
+AI_GRADE_LOG_PATH = "database/ai_grades.db" # Recorded live grades for replay backtests
+AI_CYCLE_BUDGET = float(os.getenv("AI_CYCLE_BUDGET", "15")) # Seconds of AI wait allowed per scan cycle (0 disables)
+AI_BREAKER_FAILURES = 3 # Consecutive failures that open the circuit breaker
+AI_BREAKER_P95 = 6.0 # p95 call latency (s) that opens the breaker
+AI_BREAKER_COOLDOWN = 120 # Seconds open before a half-open probe
+AI_FALLBACK_SCORE = 6.5 # Highest grade without the provider (local model scores are capped here); below every strategy's AI gate
+AI_RATIONALE_DRAIN_SECONDS = 20 # Single-shot runs wait this long for background alert rationales before exiting
+AI_SPECULATIVE_GRADING = os.getenv("AI_SPECULATIVE_GRADING", "false").lower() == "true" # SMC: request the AI grade as soon as the direction is known
+ML_REJECT_BELOW = 0.35 # Win probability under which the local model rejects a setup without an LLM call
+
+# ML MODEL REGISTRY (V16.0)
+MODEL_REGISTRY_DIR = "training/models" # Versioned win-probability models (<version>/model.joblib + meta.json)
+MODEL_REGISTRY_KEEP = 2 # Versions kept on disk by prune (newest first; the active one is always kept)
+MODEL_WARMUP_ROWS = 32 # Rows in the batch predict_proba that warms a new version before it is swapped in
+
 # SESSION TIMES (UTC)
 # London: 08:00 - 16:00
 # NY: 13:00 - 21:00
@@ -64,6 +90,10 @@ ASIAN_RANGE_MIN_PIPS = 15 # Minimum range for sweep validity
 # NEWS FILTER
 NEWS_WASH_ZONE = 30 # Minutes before/after high-impact news
 NEWS_IMPACT_LEVELS = ["High", "Medium"] # Impact levels to track
+NEWS_CACHE_PATH = "database/news_cache.json" # Last calendar payload + validators (V16.0)
+NEWS_REFRESH_INTERVAL = int(os.getenv("NEWS_REFRESH_INTERVAL", "3600")) # Seconds between conditional requests
+NEWS_EVENT_REFRESH_INTERVAL = int(os.getenv("NEWS_EVENT_REFRESH_INTERVAL", "300")) # Tightened interval near High impact events
+NEWS_ARCHIVE_PATH = "database/news_archive.db" # Append-only calendar history for news-aware backtests
 
 # SCORING (V15.0 Golden Threshold)
 MIN_CONFIDENCE_SCORE = 8.0
@@ -74,3 +104,38 @@ ACCOUNT_BALANCE = 50.0 # User's target starting balance
 RISK_PER_TRADE_PERCENT = 2.0 # Standard 2% risk
 MAX_CONCURRENT_TRADES = 2
 MIN_LOT_SIZE = 0.01 
+
+# MACRO REGIME (V16.0 Incremental macro basket)
+# market_context key -> (ticker, bias key, risk-on sign). A strong dollar and rising yields are risk-off.
+MACRO_BASKET = {
+    "DXY": (DXY_SYMBOL, "DXY", -1),
+    "^TNX": (TNX_SYMBOL, "TNX", -1),
+    # "^GSPC": ("^GSPC", "SPX", 1),
+    # "CL=F": ("CL=F", "OIL", 1),
+}
+MACRO_EMA_PERIOD = 20 # Trend EMA per macro series (H1)
+MACRO_RISK_THRESHOLD = 1.0 # Share of the basket that must agree for RISK ON/OFF (1.0 = unanimous)
+
+# PORTFOLIO CORRELATION (V16.0 Rolling H1 log-return correlation)
+CORRELATION_WINDOW = 120 # H1 bars (~1 trading week)
+CORRELATION_MIN_PERIODS = 30 # Overlapping bars needed before a pair's correlation is used
+CORRELATION_MAX_EXPOSURE = 3.0 # Cap on w'Rw of accepted signals (+1 BUY / -1 SELL), i.e. "effective positions"
+
+# EXECUTION (V16.0 Process-Pool Scanning)
+# "async": strategies run on the event loop (default)
+# "process": per-symbol indicator + strategy work runs in a ProcessPoolExecutor
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "async").lower()
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", "0")) or None # None = os.cpu_count()
+
+# STRATEGIES (V16.0 Plugin Registry)
+# Built-in strategies as "module:Class". Third-party strategies can also register
+# under the "mumofx.strategies" entry point group.
+STRATEGY_REGISTRY = {
+    "smc_institutional": "strategies.smc_strategy:SMCStrategy",
+    "breakout_master": "strategies.breakout_strategy:BreakoutStrategy",
+    "price_action_specialist": "strategies.price_action_strategy:PriceActionStrategy",
+}
+# Comma-separated strategy ids to run (empty = every registered strategy)
+ENABLED_STRATEGIES = [s.strip() for s in os.getenv("ENABLED_STRATEGIES", "").split(",") if s.strip()]
+# Per-symbol subsets, e.g. {"GC=F": ["smc_institutional"]}. Unlisted symbols run every enabled strategy.
+SYMBOL_STRATEGIES = {}
@@ -107,7 +107,7 @@ class DataFetcher:
         """
         Fetches multi-timeframe data for all symbols concurrently.
         """
-        from config.config import DXY_SYMBOL, TNX_SYMBOL
+        from config.config import MACRO_BASKET
         import asyncio
         
         results = {}
@@ -116,19 +116,15 @@ class DataFetcher:
         tasks = []
         task_info = []
 
-        # Macro Narrative
-        tasks.append(DataFetcher.fetch_data_async(DXY_SYMBOL, "1h", period="10d"))
-        task_info.append(('DXY', 'h1'))
-        
-        tasks.append(DataFetcher.fetch_data_async(TNX_SYMBOL, "1h", period="10d"))
-        task_info.append(('^TNX', 'h1'))
+        # Macro Narrative (V16.0: every series in the macro basket)
+        for key, (ticker, _, _) in MACRO_BASKET.items():
+            tasks.append(DataFetcher.fetch_data_async(ticker, "1h", period="10d"))
+            task_info.append((key, 'h1'))
         
         # Macro Daily (D1) for Bias
-        tasks.append(DataFetcher.fetch_data_async(DXY_SYMBOL, "1d", period="3mo"))
-        task_info.append(('DXY', 'd1'))
-        
-        tasks.append(DataFetcher.fetch_data_async(TNX_SYMBOL, "1d", period="3mo"))
-        task_info.append(('^TNX', 'd1'))
+        for key, (ticker, _, _) in MACRO_BASKET.items():
+            tasks.append(DataFetcher.fetch_data_async(ticker, "1d", period="3mo"))
+            task_info.append((key, 'd1'))
 
         for symbol in symbols:
             # Narrative (1H)
@@ -155,13 +151,8 @@ class DataFetcher:
             if df is None or df.empty:
                 continue
             
-            if symbol == 'DXY':
-                key = 'DXY' if tf == 'h1' else f'DXY_{tf}'
-                results[key] = IndicatorCalculator.add_indicators(df, tf)
-                continue
-                
-            if symbol == '^TNX':
-                key = '^TNX' if tf == 'h1' else f'^TNX_{tf}'
+            if symbol in MACRO_BASKET:
+                key = symbol if tf == 'h1' else f'{symbol}_{tf}'
                 results[key] = IndicatorCalculator.add_indicators(df, tf)
                 continue
 
@@ -171,11 +162,9 @@ class DataFetcher:
 
         # 4. Final Verification (Ensure all TFs present)
         final_results = {}
-        if 'DXY' in results:
-            final_results['DXY'] = results['DXY']
-            
-        if '^TNX' in results:
-            final_results['^TNX'] = results['^TNX']
+        for key in MACRO_BASKET:
+            if key in results:
+                final_results[key] = results[key]
             
         for symbol in symbols:
             s_data = results.get(symbol, {})
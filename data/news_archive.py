@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Iterable, List, Optional
+
+from config.config import NEWS_ARCHIVE_PATH
+from filters.news_index import NewsIndex, to_epoch
+
+
+class NewsArchive:
+    """
+    Append-only SQLite archive of economic calendar events (V16.0).
+
+    Every fetched weekly calendar is appended; events are keyed by
+    (currency, time, title) so overlapping snapshots never duplicate, and a
+    later snapshot only refreshes the stored payload (e.g. actual values).
+    The primary key doubles as the (currency, time) index used by range
+    queries, which return a ready-made NewsIndex for backtests.
+    """
+
+    def __init__(self, db_path: str = NEWS_ARCHIVE_PATH):
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS news_events (
+                    currency TEXT NOT NULL,
+                    ts REAL NOT NULL,
+                    title TEXT NOT NULL,
+                    impact TEXT,
+                    payload TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    PRIMARY KEY (currency, ts, title)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_news_ts ON news_events (ts)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS news_snapshots (
+                    fetched_at REAL NOT NULL,
+                    events INTEGER NOT NULL
+                )
+            """)
+
+    def append(self, events: Iterable[dict], fetched_at: Optional[float] = None) -> int:
+        """Archives a calendar snapshot. Returns the number of events stored."""
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        rows = []
+        for event in events:
+            try:
+                ts = to_epoch(event.get('date'))
+            except Exception:
+                continue
+            rows.append((event.get('country') or '', ts, event.get('title') or '', event.get('impact'),
+                         json.dumps(event), fetched_at))
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("""
+                INSERT INTO news_events (currency, ts, title, impact, payload, first_seen)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (currency, ts, title) DO UPDATE SET impact = excluded.impact, payload = excluded.payload
+            """, rows)
+            conn.execute("INSERT INTO news_snapshots (fetched_at, events) VALUES (?, ?)", (fetched_at, len(rows)))
+        return len(rows)
+
+    def query(self, start, end, currencies: Optional[List[str]] = None, impacts: Optional[List[str]] = None) -> NewsIndex:
+        """Events between `start` and `end` (inclusive) as a NewsIndex."""
+        sql = "SELECT payload FROM news_events WHERE ts BETWEEN ? AND ?"
+        params = [to_epoch(start), to_epoch(end)]
+        if currencies:
+            sql += f" AND currency IN ({','.join('?' * len(currencies))})"
+            params += list(currencies)
+        if impacts:
+            sql += f" AND impact IN ({','.join('?' * len(impacts))})"
+            params += list(impacts)
+        sql += " ORDER BY ts"
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return NewsIndex(json.loads(payload) for (payload,) in rows)
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM news_events").fetchone()[0]
+
+    def import_files(self, paths: List[str]) -> int:
+        """Backfills the archive from saved calendar JSON snapshots."""
+        total = 0
+        for path in paths:
+            with open(path) as f:
+                total += self.append(json.load(f), fetched_at=os.path.getmtime(path))
+        return total
+
+
+if __name__ == "__main__":
+    # python -m data.news_archive ff_calendar_2025-*.json
+    archive = NewsArchive()
+    stored = archive.import_files(sys.argv[1:])
+    print(f"Imported {stored} events ({len(archive)} archived)")
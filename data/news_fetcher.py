@@ -1,7 +1,15 @@
+import json
+import logging
+import os
+import time
 import requests
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from config.config import NEWS_CACHE_PATH, NEWS_REFRESH_INTERVAL, NEWS_EVENT_REFRESH_INTERVAL, NEWS_WASH_ZONE
+from filters.news_index import NewsIndex
+from data.news_archive import NewsArchive
 
 class NewsFetcher:
     CALENDAR_URL = "https://nfs.forexfactory1.com/ff_calendar_thisweek.json"
@@ -41,3 +49,140 @@ class NewsFetcher:
             if event.get('country') in relevant_currencies:
                 filtered.append(event)
         return filtered
+
+
+class CachedNewsFetcher(NewsFetcher):
+    """
+    Long-lived calendar source for the scan loop (V16.0).
+
+    - Keeps the last payload and its ETag/Last-Modified on disk (NEWS_CACHE_PATH)
+    - Only contacts the server every NEWS_REFRESH_INTERVAL seconds, tightened to
+      NEWS_EVENT_REFRESH_INTERVAL when a High impact event is coming up, and
+      then with a conditional request (304 = keep the cached payload)
+    - Reuses one pooled requests.Session
+    - Serves the cached payload when the remote is down
+    - Appends every new payload to the NewsArchive, if given, for backtests
+
+    fetch_news() returns a NewsIndex, rebuilt only when the payload changes.
+    """
+
+    def __init__(self, url: str = None, cache_path: str = NEWS_CACHE_PATH,
+                 refresh_interval: int = NEWS_REFRESH_INTERVAL, event_refresh_interval: int = NEWS_EVENT_REFRESH_INTERVAL,
+                 session: requests.Session = None, clock=time.time, archive: NewsArchive = None):
+        self.url = url or NewsFetcher.CALENDAR_URL
+        self.archive = archive
+        self.cache_path = cache_path
+        self.refresh_interval = refresh_interval
+        self.event_refresh_interval = event_refresh_interval
+        self.clock = clock
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.session = session
+
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = 0.0
+        self.events = None
+        self.next_refresh = 0.0
+        self.stats = {'requests': 0, 'not_modified': 0, 'updated': 0, 'errors': 0, 'cache_hits': 0}
+        self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cache.get('url') != self.url:
+            return
+        self.etag = cache.get('etag')
+        self.last_modified = cache.get('last_modified')
+        self.fetched_at = cache.get('fetched_at', 0.0)
+        self.events = NewsIndex(cache.get('events', []))
+        self.next_refresh = self.fetched_at + self._refresh_delay(self.fetched_at)
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    'url': self.url,
+                    'etag': self.etag,
+                    'last_modified': self.last_modified,
+                    'fetched_at': self.fetched_at,
+                    'events': list(self.events)
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logging.warning(f"News cache not saved: {e}")
+
+    def _refresh_delay(self, now: float) -> float:
+        """
+        Normal interval, or the tightened one when a High impact event falls
+        between the start of its wash zone and the next normal refresh.
+        """
+        if self.events:
+            # Symmetric window covering [now - wash zone, now + refresh_interval]
+            wash = NEWS_WASH_ZONE * 60
+            center = now + (self.refresh_interval - wash) / 2
+            half_width_minutes = (self.refresh_interval + wash) / 2 / 60
+            if self.events.has_high_impact(self.events.currencies, center, half_width_minutes):
+                return self.event_refresh_interval
+        return self.refresh_interval
+
+    def _archive(self, now: float):
+        if self.archive is None:
+            return
+        try:
+            self.archive.append(self.events, fetched_at=now)
+        except Exception as e:
+            logging.warning(f"News archive append failed: {e}")
+
+    def fetch_news(self) -> NewsIndex:
+        """
+        Returns the calendar, contacting the server only when a refresh is due.
+        """
+        now = self.clock()
+        if self.events is not None and now < self.next_refresh:
+            self.stats['cache_hits'] += 1
+            return self.events
+
+        headers = {}
+        if self.events is not None:
+            if self.etag:
+                headers['If-None-Match'] = self.etag
+            if self.last_modified:
+                headers['If-Modified-Since'] = self.last_modified
+
+        self.stats['requests'] += 1
+        failed = False
+        try:
+            response = self.session.get(self.url, headers=headers, timeout=10)
+            if response.status_code == 304:
+                self.stats['not_modified'] += 1
+                self.fetched_at = now
+            elif response.status_code == 200:
+                self.stats['updated'] += 1
+                self.events = NewsIndex(response.json())
+                self.etag = response.headers.get('ETag')
+                self.last_modified = response.headers.get('Last-Modified')
+                self.fetched_at = now
+                self._save_cache()
+                self._archive(now)
+            else:
+                failed = True
+                logging.warning(f"Failed to fetch news: {response.status_code} (serving cached calendar)")
+        except Exception as e:
+            failed = True
+            logging.warning(f"News fetch error: {e} (serving cached calendar)")
+
+        if failed:
+            # Retry on the short interval
+            self.stats['errors'] += 1
+            self.next_refresh = now + min(self.event_refresh_interval, self.refresh_interval)
+        else:
+            self.next_refresh = now + self._refresh_delay(now)
+        return self.events if self.events is not None else NewsIndex()
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+# Bar duration per timeframe key. Bars are labelled by their open time, so a bar
+# is only usable once `open + duration` has passed.
+TIMEFRAME_DURATIONS = {
+    'm1': pd.Timedelta(minutes=1),
+    'm5': pd.Timedelta(minutes=5),
+    'm15': pd.Timedelta(minutes=15),
+    'h1': pd.Timedelta(hours=1),
+    'h4': pd.Timedelta(hours=4),
+    'd1': pd.Timedelta(days=1),
+}
+
+
+def _close_times(index: pd.DatetimeIndex, duration: pd.Timedelta) -> np.ndarray:
+    """Bar close times as int64 ns (UTC based for tz-aware indexes)."""
+    return pd.DatetimeIndex(index).as_unit('ns').asi8 + duration.value
+
+
+class TimeframeAlignment:
+    """
+    Maps every base-timeframe bar to the last FULLY CLOSED bar of each higher
+    timeframe at the moment the base bar closes (no look-ahead).
+
+    `positions[tf][i]` is the integer position in the `tf` frame for base bar
+    `i`, or -1 when no `tf` bar had closed yet. Built with one searchsorted
+    per timeframe, so per-bar lookups in a backtest are O(1) array reads.
+    `extend()` appends newly arrived bars without rebuilding the whole map.
+    """
+
+    def __init__(self, base_index: pd.DatetimeIndex, frames: Dict[str, pd.DatetimeIndex], base_tf: str = 'm5',
+                 durations: Optional[Dict[str, pd.Timedelta]] = None):
+        self.durations = dict(TIMEFRAME_DURATIONS, **(durations or {}))
+        self.base_tf = base_tf
+        self._base_index = pd.DatetimeIndex(base_index)
+        self._base_close = _close_times(self._base_index, self.durations[base_tf])
+        self._indexes = {}
+        self._closes = {}
+        self.positions = {}
+        for tf, index in frames.items():
+            self._set_frame(tf, pd.DatetimeIndex(index))
+
+    def _set_frame(self, tf: str, index: pd.DatetimeIndex):
+        self._indexes[tf] = index
+        self._closes[tf] = _close_times(index, self.durations[tf])
+        self.positions[tf] = np.searchsorted(self._closes[tf], self._base_close, side='right') - 1
+
+    @staticmethod
+    def _appended(old: pd.DatetimeIndex, new: pd.DatetimeIndex) -> Optional[pd.DatetimeIndex]:
+        """The bars `new` adds after `old`, or None when `new` does not extend `old`."""
+        n = len(old)
+        if len(new) < n or (n and (new[0] != old[0] or new[n - 1] != old[-1])):
+            return None
+        return new[n:]
+
+    def extend(self, base_index: Optional[pd.DatetimeIndex] = None, frames: Optional[Dict[str, pd.DatetimeIndex]] = None):
+        """
+        Updates the map with the latest indexes (live mode). Appended bars are
+        mapped incrementally; an index that no longer extends the previous one
+        (e.g. a rolling fetch window) triggers a rebuild of what it affects.
+        """
+        for tf, index in (frames or {}).items():
+            index = pd.DatetimeIndex(index)
+            added = self._appended(self._indexes[tf], index) if tf in self._indexes else None
+            if added is None:
+                self._set_frame(tf, index)
+                continue
+            if len(added) == 0:
+                continue
+            new_closes = _close_times(added, self.durations[tf])
+            self._indexes[tf] = index
+            self._closes[tf] = np.concatenate([self._closes[tf], new_closes])
+            # Only base bars closing at/after the first new HTF close can change
+            start = np.searchsorted(self._base_close, new_closes[0], side='left')
+            self.positions[tf][start:] = np.searchsorted(self._closes[tf], self._base_close[start:], side='right') - 1
+
+        if base_index is not None:
+            base_index = pd.DatetimeIndex(base_index)
+            added = self._appended(self._base_index, base_index)
+            if added is None:
+                self._base_index = base_index
+                self._base_close = _close_times(base_index, self.durations[self.base_tf])
+                for tf, index in list(self._indexes.items()):
+                    self._set_frame(tf, index)
+                return
+            if len(added) == 0:
+                return
+            new_closes = _close_times(added, self.durations[self.base_tf])
+            self._base_index = base_index
+            self._base_close = np.concatenate([self._base_close, new_closes])
+            for tf in self._indexes:
+                tail = np.searchsorted(self._closes[tf], new_closes, side='right') - 1
+                self.positions[tf] = np.concatenate([self.positions[tf], tail])
+
+    def __len__(self) -> int:
+        return len(self._base_close)
+
+    def position(self, tf: str, i: int) -> int:
+        """Position of the last closed `tf` bar as of base bar `i` (-1 if none)."""
+        return int(self.positions[tf][i])
+
+    def locate(self, i: int) -> Dict[str, int]:
+        """Positions on every aligned timeframe for base bar `i`."""
+        return {tf: int(pos[i]) for tf, pos in self.positions.items()}
+
+    def ready(self, i: int) -> bool:
+        """True once every aligned timeframe has at least one closed bar."""
+        return all(pos[i] >= 0 for pos in self.positions.values())
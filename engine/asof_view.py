@@ -0,0 +1,76 @@
+import pandas as pd
+from typing import Dict, Optional
+
+from indicators.snapshot import BarSnapshot, TailView
+from engine.alignment import TimeframeAlignment
+
+
+class AsOfView:
+    """
+    Look-ahead-safe view of one symbol's frames as of a cursor on the base timeframe.
+
+    Holds one TailView per timeframe over the full frames; the base view ends at
+    the cursor and every higher timeframe ends at its last bar closed by then
+    (via TimeframeAlignment). Moving the cursor is O(1) per timeframe and never
+    copies or slices a frame.
+
+    `data` is the dict strategies receive, so the same strategy code runs live
+    (build_symbol_frames) and in a backtest loop. Its 'as_of' entry is the
+    cursor bar time, used by time-dependent filters (news wash zone):
+
+        view = AsOfView(frames)
+        for i in range(200, len(view)):
+            view.seek(i)
+            signal = await strategy.analyze(symbol, view.data, news, context)
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], cursor: Optional[int] = None, base_tf: str = 'm5',
+                 alignment: Optional[TimeframeAlignment] = None):
+        self.base_tf = base_tf
+        self.views = {tf: TailView.from_frame(df) for tf, df in frames.items() if isinstance(df, pd.DataFrame)}
+        self.alignment = alignment or TimeframeAlignment(
+            frames[base_tf].index, {tf: frames[tf].index for tf in self.views if tf != base_tf}, base_tf=base_tf
+        )
+        self.data = {'views': self.views}
+        self.cursor = None
+        self.seek(len(self.alignment) - 1 if cursor is None else cursor)
+
+    def __len__(self) -> int:
+        return len(self.alignment)
+
+    def __getitem__(self, tf: str) -> TailView:
+        return self.views[tf]
+
+    def seek(self, cursor: int):
+        """Positions every timeframe as of base bar `cursor`."""
+        self.cursor = cursor
+        self.views[self.base_tf].seek(cursor)
+        for tf, positions in self.alignment.positions.items():
+            self.views[tf].seek(int(positions[cursor]))
+        self.data['as_of'] = self.views[self.base_tf].time
+
+    def advance(self, n: int = 1):
+        self.seek(self.cursor + n)
+
+    @property
+    def ready(self) -> bool:
+        """True once every timeframe has at least one closed bar at the cursor."""
+        return self.alignment.ready(self.cursor)
+
+    @property
+    def time(self):
+        return self.views[self.base_tf].time
+
+    # Base timeframe shortcuts
+    @property
+    def latest(self) -> BarSnapshot:
+        return self.views[self.base_tf].latest
+
+    def prev(self, n: int = 1) -> BarSnapshot:
+        return self.views[self.base_tf].prev(n)
+
+    def window(self, col: str, n: int):
+        return self.views[self.base_tf].window(col, n)
+
+    def today_slice(self, col: str):
+        return self.views[self.base_tf].today_slice(col)
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from config.config import MACRO_BASKET
+from indicators.calculations import IndicatorCalculator
+from indicators.snapshot import TailView
+from filters.ai_grader import AIGrader
+from engine.shared_frames import SharedFrameSet, SharedFrameSpec, attach_frame
+
+logger = logging.getLogger(__name__)
+
+# Market context keys the strategies read (macro basket frames + Gold DXY filter).
+# The published MacroSnapshot ('macro') is small and is pickled as-is.
+CONTEXT_KEYS = tuple(MACRO_BASKET)
+
+
+def build_symbol_frames(data: dict) -> dict:
+    """
+    Pre-processing shared by every strategy: indicators on H1/M15/M5,
+    H4 and D1 are passed through as fetched. 'views' holds one TailView per
+    frame so the latest-bar snapshots are extracted once, not per strategy.
+    """
+    frames = {
+        'h1': IndicatorCalculator.add_indicators(data['h1'], "h1"),
+        'm15': IndicatorCalculator.add_indicators(data['m15'], "m15"),
+        'm5': IndicatorCalculator.add_indicators(data['m5'], "m5"),
+        'h4': data.get('h4'),
+        'd1': data.get('d1')
+    }
+    frames['views'] = {tf: TailView.from_frame(df) for tf, df in frames.items() if isinstance(df, pd.DataFrame)}
+    return frames
+
+
+class DeferredAIGrader:
+    """
+    Stand-in for AIGrader inside worker processes.
+
+    Network-bound grading stays on the parent's event loop. Setups the parent
+    has already graded are answered from `scores`; unknown setups are recorded
+    and scored optimistically so the strategy still surfaces its candidate.
+    Every strategy gate on the AI score is monotonic, so a setup rejected at the
+    optimistic score would also be rejected at its real score.
+    """
+    OPTIMISTIC_SCORE = 10.0
+
+    def __init__(self, scores: Optional[Dict[str, float]] = None, fixed_score: Optional[float] = None):
+        self.scores = scores or {}
+        self.fixed_score = fixed_score
+        self.requested = []
+
+    async def get_score(self, setup_data: dict, urgent: bool = False) -> float:
+        if self.fixed_score is not None:
+            return self.fixed_score
+
+        key = AIGrader.fingerprint(setup_data)
+        if key in self.scores:
+            return self.scores[key]
+
+        self.requested.append(dict(setup_data))
+        return self.OPTIMISTIC_SCORE
+
+
+# --- Worker side ---
+
+_WORKER_REGISTRY = None
+
+
+def _worker_strategies(symbol: str) -> list:
+    """Strategies enabled for `symbol`, built once per worker process and reused across jobs."""
+    global _WORKER_REGISTRY
+    if _WORKER_REGISTRY is None:
+        from strategies.registry import StrategyRegistry
+        # Workers never call the model directly, grading is deferred to the parent
+        _WORKER_REGISTRY = StrategyRegistry(ai_grader=DeferredAIGrader())
+    return _WORKER_REGISTRY.for_symbol(symbol)
+
+
+async def _analyze_symbol(symbol: str, data: dict, news_events: list, market_context: dict,
+                          scores: Optional[Dict[str, float]], fixed_score: Optional[float]) -> List[dict]:
+    frames = build_symbol_frames(data)
+    outcomes = []
+    for strategy in _worker_strategies(symbol):
+        grader = DeferredAIGrader(scores, fixed_score)
+        strategy.ai_grader = grader
+        outcome = {'strategy_id': strategy.get_id(), 'strategy_name': strategy.get_name(), 'result': None, 'setups': [], 'error': None}
+        try:
+            outcome['result'] = await strategy.analyze(symbol, frames, news_events, market_context)
+            outcome['setups'] = grader.requested
+        except Exception as e:
+            outcome['error'] = str(e)
+        outcomes.append(outcome)
+    return outcomes
+
+
+def analyze_symbol_job(symbol: str, frame_specs: Dict[str, SharedFrameSpec], context_specs: Dict[str, SharedFrameSpec],
+                       news_events: list, scores: Optional[Dict[str, float]] = None, fixed_score: Optional[float] = None) -> List[dict]:
+    """
+    Worker entry point: attaches the shared frames, computes indicators and runs
+    every strategy for one symbol. Returns one outcome dict per strategy.
+    """
+    data = {tf: attach_frame(spec) for tf, spec in frame_specs.items()}
+    market_context = {key: attach_frame(spec) if isinstance(spec, SharedFrameSpec) else spec
+                      for key, spec in context_specs.items()}
+    return asyncio.run(_analyze_symbol(symbol, data, news_events, market_context, scores, fixed_score))
+
+
+# --- Parent side ---
+
+class ProcessPoolScanner:
+    """
+    Runs per-symbol indicator and strategy work in a process pool.
+
+    Phase 1 screens every symbol with optimistic AI scores and collects the
+    setups the strategies want graded. Those setups are graded on the event
+    loop with the real AIGrader, then only symbols that produced a candidate
+    are re-evaluated with the real grades (phase 2).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, ai_grader: Optional[AIGrader] = None, executor: Optional[Executor] = None):
+        self.executor = executor or ProcessPoolExecutor(max_workers=max_workers)
+        self.ai_grader = ai_grader or AIGrader()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _run_jobs(self, symbols: list, specs: dict, context_specs: dict, news_events: list,
+                        scores: Optional[dict], fixed_score: Optional[float]) -> dict:
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(self.executor, analyze_symbol_job, symbol, specs[symbol], context_specs, news_events, scores, fixed_score)
+            for symbol in symbols
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+        outcomes = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"Process worker error on {symbol}: {result}")
+                outcomes[symbol] = []
+                continue
+            outcomes[symbol] = result
+        return outcomes
+
+    async def scan(self, symbol_data: Dict[str, dict], news_events: list, market_context: dict) -> Dict[str, list]:
+        """
+        Returns {symbol: [(strategy_id, signal), ...]} for every strategy that produced a signal.
+        """
+        if not symbol_data:
+            return {}
+
+        with SharedFrameSet() as frames:
+            context_specs = {
+                key: frames.publish(market_context[key]) for key in CONTEXT_KEYS
+                if isinstance(market_context.get(key), pd.DataFrame)
+            }
+            if market_context.get('macro') is not None:
+                context_specs['macro'] = market_context['macro']
+            specs = {
+                symbol: {tf: frames.publish(df) for tf, df in data.items() if isinstance(df, pd.DataFrame)}
+                for symbol, data in symbol_data.items()
+            }
+            symbols = list(specs.keys())
+
+            # Grading disabled: the score is a constant, a single pass is enough
+            fixed_score = None if self.ai_grader.active else AIGrader.DEFAULT_SCORE
+            outcomes = await self._run_jobs(symbols, specs, context_specs, news_events, None, fixed_score)
+
+            if fixed_score is None:
+                # Grade only setups from strategies that produced a candidate
+                pending = {}
+                for symbol in symbols:
+                    for outcome in outcomes[symbol]:
+                        if outcome['result']:
+                            for setup in outcome['setups']:
+                                pending[AIGrader.fingerprint(setup)] = setup
+
+                if pending:
+                    keys = list(pending.keys())
+                    grades = await asyncio.gather(*[self.ai_grader.get_score(pending[k]) for k in keys])
+                    scores = dict(zip(keys, grades))
+                    rerun = [s for s in symbols if any(o['result'] and o['setups'] for o in outcomes[s])]
+                    outcomes.update(await self._run_jobs(rerun, specs, context_specs, news_events, scores, None))
+
+        signals = {}
+        for symbol in symbols:
+            signals[symbol] = []
+            for outcome in outcomes[symbol]:
+                if outcome['error']:
+                    logger.error(f"Strategy {outcome['strategy_name']} Error on {symbol}: {outcome['error']}")
+                elif outcome['result']:
+                    signals[symbol].append((outcome['strategy_id'], outcome['result']))
+        return signals
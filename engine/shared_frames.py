@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional, Tuple
+
+
+class SharedFrameSpec(NamedTuple):
+    """
+    Picklable handle to a DataFrame published in shared memory.
+    Only this small tuple crosses the process boundary, never the frame itself.
+    """
+    name: str
+    rows: int
+    columns: Tuple[str, ...]
+    dtypes: Tuple[str, ...]
+    tz: Optional[str]
+    unit: str
+
+
+class SharedFrame:
+    """
+    Publishes the numeric/bool columns of a DatetimeIndex-ed DataFrame into a
+    single shared memory block.
+
+    Layout: [index as int64 ns][column 0 as float64][column 1 as float64]...
+    Each column is contiguous so workers can copy it out with one memcpy.
+    Object columns (e.g. 'regime') are skipped; they are cheap to recompute.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        numeric = df.select_dtypes(include=['number', 'bool'])
+        index = pd.DatetimeIndex(df.index)
+        rows = len(numeric)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * rows * (len(numeric.columns) + 1)))
+        idx_block, val_block = SharedFrame._views(self._shm, rows, len(numeric.columns))
+        idx_block[:] = index.as_unit('ns').asi8
+        for i, col in enumerate(numeric.columns):
+            val_block[i] = numeric[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        self.spec = SharedFrameSpec(
+            name=self._shm.name,
+            rows=rows,
+            columns=tuple(str(c) for c in numeric.columns),
+            dtypes=tuple(str(dt) for dt in numeric.dtypes),
+            tz=str(index.tz) if index.tz is not None else None,
+            unit=index.unit
+        )
+
+    @staticmethod
+    def _views(shm, rows: int, n_cols: int):
+        idx_block = np.ndarray((rows,), dtype=np.int64, buffer=shm.buf)
+        val_block = np.ndarray((n_cols, rows), dtype=np.float64, buffer=shm.buf, offset=8 * rows)
+        return idx_block, val_block
+
+    def release(self):
+        """Closes and unlinks the block. Called by the owning (parent) process only."""
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: pool workers share the parent's resource tracker,
+        # so the duplicate registration is released by the parent's unlink.
+        return shared_memory.SharedMemory(name=name)
+
+
+def attach_frame(spec: SharedFrameSpec) -> pd.DataFrame:
+    """
+    Rebuilds a DataFrame from a SharedFrameSpec (worker side).
+    Columns are copied out because indicator computation adds columns in place.
+    """
+    shm = _attach(spec.name)
+    try:
+        idx_block, val_block = SharedFrame._views(shm, spec.rows, len(spec.columns))
+        index = pd.DatetimeIndex(idx_block.copy().view('M8[ns]')).as_unit(spec.unit)
+        if spec.tz:
+            index = index.tz_localize('UTC').tz_convert(spec.tz)
+
+        data = {}
+        for i, (col, dtype) in enumerate(zip(spec.columns, spec.dtypes)):
+            values = val_block[i].copy()
+            data[col] = values if dtype == 'float64' else values.astype(dtype)
+        df = pd.DataFrame(data, index=index)
+        del idx_block, val_block
+        return df
+    finally:
+        shm.close()
+
+
+class SharedFrameSet:
+    """
+    Owns every block published during one scan cycle and releases them together.
+    """
+
+    def __init__(self):
+        self._frames = []
+
+    def publish(self, df: pd.DataFrame) -> SharedFrameSpec:
+        frame = SharedFrame(df)
+        self._frames.append(frame)
+        return frame.spec
+
+    def release(self):
+        for frame in self._frames:
+            frame.release()
+        self._frames = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
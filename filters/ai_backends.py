@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+from config.config import AI_GRADE_LOG_PATH
+from filters.ai_score_cache import AIScoreCache
+from filters.ml_pregrader import MLPreGrader
+from training.model_registry import ModelHandle
+
+logger = logging.getLogger(__name__)
+
+MODES = ('live', 'record', 'replay', 'surrogate')
+
+
+class GradeLog:
+    """
+    SQLite log of live AI grades (V16.0), keyed by the same normalized setup
+    hash as AIScoreCache. `record` keeps the latest grade per setup together
+    with the full setup for inspection; `load` returns {key: score}.
+    """
+
+    def __init__(self, db_path: str = AI_GRADE_LOG_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_grades (
+                    key TEXT PRIMARY KEY,
+                    setup TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    recorded_at REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+
+    def record(self, setup_data: dict, score: float):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_grades (key, setup, score, recorded_at) VALUES (?, ?, ?, ?)",
+                (AIScoreCache.key(setup_data), json.dumps(setup_data, sort_keys=True, default=str), float(score), time.time())
+            )
+
+    def load(self) -> Dict[str, float]:
+        with sqlite3.connect(self.db_path) as conn:
+            return dict(conn.execute("SELECT key, score FROM ai_grades").fetchall())
+
+
+class ReplayBackend:
+    """Serves recorded grades from memory; unrecorded setups get `default`."""
+
+    def __init__(self, log: Optional[GradeLog] = None, default: float = 7.0):
+        self.grades = (log or GradeLog()).load()
+        self.default = default
+        self.hits = 0
+        self.misses = 0
+
+    def score(self, setup_data: dict) -> float:
+        score = self.grades.get(AIScoreCache.key(setup_data))
+        if score is None:
+            self.misses += 1
+            return self.default
+        self.hits += 1
+        return score
+
+    def stats(self) -> dict:
+        return {'mode': 'replay', 'grades': len(self.grades), 'hits': self.hits, 'misses': self.misses}
+
+
+class SurrogateBackend:
+    """Scores setups locally as 10 x the win-probability model's estimate."""
+
+    def __init__(self, pregrader: Optional[MLPreGrader] = None, default: float = 7.0):
+        if pregrader is None:
+            # V16.0: The registry's active version, loaded on the first score
+            pregrader = MLPreGrader(ModelHandle())
+        self.pregrader = pregrader
+        self.default = default
+        self.scored = 0
+        self.defaulted = 0
+
+    def score(self, setup_data: dict) -> float:
+        prob = self.pregrader.predict([setup_data.get('ml_features')])[0]
+        if prob is None:
+            self.defaulted += 1
+            return self.default
+        self.scored += 1
+        return round(prob * 10, 2)
+
+    def stats(self) -> dict:
+        return {'mode': 'surrogate', 'scored': self.scored, 'defaulted': self.defaulted}
+
+
+def make_backend(mode: str, default: float = 7.0):
+    """Offline backend for `mode`, or None for the live modes ('live', 'record')."""
+    if mode not in MODES:
+        logger.warning(f"Unknown AI_GRADER_MODE '{mode}'; using live grading")
+        return None
+    if mode == 'replay':
+        return ReplayBackend(default=default)
+    if mode == 'surrogate':
+        return SurrogateBackend(default=default)
+    return None
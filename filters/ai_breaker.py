@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+
+from config.config import AI_BREAKER_FAILURES, AI_BREAKER_P95, AI_BREAKER_COOLDOWN
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    V16.0: Circuit breaker for the AI provider.
+
+    CLOSED: calls go through. Opens after `failures` consecutive failures or
+    when the p95 of the last `window` call latencies exceeds `p95_limit`.
+    OPEN: calls are refused until `cooldown` seconds have passed, then one
+    probe is allowed (HALF_OPEN); its success closes the breaker, its failure
+    re-opens it for another cooldown.
+    """
+    CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+    MIN_SAMPLES = 10 # Latencies needed before the p95 rule applies
+
+    def __init__(self, failures: int = AI_BREAKER_FAILURES, p95_limit: float = AI_BREAKER_P95,
+                 cooldown: float = AI_BREAKER_COOLDOWN, window: int = 50,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_limit = failures
+        self.p95_limit = p95_limit
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self.latencies = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opens = 0
+        self._opened_at = None
+        self._probing = False
+
+    def allow(self) -> bool:
+        """True if a call may go to the provider now."""
+        if self.state == self.OPEN and self.clock() - self._opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+            self._probing = False
+            logger.info("🔌 AI breaker half-open: probing provider")
+        if self.state == self.CLOSED or (self.state == self.HALF_OPEN and not self._probing):
+            self._probing = self.state == self.HALF_OPEN
+            return True
+        self.rejected += 1
+        return False
+
+    def release_probe(self):
+        """Returns an unanswered half-open probe (caller cancelled), so the next call can probe."""
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+
+    def record_success(self, latency: float):
+        self.calls += 1
+        self.latencies.append(latency)
+        self.consecutive_failures = 0
+        if self.state == self.HALF_OPEN:
+            self.latencies.clear()
+            self._close()
+        elif self._p95_exceeded():
+            self._open(f"p95 latency {self.percentile(95):.1f}s")
+
+    def record_failure(self, latency: Optional[float] = None):
+        self.calls += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if latency is not None:
+            self.latencies.append(latency)
+        if self.state == self.HALF_OPEN:
+            self._open("probe failed")
+        elif self.state == self.CLOSED and (self.consecutive_failures >= self.failure_limit or self._p95_exceeded()):
+            self._open(f"{self.consecutive_failures} consecutive failures")
+
+    def _p95_exceeded(self) -> bool:
+        return len(self.latencies) >= self.MIN_SAMPLES and self.percentile(95) > self.p95_limit
+
+    def _open(self, reason: str):
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        self._probing = False
+        self.opens += 1
+        logger.warning(f"🔌 AI breaker OPEN ({reason}); local fallback for {self.cooldown:.0f}s")
+
+    def _close(self):
+        self.state = self.CLOSED
+        self._probing = False
+        self.consecutive_failures = 0
+        logger.info("🔌 AI breaker closed: provider healthy")
+
+    def percentile(self, q: float) -> Optional[float]:
+        return float(np.percentile(list(self.latencies), q)) if self.latencies else None
+
+    def stats(self) -> dict:
+        return {
+            'state': self.state,
+            'calls': self.calls,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'rejected': self.rejected,
+            'opens': self.opens,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95)
+        }
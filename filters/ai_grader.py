@@ -1,105 +1,316 @@
 from ai.analyst import AIAnalyst
+from filters.ai_score_cache import AIScoreCache
+from filters.ml_pregrader import MLPreGrader
+from filters.ai_backends import GradeLog, make_backend
+from filters.ai_breaker import CircuitBreaker
 import asyncio
 import json
 import os
 import logging
+from typing import List, Optional
+import time
+from config.config import AI_BATCH_WINDOW, AI_BATCH_SIZE, AI_OUTPUT_TOKENS_PER_SETUP, AI_GRADER_MODE, AI_TIMEOUT_SECONDS, AI_CYCLE_BUDGET, AI_FALLBACK_SCORE
+
+# V16.0: Compact grading prompt; the answer format is enforced by GRADE_SCHEMA (JSON mode)
+GRADER_PROMPT = """You are an institutional market maker grading retail SMC setups 0-10 for trap risk.
+Lower: textbook, retail-obvious entries; likely inducement or stop-hunt bait.
+Higher: displacement, against the retail narrative, stops beyond retail stops, levels only institutions see.
+Bands: 9-10 hidden institutional flow | 7-8.9 moderate confluence | 5-6.9 neutral | 3-4.9 likely trap | 0-2.9 clear trap.
+Grade every setup by id; reason: one short sentence.
+Setups:
+{setups}"""
+
+GRADE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'grades': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'id': {'type': 'INTEGER'},
+                    'score': {'type': 'NUMBER', 'minimum': 0, 'maximum': 10},
+                    'trap_risk': {'type': 'STRING', 'enum': ['HIGH', 'MEDIUM', 'LOW']},
+                    'reason': {'type': 'STRING'}
+                },
+                'required': ['id', 'score', 'trap_risk', 'reason']
+            }
+        }
+    },
+    'required': ['grades']
+}
+
+# Setup field -> short prompt name
+PROMPT_FIELDS = {
+    'symbol': 'symbol', 'strategy_id': 'strategy', 'direction': 'direction', 'regime': 'regime',
+    'rsi': 'rsi', 'adr_status': 'adr', 'macro_bias': 'macro', 'va_status': 'value_area'
+}
+
+
+def _setup_line(setup_id: int, setup_data: dict) -> str:
+    """One setup as a compact JSON line (unset fields omitted, RSI to one decimal)."""
+    line = {'id': setup_id}
+    for field, name in PROMPT_FIELDS.items():
+        value = setup_data.get(field)
+        if value is None:
+            continue
+        line[name] = round(value, 1) if isinstance(value, float) else value
+    return json.dumps(line, separators=(',', ':'), default=str)
+
 
 class AIGrader:
-    def __init__(self):
-        self.analyst = AIAnalyst()
+    DEFAULT_SCORE = 7.0 # Base score when AI grading is disabled
+
+    def __init__(self, analyst: Optional[AIAnalyst] = None, batch_window: Optional[float] = None,
+                 cache: Optional[AIScoreCache] = None, pregrader: Optional[MLPreGrader] = None,
+                 mode: Optional[str] = None, backend=None, recorder: Optional[GradeLog] = None):
+        # V16.0: The analyst (and its genai client) is shared via the StrategyRegistry
+        # and only created on first use, so a disabled grader never builds a client.
+        self._analyst = analyst
         # V13.1: Allow disabling AI for fast benchmarking
         self.disabled = os.getenv('DISABLE_AI_GRADER', 'false').lower() == 'true'
-        # V15.0: AI Response Caching (5-minute TTL)
-        self.cache = {}
+        # V16.0: Persistent grade cache shared process-wide, opened on first real grade
+        self._cache = cache
+        # V16.0: Setups requested within `batch_window` seconds share one model call
+        self.batch_window = AI_BATCH_WINDOW if batch_window is None else batch_window
+        self.model_calls = 0
+        # V16.0: Token usage of model calls (totals and the latest call)
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.llm_setups = 0
+        self.last_call = None
+        # V16.0: Local win-probability model screens setups before the LLM
+        self.pregrader = pregrader
+        self.prefiltered = 0
+        self._pending = {}  # cache key -> [setup_data, future, waiters]
+        self._flush_timer = None
+        # V16.0: Grading backend. 'live' calls the model, 'record' also logs every grade,
+        # 'replay' serves logged grades and 'surrogate' scores with the local model.
+        # The offline modes need no client, so they run even with DISABLE_AI_GRADER set.
+        self.mode = mode or AI_GRADER_MODE
+        self.backend = backend if backend is not None else make_backend(self.mode, self.DEFAULT_SCORE)
+        if recorder is None and self.mode == 'record' and backend is None:
+            recorder = GradeLog()
+        self.recorder = recorder
+        # V16.0: Provider health. While the breaker is open or the cycle's latency
+        # budget is spent, setups get the local model score instead of waiting.
+        self.breaker = CircuitBreaker()
+        self.cycle_budget = AI_CYCLE_BUDGET
+        self.fallbacks = 0
+        self._deadline = None
+
+    @property
+    def analyst(self) -> AIAnalyst:
+        if self._analyst is None:
+            self._analyst = AIAnalyst()
+        return self._analyst
+
+    @analyst.setter
+    def analyst(self, analyst: AIAnalyst):
+        self._analyst = analyst
+
+    @property
+    def cache(self) -> AIScoreCache:
+        if self._cache is None:
+            self._cache = AIScoreCache.shared()
+        return self._cache
+
+    def cache_stats(self) -> Optional[dict]:
+        """Score cache statistics, or None while the cache is unopened (never opens the DB)."""
+        return self._cache.stats() if self._cache is not None else None
 
-    async def get_score(self, setup_data: dict) -> float:
+    @property
+    def active(self) -> bool:
+        """True when get_score grades setups (a real model call or an offline backend)."""
+        if self.backend is not None:
+            return True
+        return not self.disabled and self.analyst.client is not None
+
+    @staticmethod
+    def fingerprint(setup_data: dict) -> str:
+        """Stable identity of a setup, used to hand grades across process boundaries."""
+        return json.dumps(setup_data, sort_keys=True, default=str)
+
+    def begin_cycle(self):
+        """Starts a scan cycle's AI latency budget."""
+        self._deadline = time.monotonic() + self.cycle_budget if self.cycle_budget else None
+
+    def health(self) -> dict:
+        """Breaker state, latency percentiles and fallback counts for monitoring."""
+        health = self.breaker.stats()
+        health.update({
+            'fallbacks': self.fallbacks,
+            'prefiltered': self.prefiltered,
+            'model_calls': self.model_calls,
+            'prompt_tokens': self.prompt_tokens,
+            'output_tokens': self.output_tokens,
+            'tokens_per_setup': (self.prompt_tokens + self.output_tokens) / self.llm_setups if self.llm_setups else None,
+            'budget_left': None if self._deadline is None else max(0.0, self._deadline - time.monotonic())
+        })
+        return health
+
+    async def get_score(self, setup_data: dict, urgent: bool = False) -> float:
         """
         Grades a trading setup using AI behavior analysis.
         Returns a float between 0.0 and 10.0.
-        
+
         V13.1: Uses CONTRARIAN logic - detects retail traps by identifying
         setups that appear "too obvious" to retail traders.
+        V16.0: Concurrent requests are coalesced into one batched model call;
+        `urgent` setups skip the batch window and are sent straight away.
         """
+        # V16.0: Offline backends answer in-process, no cache or batching needed
+        if self.backend is not None:
+            return self.backend.score(setup_data)
+
         # Fast path: bypass AI for benchmarking
-        if self.disabled or not self.analyst.client:
-            return 7.0 # Default base score if AI is disabled
-
-        # V15.0: Cache Lookup (Primacy: Symbol + Direction + Regime)
-        cache_key = f"{setup_data.get('symbol')}_{setup_data.get('direction')}_{setup_data.get('regime')}"
-        now = asyncio.get_event_loop().time()
-        
-        if cache_key in self.cache:
-            entry_time, entry_score = self.cache[cache_key]
-            if now - entry_time < 300: # 5 Minute Cache
-                return entry_score
-
-        prompt = f"""
-        You are an INSTITUTIONAL Market Maker analyzing a retail trader's setup.
-        Your job is to determine if this is a HIGH-PROBABILITY institutional play or a RETAIL TRAP.
-        
-        SETUP DETAILS:
-        - Symbol: {setup_data.get('symbol')}
-        - Strategy: {setup_data.get('strategy_id')}
-        - Direction: {setup_data.get('direction')}
-        - Market Regime: {setup_data.get('regime')}
-        - RSI: {setup_data.get('rsi')}
-        - ADR Status: {setup_data.get('adr_status')}
-        - Macro Alignment: {setup_data.get('macro_bias')}
-        - Value Area: {setup_data.get('va_status')}
-        
-        CRITICAL SMC ANALYSIS (Score HIGHER if these are TRUE):
-        
-        1. INDUCEMENT DETECTION:
-           - Is this setup "too textbook"? (If yes, score LOWER - it's a trap)
-           - Would retail traders see this as an "obvious" entry? (If yes, score LOWER)
-           - Is this likely STOP HUNT bait for institutional liquidity grab? (If yes, score LOWER)
-        
-        2. HIDDEN SMART MONEY:
-           - Is there DISPLACEMENT (rapid candle expansion) suggesting institutional interest?
-           - Is the setup AGAINST the obvious retail narrative?
-           - Is this entry at a "weird" level that only institutions would see?
-        
-        3. RISK/REWARD ASYMMETRY:
-           - Is the stop loss BELOW recent retail stops (for buys) or ABOVE (for sells)?
-           - Would breaking this level TRIGGER cascading retail liquidations?
-        
-        SCORING LOGIC (V13.1 CONTRARIAN):
-        - 9.0-10.0: Clear institutional footprint, AGAINST retail narrative, hidden order flow
-        - 7.0-8.9: Moderate institutional confluence, some retail visibility
-        - 5.0-6.9: Neutral setup, could go either way
-        - 3.0-4.9: Retail-obvious setup, likely inducement/trap
-        - 0.0-2.9: Clear retail trap, institutional counter-move expected
-        
-        Return ONLY valid JSON:
-        {{
-            "score": float (0.0 to 10.0),
-            "trap_risk": "HIGH" | "MEDIUM" | "LOW",
-            "reason": "One sentence explaining institutional intent"
-        }}
+        if not self.active:
+            return self.DEFAULT_SCORE # Default base score if AI is disabled
+
+        return await self._live_score(setup_data, urgent)
+
+    async def _live_score(self, setup_data: dict, urgent: bool = False) -> float:
+        # V16.0: Cache lookup on the full normalized setup
+        cached = self.cache.get(setup_data)
+        if cached is not None:
+            return cached
+
+        if self.batch_window <= 0 or urgent:
+            return (await self._screen_and_grade([setup_data]))[0]
+        return await self._enqueue(setup_data)
+
+    # Batching --------------------------------------------------------------------
+
+    async def _enqueue(self, setup_data: dict) -> float:
+        """Adds the setup to the open batch and waits for its grade."""
+        loop = asyncio.get_running_loop()
+        key = AIScoreCache.key(setup_data)
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = self._pending[key] = [setup_data, loop.create_future(), 0]
+            if len(self._pending) >= AI_BATCH_SIZE:
+                self._flush_now()
+            elif self._flush_timer is None:
+                self._flush_timer = loop.call_later(self.batch_window, self._flush_now)
+        entry[2] += 1
+        try:
+            # Shielded: a cancelled strategy must not cancel the grade other waiters share
+            return await asyncio.shield(entry[1])
+        except asyncio.CancelledError:
+            entry[2] -= 1
+            if entry[2] == 0 and self._pending.get(key) is entry:
+                # Nobody waits for it and the batch is not sent yet: drop it
+                del self._pending[key]
+                entry[1].cancel()
+            raise
+
+    def _flush_now(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = list(self._pending.values()), {}
+        if batch:
+            asyncio.ensure_future(self._resolve(batch))
+
+    async def _resolve(self, batch: list):
+        try:
+            scores = await self._screen_and_grade([setup for setup, _, _ in batch])
+        except Exception as e:
+            logging.error(f"⚠️ AI Grader Failed: {e}")
+            scores = self._fallback([setup for setup, _, _ in batch])
+        for (_, future, _), score in zip(batch, scores):
+            if not future.done():
+                future.set_result(score)
+
+    # Model calls -----------------------------------------------------------------
+
+    def _prompt(self, setups: List[dict]) -> str:
+        return GRADER_PROMPT.format(setups="\n".join(_setup_line(i, setup) for i, setup in enumerate(setups)))
+
+    async def _screen_and_grade(self, setups: List[dict]) -> List[float]:
+        """
+        Scores setups the local model confidently rejects from their win
+        probability (one batched predict_proba) and sends the rest to the LLM.
         """
-        
+        if self.pregrader is None:
+            return await self._grade(setups)
+        probs = self.pregrader.predict([setup.get('ml_features') for setup in setups])
+        scores = [round(prob * 10, 2) if self.pregrader.rejects(prob) else None for prob in probs]
+        remaining = [i for i, score in enumerate(scores) if score is None]
+        self.prefiltered += len(setups) - len(remaining)
+        if remaining:
+            for i, score in zip(remaining, await self._grade([setups[i] for i in remaining])):
+                scores[i] = score
+        return scores
+
+    def _track_usage(self, setups: int, usage: dict, latency: float):
+        self.prompt_tokens += usage['prompt']
+        self.output_tokens += usage['output']
+        self.llm_setups += setups
+        self.last_call = dict(usage, setups=setups, latency=round(latency, 3))
+        logging.debug(f"🤖 AI call: {setups} setup(s), {usage['prompt']}+{usage['output']} tokens, {latency:.2f}s")
+
+    def _fallback(self, setups: List[dict]) -> List[float]:
+        """
+        Graded fallback: the local model's score (10 x win probability) capped at
+        AI_FALLBACK_SCORE, so without the provider no setup clears an AI gate.
+        """
+        self.fallbacks += len(setups)
+        probs = self.pregrader.predict([s.get('ml_features') for s in setups]) if self.pregrader else [None] * len(setups)
+        return [AI_FALLBACK_SCORE if prob is None else min(round(prob * 10, 2), AI_FALLBACK_SCORE) for prob in probs]
+
+    async def _grade(self, setups: List[dict]) -> List[float]:
+        """One model call for `setups`; returns their scores in order."""
+        timeout = AI_TIMEOUT_SECONDS
+        if self._deadline is not None:
+            timeout = min(timeout, self._deadline - time.monotonic())
+        if timeout <= 0 or not self.breaker.allow():
+            return self._fallback(setups)
+
+        start = time.monotonic()
         try:
-            response = self.analyst.client.models.generate_content(
-                model=self.analyst.model_id,
-                contents=prompt
+            self.model_calls += 1
+            # V16.0: Off-loop JSON-mode call with timeout and the shared concurrency limit
+            result, usage = await self.analyst.generate_json(
+                self._prompt(setups), GRADE_SCHEMA, timeout=timeout,
+                max_output_tokens=AI_OUTPUT_TOKENS_PER_SETUP * len(setups)
             )
-            raw_text = response.text.strip()
-            
-            # Clean JSON formatting
-            if "```json" in raw_text:
-                raw_text = raw_text.split("```json")[1].split("```")[0].strip()
-            
-            result = json.loads(raw_text)
-            score = float(result.get("score", 5.0))
-            
-            # V13.1: Log trap risk for audit
-            trap_risk = result.get("trap_risk", "UNKNOWN")
-            logging.info(f"🤖 AI [{setup_data.get('symbol')}]: {score} | Trap Risk: {trap_risk} | {result.get('reason')}")
-            
-            # V15.0: Update Cache
-            self.cache[cache_key] = (now, score)
-            
-            return score
+        except asyncio.TimeoutError:
+            self.breaker.record_failure(time.monotonic() - start)
+            logging.warning(f"⏱️ AI Grader timed out for {', '.join(str(s.get('symbol')) for s in setups)}")
+            return self._fallback(setups)
         except Exception as e:
+            self.breaker.record_failure(time.monotonic() - start)
             logging.error(f"⚠️ AI Grader Failed: {e}")
-            return 6.5 # Conservative fallback
+            return self._fallback(setups)
+        except BaseException:
+            # Cancelled mid-call: no verdict on the provider, free a half-open probe slot
+            self.breaker.release_probe()
+            raise
+        latency = time.monotonic() - start
+        self.breaker.record_success(latency)
+        self._track_usage(len(setups), usage, latency)
+
+        if isinstance(result, dict):
+            result = result['grades'] if 'grades' in result else [dict(result, id=0)]
+        by_id = {}
+        for position, item in enumerate(result if isinstance(result, list) else []):
+            if isinstance(item, dict):
+                by_id[item.get('id', position)] = item
+
+        scores = []
+        for i, setup_data in enumerate(setups):
+            item = by_id.get(i)
+            try:
+                score = float(item.get("score", 5.0))
+            except (AttributeError, TypeError, ValueError):
+                scores.extend(self._fallback([setup_data]))
+                continue
+            # V13.1: Log trap risk for audit
+            logging.info(f"🤖 AI [{setup_data.get('symbol')}]: {score} | Trap Risk: {item.get('trap_risk', 'UNKNOWN')} | {item.get('reason')}")
+            self.cache.put(setup_data, score)
+            # Only real model grades are recorded, never fallbacks or local-model scores
+            if self.recorder is not None:
+                self.recorder.record(setup_data, score)
+            scores.append(score)
+        return scores
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config.config import AI_CACHE_PATH, AI_CACHE_TTL, AI_CACHE_MAX_ENTRIES, AI_CACHE_RSI_BUCKET
+
+
+class AIScoreCache:
+    """
+    Process-wide, persistent cache of AI setup grades (V16.0).
+
+    Entries are keyed by a hash of the normalized setup (RSI bucketed, floats
+    rounded), so every strategy and every restart shares the same grades.
+    Entries expire after `ttl` seconds; beyond `max_entries` the least
+    recently used ones are evicted. `stats()` reports hits and misses.
+    """
+
+    _shared: Dict[str, 'AIScoreCache'] = {}
+
+    def __init__(self, db_path: str = AI_CACHE_PATH, ttl: float = AI_CACHE_TTL,
+                 max_entries: int = AI_CACHE_MAX_ENTRIES, clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ai_scores (
+                key TEXT PRIMARY KEY,
+                score REAL NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ai_scores_used ON ai_scores (last_used)")
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls, db_path: str = AI_CACHE_PATH) -> 'AIScoreCache':
+        """Process-wide cache for a DB file, created on first use."""
+        key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+        cache = cls._shared.get(key)
+        if cache is None:
+            cache = cls._shared[key] = cls(db_path)
+        return cache
+
+    @staticmethod
+    def normalize(setup_data: dict) -> dict:
+        """Setup with RSI bucketed and floats rounded, so near-identical setups share a grade."""
+        normalized = {}
+        for name, value in setup_data.items():
+            if name == 'ml_features':
+                continue  # Local model inputs, not part of what the LLM grades
+            if name == 'rsi' and isinstance(value, (int, float)) and value == value:
+                value = int(value // AI_CACHE_RSI_BUCKET) * AI_CACHE_RSI_BUCKET
+            elif isinstance(value, float):
+                value = round(value, 4)
+            elif isinstance(value, str):
+                value = value.strip()
+            normalized[name] = value
+        return normalized
+
+    @staticmethod
+    def key(setup_data: dict) -> str:
+        payload = json.dumps(AIScoreCache.normalize(setup_data), sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, setup_data: dict) -> Optional[float]:
+        """Cached score for the setup, or None (expired entries count as misses)."""
+        key = self.key(setup_data)
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute("SELECT score, created FROM ai_scores WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM ai_scores WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE ai_scores SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, setup_data: dict, score: float):
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_scores (key, score, created, last_used) VALUES (?, ?, ?, ?)",
+                (self.key(setup_data), float(score), now, now)
+            )
+            # Expired entries first, then least recently used beyond the size cap
+            self._conn.execute("DELETE FROM ai_scores WHERE created <= ?", (now - self.ttl,))
+            evicted = self._conn.execute("""
+                DELETE FROM ai_scores WHERE key IN (
+                    SELECT key FROM ai_scores ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+            self.evictions += max(evicted, 0)
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ai_scores").fetchone()[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
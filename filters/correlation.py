@@ -1,4 +1,156 @@
 import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from config.config import CORRELATION_WINDOW, CORRELATION_MIN_PERIODS, CORRELATION_MAX_EXPOSURE
+
+
+class RollingCorrelation:
+    """
+    V16.0: Rolling correlation of H1 log-returns across the symbol universe.
+
+    Keeps a ring buffer of the last `window` return vectors and the running
+    pairwise sums (overlap count, sum, sum of squares, cross products), so each
+    new bar is a rank-1 add plus a rank-1 remove: O(n^2) per bar instead of
+    O(window * n^2) for a rolling recompute. Symbols with missing bars only
+    contribute to pairs where both have a return. The sums are rebuilt from the
+    buffer once per `window` bars to stop floating-point drift.
+    """
+
+    def __init__(self, window: int = CORRELATION_WINDOW, min_periods: int = CORRELATION_MIN_PERIODS):
+        self.window = window
+        self.min_periods = min_periods
+        self.symbols: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._capacity = 0
+        self._buffer = np.empty((window, 0))
+        self._head = 0
+        self._filled = 0
+        self._pushes = 0
+        self._last_time = None
+        self._corr = None
+        self._grow(8)
+
+    def _grow(self, capacity: int):
+        k = self._capacity
+        buffer = np.full((self.window, capacity), np.nan)
+        buffer[:, :k] = self._buffer
+        self._buffer = buffer
+        for name in ('_n', '_sx', '_sxx', '_sxy'):
+            grown = np.zeros((capacity, capacity))
+            if k:
+                grown[:k, :k] = getattr(self, name)
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def _ensure(self, symbols):
+        for symbol in symbols:
+            if symbol in self._pos:
+                continue
+            if len(self.symbols) == self._capacity:
+                self._grow(self._capacity * 2)
+            self._pos[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+    def _apply(self, x: np.ndarray, sign: float):
+        k = len(self.symbols)
+        x = x[:k]
+        mask = ~np.isnan(x)
+        m = mask.astype(float)
+        v = np.where(mask, x, 0.0)
+        self._n[:k, :k] += sign * np.outer(m, m)
+        self._sx[:k, :k] += sign * np.outer(v, m)
+        self._sxx[:k, :k] += sign * np.outer(v * v, m)
+        self._sxy[:k, :k] += sign * np.outer(v, v)
+
+    def _rebuild(self):
+        for name in ('_n', '_sx', '_sxx', '_sxy'):
+            getattr(self, name)[:] = 0.0
+        for row in range(self._filled):
+            self._apply(self._buffer[row], 1.0)
+
+    def __len__(self) -> int:
+        """Bars currently in the window."""
+        return self._filled
+
+    def push(self, returns: Dict[str, float], time=None):
+        """Adds one bar of log-returns (symbols absent from `returns` count as missing)."""
+        self._ensure(returns)
+        x = np.full(self._capacity, np.nan)
+        for symbol, value in returns.items():
+            x[self._pos[symbol]] = value
+
+        if self._filled == self.window:
+            self._apply(self._buffer[self._head], -1.0)
+        self._buffer[self._head] = x
+        self._apply(x, 1.0)
+        self._head = (self._head + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            self._rebuild()
+        if time is not None:
+            self._last_time = time
+        self._corr = None
+
+    def update_from_frames(self, frames: Dict[str, pd.DataFrame], include_last: bool = False) -> int:
+        """
+        Pushes the H1 bars that closed since the last update, one vector per bar
+        time across all symbols. The last bar of each frame is still forming
+        and is skipped unless `include_last`. The first call seeds up to one
+        window of history. Returns the number of bars pushed.
+        """
+        per_time: Dict[pd.Timestamp, Dict[str, float]] = {}
+        for symbol, df in frames.items():
+            if not isinstance(df, pd.DataFrame) or 'close' not in df.columns or len(df) < 2:
+                continue
+            if not include_last:
+                df = df.iloc[:-1]
+            index = df.index
+            start = 1 if self._last_time is None else max(1, index.searchsorted(self._last_time, side='right'))
+            if self._last_time is None:
+                start = max(start, len(df) - self.window)
+            if start >= len(df):
+                continue
+            closes = df['close'].to_numpy(dtype=float)
+            returns = np.log(closes[start:] / closes[start - 1:-1])
+            for time, value in zip(index[start:], returns):
+                if np.isfinite(value):
+                    per_time.setdefault(time, {})[symbol] = float(value)
+
+        for time in sorted(per_time):
+            self.push(per_time[time], time)
+        return len(per_time)
+
+    def matrix(self) -> pd.DataFrame:
+        """Correlation matrix; pairs with fewer than `min_periods` overlapping bars are 0."""
+        if self._corr is None:
+            k = len(self.symbols)
+            n = self._n[:k, :k]
+            sx = self._sx[:k, :k]
+            sxx = self._sxx[:k, :k]
+            # For pair (i, j): sums of x_i are sx[i, j], sums of x_j are sx[j, i]
+            cov = n * self._sxy[:k, :k] - sx * sx.T
+            var = n * sxx - sx * sx
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = cov / np.sqrt(var * var.T)
+            corr[(n < self.min_periods) | ~np.isfinite(corr)] = 0.0
+            np.fill_diagonal(corr, 1.0)
+            self._corr = np.clip(corr, -1.0, 1.0)
+        return pd.DataFrame(self._corr, index=self.symbols, columns=self.symbols)
+
+    def correlation(self, a: str, b: str) -> float:
+        if a == b:
+            return 1.0
+        i, j = self._pos.get(a), self._pos.get(b)
+        if i is None or j is None:
+            return 0.0
+        if self._corr is None:
+            self.matrix()
+        return float(self._corr[i, j])
+
 
 class CorrelationAnalyzer:
     CURRENCY_MAP = {
@@ -6,6 +158,8 @@ class CorrelationAnalyzer:
         "GBPUSD": ("GBP", "USD"),
         "USDJPY": ("USD", "JPY"),
         "AUDUSD": ("AUD", "USD"),
+        "NZDUSD": ("NZD", "USD"),
+        "USDCAD": ("USD", "CAD"),
         "GC": ("XAU", "USD"), # Gold Futures
         "GC=F": ("XAU", "USD"),
         "XAUUSD": ("XAU", "USD"),
@@ -13,55 +167,83 @@ class CorrelationAnalyzer:
         "CL": ("WTI", "USD"),
     }
 
+    # V16.0: Rolling return correlation used for the exposure cap (None = currency map only)
+    correlation: Optional[RollingCorrelation] = None
+
     @staticmethod
-    def filter_signals(signals: list) -> list:
+    def filter_signals(signals: list, correlation: Optional[RollingCorrelation] = None,
+                       max_exposure: float = CORRELATION_MAX_EXPOSURE) -> list:
         """
         Analyzes a list of signals and filters out correlated conflicts.
-        Prioritizes by win_prob.
+        Prioritizes by win_prob (then confidence) and greedily accepts signals
+        while the correlated exposure w'Rw stays within `max_exposure`.
         """
         if not signals:
             return []
 
-        # Sort by win_prob descending
-        sorted_signals = sorted(signals, key=lambda x: x.get('win_prob', 0), reverse=True)
+        correlation = correlation or CorrelationAnalyzer.correlation
+
+        # Sort by win_prob descending (confidence when no ML probability is attached)
+        sorted_signals = sorted(signals, key=lambda x: (x.get('win_prob', 0), x.get('confidence', 0)), reverse=True)
         
         final_signals = []
         exposure = {} # TRACK CURRENCY EXPOSURE (e.g., {'USD': 'SHORT'})
+        accepted = {} # symbol -> +1 BUY / -1 SELL
+        portfolio_exposure = 0.0
 
         for signal in sorted_signals:
             pair = signal.get('pair') or signal.get('symbol')
+            symbol = signal.get('symbol') or pair
             direction = signal['direction']
-            
-            currencies = CorrelationAnalyzer.CURRENCY_MAP.get(pair)
-            if not currencies:
-                final_signals.append(signal)
-                continue
+            sign = 1.0 if direction == "BUY" else -1.0
 
-            base, quote = currencies
-            
-            # Simple Exposure Logic:
-            # BUY EURUSD -> LONG EUR, SHORT USD
-            # SELL EURUSD -> SHORT EUR, LONG USD
+            # V16.0: Never alert both sides of one symbol (the currency map misses gold and indices)
+            if accepted.get(symbol, sign) != sign:
+                logging.info(f"⚠️ [CORRELATION FILTER] Skipping {pair} {direction}: opposite side already accepted.")
+                continue
             
-            current_signal_exposure = {
-                base: "LONG" if direction == "BUY" else "SHORT",
-                quote: "SHORT" if direction == "BUY" else "LONG"
-            }
+            currencies = CorrelationAnalyzer.CURRENCY_MAP.get(pair) or CorrelationAnalyzer.CURRENCY_MAP.get(str(pair).replace("=X", ""))
+            current_signal_exposure = {}
+            if currencies:
+                base, quote = currencies
+                
+                # Simple Exposure Logic:
+                # BUY EURUSD -> LONG EUR, SHORT USD
+                # SELL EURUSD -> SHORT EUR, LONG USD
+                
+                current_signal_exposure = {
+                    base: "LONG" if direction == "BUY" else "SHORT",
+                    quote: "SHORT" if direction == "BUY" else "LONG"
+                }
 
-            conflict = False
-            for curr, side in current_signal_exposure.items():
-                if curr in exposure and exposure[curr] != side:
-                    # CONFLICT! e.g., already have USD SHORT, now trying to do USD LONG
-                    conflict = True
-                    break
-            
-            if not conflict:
-                # Add to final list and update exposure
-                final_signals.append(signal)
+                conflict = False
                 for curr, side in current_signal_exposure.items():
-                    exposure[curr] = side
-            else:
-                logging.info(f"⚠️ [CORRELATION FILTER] Skipping {pair} {direction} due to conflict with existing exposure.")
+                    if curr in exposure and exposure[curr] != side:
+                        # CONFLICT! e.g., already have USD SHORT, now trying to do USD LONG
+                        conflict = True
+                        break
+                
+                if conflict:
+                    logging.info(f"⚠️ [CORRELATION FILTER] Skipping {pair} {direction} due to conflict with existing exposure.")
+                    continue
+
+            # Marginal w'Rw: own unit variance plus twice the signed correlation with each accepted
+            # symbol. Further strategies agreeing on an accepted symbol add no new position.
+            added = 0.0
+            if correlation is not None and symbol not in accepted:
+                added = 1.0 + 2.0 * sum(sign * other_sign * correlation.correlation(symbol, other)
+                                        for other, other_sign in accepted.items())
+                if portfolio_exposure + added > max_exposure:
+                    logging.info(f"⚠️ [CORRELATION FILTER] Skipping {pair} {direction}: correlated exposure "
+                                 f"{portfolio_exposure + added:.2f} > {max_exposure}")
+                    continue
+
+            # Add to final list and update exposure
+            final_signals.append(signal)
+            accepted.setdefault(symbol, sign)
+            portfolio_exposure += added
+            for curr, side in current_signal_exposure.items():
+                exposure[curr] = side
 
         return final_signals
 
@@ -1,21 +1,38 @@
+import numpy as np
 import pandas as pd
 import pandas_ta_classic as ta
+from indicators.snapshot import TailView
+
+NEUTRAL = {'bias': 'NEUTRAL', 'strength': 'WEAK'}
+
 
 class DailyBias:
+    MIN_BARS = 50
+
     @staticmethod
     def analyze(d1_df: pd.DataFrame) -> dict:
         """
         Analyzes Daily (D1) structure to determine higher timeframe bias.
         This allows the system to override 'Choppy' signals on lower timeframes
         if the Daily expansion carries significant momentum.
+        Accepts a DataFrame or a pre-extracted TailView.
         """
-        if d1_df is None or d1_df.empty or len(d1_df) < 50:
-            return {'bias': 'NEUTRAL', 'strength': 'WEAK'}
+        if d1_df is None or d1_df.empty or len(d1_df) < DailyBias.MIN_BARS:
+            return dict(NEUTRAL)
 
-        latest = d1_df.iloc[-1]
+        if isinstance(d1_df, TailView):
+            latest = d1_df.latest
+        else:
+            latest = d1_df.iloc[-1]
+
+        # V16.0: Frames annotated by DailyBias.annotate() answer with one row read
+        if 'daily_bias' in d1_df.columns:
+            return {'bias': latest['daily_bias'], 'strength': latest['daily_strength'], 'ema_20': latest['ema_20']}
+
+        closes = pd.Series(d1_df.column('close')) if isinstance(d1_df, TailView) else d1_df['close']
         
         # 1. EMA Trend (20 Daily EMA is standard for short-term institutional trend)
-        ema_20 = d1_df['ema_20'].iloc[-1] if 'ema_20' in d1_df.columns else ta.ema(d1_df['close'], length=20).iloc[-1]
+        ema_20 = latest['ema_20'] if 'ema_20' in d1_df.columns else ta.ema(closes, length=20).iloc[-1]
         
         bias = "NEUTRAL"
         if latest['close'] > ema_20:
@@ -55,3 +72,69 @@ class DailyBias:
             'strength': strength,
             'ema_20': ema_20
         }
+
+    @staticmethod
+    def analyze_all(d1_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        V16.0: `analyze()` for every D1 bar in one vectorized pass.
+        Row i equals analyze(d1_df.iloc[:i + 1]): columns daily_bias,
+        daily_strength and ema_20 (the EMA is causal, so the full-history
+        series matches the one computed on each prefix).
+        """
+        if d1_df is None or d1_df.empty:
+            return pd.DataFrame(columns=['daily_bias', 'daily_strength', 'ema_20'], index=getattr(d1_df, 'index', None))
+
+        close = d1_df['close'].to_numpy(dtype=float)
+        open_ = d1_df['open'].to_numpy(dtype=float)
+        high = d1_df['high'].to_numpy(dtype=float)
+        low = d1_df['low'].to_numpy(dtype=float)
+        if 'ema_20' in d1_df.columns:
+            ema = d1_df['ema_20'].to_numpy(dtype=float)
+        else:
+            ema_series = ta.ema(d1_df['close'], length=20)
+            ema = ema_series.to_numpy(dtype=float) if ema_series is not None else np.full(len(close), np.nan)
+
+        bias = np.where(close > ema, 'BULLISH', np.where(close < ema, 'BEARISH', 'NEUTRAL')).astype(object)
+
+        daily_range = high - low
+        body = np.abs(close - open_)
+        decent_body = body > daily_range * 0.5
+        strong_bull = (close > open_) & (bias == 'BULLISH') & ((close - low) > daily_range * 0.75) & decent_body
+        strong_bear = (close < open_) & (bias == 'BEARISH') & ((high - close) > daily_range * 0.75) & decent_body
+        strength = np.where(strong_bull | strong_bear, 'STRONG', 'WEAK').astype(object)
+
+        # Not enough history yet: same answer as the scalar gate
+        warmup = np.arange(len(close)) < DailyBias.MIN_BARS - 1
+        bias[warmup] = 'NEUTRAL'
+        strength[warmup] = 'WEAK'
+
+        return pd.DataFrame({'daily_bias': bias, 'daily_strength': strength, 'ema_20': ema}, index=d1_df.index)
+
+    @staticmethod
+    def annotate(d1_df: pd.DataFrame) -> pd.DataFrame:
+        """Copy of `d1_df` with the analyze_all() columns, so analyze() becomes a row read."""
+        daily = DailyBias.analyze_all(d1_df)
+        annotated = d1_df.copy()
+        for col in daily.columns:
+            annotated[col] = daily[col]
+        return annotated
+
+    @staticmethod
+    def align(daily: pd.DataFrame, positions: np.ndarray) -> dict:
+        """
+        Maps analyze_all() rows onto intraday bars. `positions` is the D1 row
+        per intraday bar from TimeframeAlignment (`alignment.positions['d1']`,
+        -1 before the first closed day). Returns per-bar arrays 'bias',
+        'strength' and 'ema_20'.
+        """
+        valid = positions >= 0
+        pos = np.maximum(positions, 0)
+        if len(daily) == 0:
+            valid = np.zeros(len(positions), dtype=bool)
+            pos = np.zeros(len(positions), dtype=int)
+            daily = pd.DataFrame({'daily_bias': ['NEUTRAL'], 'daily_strength': ['WEAK'], 'ema_20': [np.nan]})
+        return {
+            'bias': np.where(valid, daily['daily_bias'].to_numpy(dtype=object)[pos], 'NEUTRAL').astype(object),
+            'strength': np.where(valid, daily['daily_strength'].to_numpy(dtype=object)[pos], 'WEAK').astype(object),
+            'ema_20': np.where(valid, daily['ema_20'].to_numpy(dtype=float)[pos], np.nan),
+        }
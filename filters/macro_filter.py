@@ -6,7 +6,12 @@ class MacroFilter:
     def get_macro_bias(market_context: Dict[str, pd.DataFrame]) -> Dict[str, str]:
         """
         Analyzes DXY and ^TNX to determine global risk bias.
+        V16.0: Reads the MacroRegimeEngine snapshot from market_context['macro'] when published.
         """
+        snapshot = market_context.get('macro') if market_context else None
+        if snapshot is not None:
+            return snapshot.bias
+
         bias = {
             'DXY': 'NEUTRAL',
             'TNX': 'NEUTRAL',
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+from config.config import MACRO_BASKET, MACRO_EMA_PERIOD, MACRO_RISK_THRESHOLD
+from engine.alignment import TimeframeAlignment
+
+H1 = pd.Timedelta(hours=1)
+
+
+def _trend_label(trend: int) -> str:
+    return 'BULLISH' if trend > 0 else 'BEARISH' if trend < 0 else 'NEUTRAL'
+
+
+class MacroSnapshot:
+    """
+    Published macro state. `bias` is the MacroFilter-compatible dict
+    ({'DXY': ..., 'TNX': ..., 'RISK': ...} plus one entry per basket series);
+    `version` increases whenever the published features change, so readers
+    can cache anything derived from it.
+    """
+    __slots__ = ('version', 'time', 'bias', 'features', 'risk_score')
+
+    def __init__(self, version: int, time, bias: Dict[str, str], features: Dict[str, dict], risk_score: int):
+        self.version = version
+        self.time = time
+        self.bias = bias
+        self.features = features
+        self.risk_score = risk_score
+
+    def __getitem__(self, key: str) -> str:
+        return self.bias[key]
+
+    def get(self, key: str, default=None):
+        return self.bias.get(key, default)
+
+    def __repr__(self) -> str:
+        return f"MacroSnapshot(v{self.version}, {self.bias})"
+
+
+class MacroRegimeEngine:
+    """
+    V16.0: Macro regime over a configurable basket (MACRO_BASKET).
+
+    Live: `update(market_data)` folds only the H1 bars closed since the last
+    call into each series' EMA state (O(1) per bar) and publishes a new
+    MacroSnapshot. The forming bar is evaluated against a provisional EMA
+    without entering the state. Strategies read the snapshot from
+    market_context['macro'], so a bigger basket costs nothing per signal.
+
+    Backtest: `regime_frame()` computes the same features for the whole
+    history in one vectorized pass.
+    """
+
+    def __init__(self, basket: Dict[str, Tuple[str, str, int]] = None, ema_period: int = MACRO_EMA_PERIOD,
+                 risk_threshold: float = MACRO_RISK_THRESHOLD):
+        self.basket = MACRO_BASKET if basket is None else basket
+        self.alpha = 2.0 / (ema_period + 1)
+        self.risk_threshold = risk_threshold
+        self._state = {key: {'ema': None, 'time': None} for key in self.basket}
+        self.version = 0
+        self.snapshot = self._publish({}, None)
+
+    @staticmethod
+    def _label(value: float, ema: float) -> int:
+        # Same rule as MacroFilter: above the EMA is bullish, otherwise bearish
+        return 1 if value > ema else -1
+
+    def _risk(self, trends: Dict[str, int]) -> Tuple[int, str]:
+        score = sum(self.basket[key][2] * trend for key, trend in trends.items())
+        needed = self.risk_threshold * len(self.basket)
+        if self.basket and score >= needed:
+            return score, 'ON'
+        if self.basket and score <= -needed:
+            return score, 'OFF'
+        return score, 'NEUTRAL'
+
+    def _publish(self, features: Dict[str, dict], time) -> MacroSnapshot:
+        trends = {key: f['trend'] for key, f in features.items()}
+        bias = {self.basket[key][1]: _trend_label(trends.get(key, 0)) for key in self.basket}
+        score, bias['RISK'] = self._risk(trends)
+        return MacroSnapshot(self.version, time, bias, features, score)
+
+    def _consume(self, key: str, df: pd.DataFrame, include_last: bool) -> Optional[dict]:
+        """Advances one series' EMA over newly closed bars; returns its current features."""
+        state = self._state[key]
+        closed = len(df) if include_last else len(df) - 1
+        index = df.index
+        start = 0 if state['time'] is None else index.searchsorted(state['time'], side='right')
+        if start < closed:
+            closes = df['close'].to_numpy(dtype=float)
+            ema = state['ema']
+            for value in closes[start:closed]:
+                ema = value if ema is None else ema + self.alpha * (value - ema)
+            state['ema'] = ema
+            state['time'] = index[closed - 1]
+        if state['ema'] is None:
+            return None
+
+        close = float(df['close'].iloc[-1])
+        ema = state['ema']
+        if not include_last and len(df) > closed:
+            # Forming bar: provisional EMA, not committed to the state
+            ema = ema + self.alpha * (close - ema)
+        return {'close': close, 'ema': ema, 'trend': self._label(close, ema), 'time': index[-1]}
+
+    def update(self, market_data: dict, include_last: bool = False) -> MacroSnapshot:
+        """Consumes the basket's H1 frames from `market_data` and publishes a snapshot."""
+        features = {}
+        latest = None
+        for key in self.basket:
+            df = market_data.get(key)
+            if not isinstance(df, pd.DataFrame) or 'close' not in df.columns or df.empty:
+                continue
+            feature = self._consume(key, df, include_last)
+            if feature is not None:
+                features[key] = feature
+                latest = feature['time'] if latest is None else max(latest, feature['time'])
+
+        if features != self.snapshot.features:
+            self.version += 1
+            self.snapshot = self._publish(features, latest)
+        return self.snapshot
+
+    def context(self, market_data: dict) -> dict:
+        """market_context for strategies: the fetched data plus the current snapshot."""
+        context = dict(market_data)
+        context['macro'] = self.update(market_data)
+        return context
+
+    # Backtest ------------------------------------------------------------------------
+
+    def regime_frame(self, frames: Dict[str, pd.DataFrame], index: Optional[pd.DatetimeIndex] = None,
+                     base_tf: str = 'm5') -> pd.DataFrame:
+        """
+        Whole-history regime in one pass: per series `{bias}_ema` / `{bias}_trend`,
+        plus `risk_score`, `RISK` and a bias `version`. Each series' EMA uses the same recursion as
+        `update()`. With `index`, rows are the regime as of each `base_tf` bar
+        close (last fully closed H1 bar, no look-ahead); otherwise the union of
+        the series' bar times, forward-filled.
+        """
+        columns = {}
+        for key, (_, bias_key, _) in self.basket.items():
+            df = frames.get(key)
+            if not isinstance(df, pd.DataFrame) or 'close' not in df.columns or df.empty:
+                continue
+            ema = df['close'].astype(float).ewm(alpha=self.alpha, adjust=False).mean()
+            trend = np.where(df['close'].to_numpy(dtype=float) > ema.to_numpy(), 1, -1)
+
+            if index is not None:
+                alignment = TimeframeAlignment(index, {key: df.index}, base_tf=base_tf, durations={key: H1})
+                pos = alignment.positions[key]
+                valid = pos >= 0
+                ema_col = np.where(valid, ema.to_numpy()[np.maximum(pos, 0)], np.nan)
+                trend_col = np.where(valid, trend[np.maximum(pos, 0)], 0)
+                columns[f'{bias_key}_ema'] = pd.Series(ema_col, index=index)
+                columns[f'{bias_key}_trend'] = pd.Series(trend_col, index=index)
+            else:
+                columns[f'{bias_key}_ema'] = ema
+                columns[f'{bias_key}_trend'] = pd.Series(trend, index=df.index)
+
+        regime = pd.DataFrame(columns, index=index)
+        if index is None:
+            regime = regime.sort_index().ffill()
+        score = np.zeros(len(regime), dtype=int)
+        for key, (_, bias_key, sign) in self.basket.items():
+            col = f'{bias_key}_trend'
+            if col in regime:
+                regime[col] = regime[col].fillna(0).astype(int)
+                score += sign * regime[col].to_numpy()
+        needed = self.risk_threshold * len(self.basket)
+        regime['risk_score'] = score
+        regime['RISK'] = np.where(score >= needed, 'ON', np.where(score <= -needed, 'OFF', 'NEUTRAL')) if self.basket else 'NEUTRAL'
+        # Bias version: bumps on every row whose trends/risk differ from the previous row
+        trend_cols = [c for c in regime.columns if c.endswith('_trend')] + ['RISK']
+        changed = (regime[trend_cols] != regime[trend_cols].shift()).any(axis=1).to_numpy()
+        regime['version'] = np.cumsum(changed)
+        return regime
+
+    def snapshot_at(self, regime: pd.DataFrame, i: int) -> MacroSnapshot:
+        """MacroSnapshot for row `i` of a regime_frame (bias/risk only)."""
+        row = regime.iloc[i]
+        bias = {}
+        for key, (_, bias_key, _) in self.basket.items():
+            col = f'{bias_key}_trend'
+            bias[bias_key] = _trend_label(int(row[col])) if col in regime else 'NEUTRAL'
+        bias['RISK'] = row['RISK']
+        return MacroSnapshot(int(row['version']), regime.index[i], bias, {}, int(row['risk_score']))
@@ -0,0 +1,87 @@
+import logging
+import math
+from typing import List, Optional
+
+import pandas as pd
+
+from config.config import EMA_TREND, ML_REJECT_BELOW
+from indicators.snapshot import TailView
+from strategy.displacement import DisplacementAnalyzer
+from training.model_registry import FEATURES, ModelHandle
+
+logger = logging.getLogger(__name__)
+
+
+class MLPreGrader:
+    """
+    V16.0: Local grading stage backed by the shipped win-probability model.
+
+    Candidates carry the model's feature vector (`features()`, same inputs as
+    training/data_collector.py). `predict()` scores a whole cycle's candidates
+    with one `predict_proba` call; AIGrader skips the LLM for candidates the
+    model confidently rejects, and `attach()` stamps `win_prob` on signals for
+    the correlation filter's ordering.
+    """
+    FEATURES = FEATURES
+
+    def __init__(self, model=None, reject_below: float = ML_REJECT_BELOW):
+        self.model = model
+        self.reject_below = reject_below
+
+    @staticmethod
+    def features(data: dict, direction: str) -> Optional[dict]:
+        """Model inputs for a setup: the latest M15 bar plus the H1 narrative, or None if incomplete."""
+        m15, h1 = TailView.of(data, 'm15'), TailView.of(data, 'h1')
+        if m15 is None or h1 is None or m15.empty or h1.empty:
+            return None
+        bar, h1_bar = m15.latest, h1.latest
+        candle_range = bar['high'] - bar['low']
+        h1_ema = h1_bar.get(f'ema_{EMA_TREND}')
+        atr = bar.get('atr')
+        features = {
+            'rsi': bar.get('rsi'),
+            'body_ratio': abs(bar['close'] - bar['open']) / candle_range if candle_range != 0 else 0,
+            'atr_norm': atr / bar['close'] if atr is not None and bar['close'] else None,
+            'displaced': 1 if DisplacementAnalyzer.is_displaced(bar, direction) else 0,
+            'h1_trend': None if h1_ema is None else (1 if h1_bar['close'] > h1_ema else -1)
+        }
+        if any(v is None or (isinstance(v, float) and math.isnan(v)) for v in features.values()):
+            return None
+        return {name: float(value) for name, value in features.items()}
+
+    def predict(self, rows: List[Optional[dict]]) -> List[Optional[float]]:
+        """Win probability per row in one batched predict_proba (None where no features/model)."""
+        probs = [None] * len(rows)
+        complete = [i for i, row in enumerate(rows) if row]
+        if not complete or not self.available:
+            return probs
+        frame = pd.DataFrame([rows[i] for i in complete], columns=list(self.FEATURES))
+        try:
+            proba = self.model.predict_proba(frame)
+        except Exception as e:
+            logger.error(f"ML pre-grader failed: {e}")
+            return probs
+        for i, row in zip(complete, proba):
+            probs[i] = float(row[1])
+        return probs
+
+    @property
+    def available(self) -> bool:
+        """True when there is a model to score with (a ModelHandle loads its version here)."""
+        if isinstance(self.model, ModelHandle):
+            return self.model.current() is not None
+        return self.model is not None
+
+    def rejects(self, win_prob: Optional[float]) -> bool:
+        return win_prob is not None and win_prob < self.reject_below
+
+    def attach(self, signals: List[dict]) -> List[dict]:
+        """Sets `win_prob` on every signal that carries `ml_features` (one batched call)."""
+        records = [s for s in signals if isinstance(s, dict)]
+        features = [s.pop('ml_features', None) for s in records]
+        pending = [i for i, s in enumerate(records) if 'win_prob' not in s]
+        probs = self.predict([features[i] for i in pending])
+        for i, prob in zip(pending, probs):
+            if prob is not None:
+                records[i]['win_prob'] = round(prob, 3)
+        return signals
@@ -0,0 +1,105 @@
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import pandas as pd
+import pytz
+
+from config.config import NEWS_WASH_ZONE, NEWS_IMPACT_LEVELS
+from filters.news_sentiment import NewsSentimentAnalyzer
+
+
+def to_epoch(value) -> float:
+    """UTC epoch seconds for a datetime/Timestamp/ISO string (naive = UTC) or a number."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            value = pd.to_datetime(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=pytz.UTC)
+    return value.timestamp()
+
+
+class NewsIndex(list):
+    """
+    Calendar events pre-indexed for wash-zone lookups.
+
+    Still a list of the raw Forex Factory events (so it can be passed anywhere
+    `news_events` was), plus per-currency arrays sorted by UTC epoch time with
+    the event's impact and NewsSentimentAnalyzer bias computed once per fetch.
+    Lookups are bisect range queries around any timestamp.
+    """
+
+    def __init__(self, events: Optional[Iterable[dict]] = None):
+        super().__init__(events or [])
+        self._times = {}   # currency -> sorted epoch seconds
+        self._entries = {} # currency -> events aligned with _times
+        self._high = {}    # currency -> sorted epoch seconds of High impact events
+
+        parsed = []
+        for event in self:
+            try:
+                parsed.append((to_epoch(event.get('date')), event))
+            except Exception:
+                logging.debug(f"Skipping news event without a valid date: {event.get('title')}")
+        parsed.sort(key=lambda item: item[0])
+
+        for ts, event in parsed:
+            currency = event.get('country')
+            entry = {
+                'title': event.get('title'),
+                'impact': event.get('impact'),
+                'ts': ts,
+                'bias': NewsSentimentAnalyzer.get_bias(event)
+            }
+            self._times.setdefault(currency, []).append(ts)
+            self._entries.setdefault(currency, []).append(entry)
+            if entry['impact'] == "High":
+                self._high.setdefault(currency, []).append(ts)
+
+    @staticmethod
+    def of(news_events) -> 'NewsIndex':
+        """Returns `news_events` if already indexed, otherwise indexes it."""
+        return news_events if isinstance(news_events, NewsIndex) else NewsIndex(news_events)
+
+    @property
+    def currencies(self) -> List[str]:
+        return list(self._times)
+
+    def events_near(self, currencies: List[str], at, window_minutes: float = NEWS_WASH_ZONE,
+                    impacts: List[str] = NEWS_IMPACT_LEVELS) -> List[dict]:
+        """Events for `currencies` within +/- window_minutes of `at`, ordered by time."""
+        at_ts = to_epoch(at)
+        window = window_minutes * 60
+        found = []
+        for currency in currencies:
+            times = self._times.get(currency)
+            if not times:
+                continue
+            lo, hi = bisect_left(times, at_ts - window), bisect_right(times, at_ts + window)
+            for entry in self._entries[currency][lo:hi]:
+                if entry['impact'] not in impacts:
+                    continue
+                found.append({
+                    'title': entry['title'],
+                    'impact': entry['impact'],
+                    'time': datetime.fromtimestamp(entry['ts'], pytz.UTC),
+                    'minutes_away': round((entry['ts'] - at_ts) / 60, 1),
+                    'bias': entry['bias']
+                })
+        found.sort(key=lambda e: e['time'])
+        return found
+
+    def has_high_impact(self, currencies: List[str], at, window_minutes: float = NEWS_WASH_ZONE) -> bool:
+        """True when a High impact event for any of `currencies` is within the window."""
+        at_ts = to_epoch(at)
+        window = window_minutes * 60
+        for currency in currencies:
+            times = self._high.get(currency)
+            if times and bisect_right(times, at_ts + window) > bisect_left(times, at_ts - window):
+                return True
+        return False
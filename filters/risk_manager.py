@@ -1,7 +1,6 @@
 from config.config import ACCOUNT_BALANCE, RISK_PER_TRADE_PERCENT, MIN_LOT_SIZE
-import pandas as pd
-import sqlite3
-import os
+from typing import Optional
+from filters.risk_state import RiskState
 
 class RiskManager:
     # Approximate pip values for 0.01 lot (1,000 units)
@@ -18,40 +17,30 @@ class RiskManager:
         "IXIC": 0.05     # Nasdaq
     }
 
+    # V16.0: Sizing state lives in memory (RiskState). A backtest installs a
+    # simulated state here so the streak scaling follows its own trades.
+    state: Optional[RiskState] = None
+
+    @staticmethod
+    def install(state: Optional[RiskState]) -> Optional[RiskState]:
+        """Routes sizing to `state` (None restores the journal state); returns the previous one."""
+        previous = RiskManager.state
+        RiskManager.state = state
+        return previous
+
     @staticmethod
-    def calculate_lot_size(symbol: str, entry: float, sl: float, db_path="database/signals.db") -> dict:
+    def calculate_lot_size(symbol: str, entry: float, sl: float, db_path="database/signals.db",
+                           state: Optional[RiskState] = None) -> dict:
         """
         Calculates the recommended lot size with V7.0 Dynamic Scaling.
         Adjusts risk based on recent performance streaks.
         """
-        import sqlite3
-        import os
-        
         base_risk_pct = RISK_PER_TRADE_PERCENT
-        multiplier = 1.0
-        
-        # V7.0 Performance-Based Scaling
-        if os.path.exists(db_path):
-            try:
-                conn = sqlite3.connect(db_path)
-                # Get last 5 resolved trades
-                query = "SELECT status FROM signals WHERE status IN ('WIN', 'LOSS', 'BREAKEVEN') ORDER BY timestamp DESC LIMIT 5"
-                recent_trades = pd.read_sql_query(query, conn)['status'].tolist()
-                conn.close()
-                
-                if recent_trades:
-                    # Streak Logic
-                    win_streak = 0
-                    loss_streak = 0
-                    for status in recent_trades:
-                        if status == 'WIN': win_streak += 1
-                        elif status == 'LOSS': loss_streak += 1
-                        else: break # Break on breakeven
-                    
-                    if win_streak >= 3: multiplier = 1.25 # Reward 3+ wins
-                    elif loss_streak >= 2: multiplier = 0.75 # Protect after 2 losses
-            except:
-                pass
+
+        # V7.0 Performance-Based Scaling (answered from memory, no per-call query)
+        if state is None:
+            state = RiskManager.state or RiskState.for_journal(db_path)
+        multiplier = state.multiplier()
 
         risk_amount = ACCOUNT_BALANCE * (base_risk_pct / 100) * multiplier
         
@@ -0,0 +1,183 @@
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RiskState:
+    """
+    In-memory view of the journal state that drives position sizing: the
+    recent resolved-trade streak, open exposure and the day's realised P&L.
+
+    Journal mode (`db_path` set) loads once from the signals table, is kept
+    current by SignalJournal write events (`on_journal_event`) and reloads only
+    when another process (e.g. the performance auditor) commits to the DB,
+    detected with SQLite's `PRAGMA data_version` instead of re-reading trades.
+
+    Simulation mode (no `db_path`) starts empty and is fed by a backtest via
+    `on_open` / `on_result`, so sizing reacts to the simulated outcomes.
+    """
+    LOOKBACK = 5
+    RESOLVED = ('WIN', 'LOSS', 'BREAKEVEN')
+
+    _shared: Dict[str, 'RiskState'] = {}
+
+    def __init__(self, db_path: Optional[str] = None, clock: Callable[[], datetime] = datetime.now):
+        self.db_path = db_path
+        self.clock = clock
+        self._conn = None
+        self._version = None
+        self._stale = False
+        self._reset()
+        if db_path is not None:
+            self._sync()
+
+    @classmethod
+    def for_journal(cls, db_path: str = "database/signals.db") -> 'RiskState':
+        """Process-wide state for a journal DB, created on first use."""
+        key = os.path.abspath(db_path)
+        state = cls._shared.get(key)
+        if state is None:
+            state = cls._shared[key] = cls(db_path)
+        return state
+
+    @property
+    def simulated(self) -> bool:
+        return self.db_path is None
+
+    def _reset(self):
+        self._recent = []     # (timestamp, id, status), newest first, at most LOOKBACK
+        self._open = {}       # id -> symbol
+        self._day = None
+        self._day_pnl = {}    # id -> realised P&L of trades opened on `_day`
+
+    # Journal mode -----------------------------------------------------------
+
+    def _data_version(self):
+        try:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def _sync(self):
+        """Reloads from the DB only if it changed since the last load."""
+        if self._conn is None:
+            # Never create the journal DB from here
+            if not os.path.exists(self.db_path):
+                return
+            try:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            except sqlite3.Error as e:
+                logger.debug(f"RiskState could not open {self.db_path}: {e}")
+                return
+        version = self._data_version()
+        if version is not None and version == self._version and not self._stale:
+            return
+        self._load()
+        self._version = version
+        self._stale = False
+
+    def _load(self):
+        self._reset()
+        placeholders = ",".join("?" * len(self.RESOLVED))
+        try:
+            rows = self._conn.execute(
+                f"SELECT rowid, timestamp, status FROM signals WHERE status IN ({placeholders}) "
+                "ORDER BY timestamp DESC LIMIT ?", (*self.RESOLVED, self.LOOKBACK)
+            ).fetchall()
+            self._recent = [(ts, rowid, status) for rowid, ts, status in rows]
+        except sqlite3.Error as e:
+            logger.debug(f"RiskState streak load failed: {e}")
+        try:
+            self._open = dict(self._conn.execute(
+                "SELECT rowid, symbol FROM signals WHERE status = 'PENDING'"
+            ).fetchall())
+            self._day = self._today()
+            self._day_pnl = dict(self._conn.execute(
+                "SELECT rowid, result_pips FROM signals WHERE timestamp LIKE ? AND status != 'PENDING'",
+                (f"{self._day}%",)
+            ).fetchall())
+        except sqlite3.Error as e:
+            logger.debug(f"RiskState exposure load failed: {e}")
+
+    def on_journal_event(self, event: str, payload: dict):
+        """SignalJournal listener: applies 'open' / 'result' writes in memory."""
+        if event == 'open':
+            self.on_open(payload['id'], payload.get('symbol'), payload.get('timestamp'))
+        elif event == 'result':
+            self.on_result(payload['id'], payload['status'], payload.get('pips', 0.0), payload.get('timestamp'))
+        if self._conn is not None and not self._stale:
+            # Our own journal's commit is already applied; don't reload for it
+            self._version = self._data_version()
+
+    # Updates (journal events and backtest feed) ------------------------------
+
+    def _today(self) -> str:
+        return self.clock().strftime("%Y-%m-%d")
+
+    def _roll_day(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._day_pnl = {}
+
+    def on_open(self, trade_id, symbol: Optional[str], timestamp=None):
+        self._open[trade_id] = symbol
+
+    def on_result(self, trade_id, status: str, pnl: float = 0.0, timestamp=None):
+        """Records a trade outcome. `timestamp` is the trade's open time (journal order)."""
+        self._open.pop(trade_id, None)
+        ts = str(timestamp) if timestamp is not None else self.clock().isoformat()
+
+        self._roll_day()
+        if ts.startswith(self._day):
+            self._day_pnl[trade_id] = pnl or 0.0
+
+        was_recent = any(rowid == trade_id for _, rowid, _ in self._recent)
+        self._recent = [entry for entry in self._recent if entry[1] != trade_id]
+        if status in self.RESOLVED:
+            if len(self._recent) < self.LOOKBACK or ts > self._recent[-1][0]:
+                self._recent.append((ts, trade_id, status))
+                self._recent.sort(key=lambda entry: entry[0], reverse=True)
+                del self._recent[self.LOOKBACK:]
+        elif was_recent and not self.simulated:
+            # A trade left the window; the next one back only lives in the DB
+            self._stale = True
+
+    # Queries ------------------------------------------------------------------
+
+    def recent(self) -> list:
+        """Statuses of the last LOOKBACK resolved trades, newest first."""
+        if not self.simulated:
+            self._sync()
+        return [status for _, _, status in self._recent]
+
+    def multiplier(self) -> float:
+        """V7.0 streak scaling: 3+ wins -> 1.25, 2+ losses -> 0.75 (a breakeven ends the run)."""
+        win_streak = 0
+        loss_streak = 0
+        for status in self.recent():
+            if status == 'WIN': win_streak += 1
+            elif status == 'LOSS': loss_streak += 1
+            else: break
+
+        if win_streak >= 3: return 1.25
+        if loss_streak >= 2: return 0.75
+        return 1.0
+
+    def open_positions(self, symbol: Optional[str] = None) -> int:
+        if not self.simulated:
+            self._sync()
+        if symbol is None:
+            return len(self._open)
+        return sum(1 for s in self._open.values() if s == symbol)
+
+    def daily_pnl(self) -> float:
+        """Realised P&L (journal pips / backtest R) of trades opened today."""
+        if not self.simulated:
+            self._sync()
+        self._roll_day()
+        return float(sum(self._day_pnl.values()))
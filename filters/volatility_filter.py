@@ -1,16 +1,34 @@
 import pandas as pd
+from indicators.snapshot import TailView
 
 class VolatilityFilter:
+    @staticmethod
+    def volatile_series(df: pd.DataFrame) -> pd.Series:
+        """
+        V16.0: `is_volatile` for every bar in one pass (precomputed as the
+        'volatile' column by IndicatorCalculator.add_indicators).
+        """
+        atr = df['atr'].astype(float)
+        return (atr > df['atr_avg'].astype(float)) & (atr >= atr.shift(1))
+
     @staticmethod
     def is_volatile(m1_df: pd.DataFrame) -> bool:
         """
         Checks if ATR is expanding and above average.
+        Accepts a DataFrame or a pre-extracted TailView.
         """
         if m1_df.empty or len(m1_df) < 2:
             return False
 
-        latest = m1_df.iloc[-1]
-        prev = m1_df.iloc[-2]
+        if isinstance(m1_df, TailView):
+            latest, prev = m1_df.latest, m1_df.prev(1)
+        else:
+            latest = m1_df.iloc[-1]
+            prev = m1_df.iloc[-2]
+
+        # V16.0: Precomputed column when available
+        if 'volatile' in latest:
+            return bool(latest['volatile'])
         
         atr = latest['atr']
         atr_avg = latest['atr_avg']
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pandas_ta_classic as ta
 from config.config import (
@@ -6,6 +7,10 @@ from config.config import (
     POC_LOOKBACK, ASIAN_RANGE_MIN_PIPS
 )
 from datetime import time
+from indicators.snapshot import TailView
+from filters.volatility_filter import VolatilityFilter
+from strategy.displacement import DisplacementAnalyzer
+from strategy.entry import EntryLogic
 
 class IndicatorCalculator:
     @staticmethod
@@ -31,6 +36,11 @@ class IndicatorCalculator:
         
         # ATR Average for volatility filter
         df['atr_avg'] = df['atr'].rolling(window=ATR_AVG_PERIOD).mean()
+
+        # V16.0 Vectorized signal columns: bar-level filter checks become column reads
+        df['volatile'] = VolatilityFilter.volatile_series(df)
+        df[['displaced_buy', 'displaced_sell']] = DisplacementAnalyzer.displaced_series(df)
+        df[['pullback_buy', 'pullback_sell']] = EntryLogic.pullback_series(df)
         
         # ADR (Average Daily Range) - Only for H1 as it's the anchor TF for daily range
         if timeframe == "h1":
@@ -170,11 +180,11 @@ class IndicatorCalculator:
         """
         if df.empty or ema_col not in df.columns: return 0.0
         
-        subset = df[ema_col].tail(3)
+        subset = df.window(ema_col, 3) if isinstance(df, TailView) else df[ema_col].tail(3).to_numpy()
         if len(subset) < 3: return 0.0
         
-        start_val = subset.iloc[0]
-        end_val = subset.iloc[-1]
+        start_val = subset[0]
+        end_val = subset[-1]
         
         if start_val == 0: return 0.0
         
@@ -233,20 +243,24 @@ class IndicatorCalculator:
         """
         if df.empty or len(df) < 50: return {'phase': 'ACCUMULATION', 'manipulated': False}
         
-        # 1. Detect Accumulation (Consolidation)
+        # V16.0: Only the last lookback+5 bars are read, as arrays (DataFrame or TailView)
         lookback = 24
-        subset = df.iloc[-(lookback+5):-5] 
-        range_high = subset['high'].max()
-        range_low = subset['low'].min()
+        if isinstance(df, TailView):
+            tail = {col: df.window(col, lookback + 5) for col in ('open', 'high', 'low', 'close')}
+        else:
+            tail = {col: df[col].iloc[-(lookback+5):].to_numpy() for col in ('open', 'high', 'low', 'close')}
+        
+        # 1. Detect Accumulation (Consolidation)
+        range_high = np.nanmax(tail['high'][:-5])
+        range_low = np.nanmin(tail['low'][:-5])
         
         # 2. Detect Manipulation (Sweep of range)
-        recent = df.tail(5)
-        manip_buy = (recent['low'] < range_low).any() and (recent['close'] > range_low).any()
-        manip_sell = (recent['high'] > range_high).any() and (recent['close'] < range_high).any()
+        manip_buy = (tail['low'][-5:] < range_low).any() and (tail['close'][-5:] > range_low).any()
+        manip_sell = (tail['high'][-5:] > range_high).any() and (tail['close'][-5:] < range_high).any()
         
         # 3. Detect Distribution (Directional expansion)
-        latest_close = df.iloc[-1]['close']
-        latest_open = df.iloc[-5]['open'] 
+        latest_close = tail['close'][-1]
+        latest_open = tail['open'][-5]
         
         is_expansion_up = latest_close > latest_open and latest_close > range_high
         is_expansion_down = latest_close < latest_open and latest_close < range_low
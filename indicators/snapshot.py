@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+
+class BarSnapshot:
+    """
+    Compact record of a single bar: OHLCV as slots, every other column
+    (indicators, flags, regime) through attribute or dict-style access.
+
+    Values are plain Python scalars, so reads in the strategy hot path cost an
+    attribute lookup instead of a pandas row Series construction.
+    """
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'volume', '_fields', '_values')
+
+    def __init__(self, time, fields: Dict[str, int], values: tuple):
+        self.time = time
+        self._fields = fields
+        self._values = values
+        for name in ('open', 'high', 'low', 'close', 'volume'):
+            pos = fields.get(name)
+            setattr(self, name, values[pos] if pos is not None else None)
+
+    def __getattr__(self, name):
+        # Only reached for non-slot names (indicator columns)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._values[self._fields[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        return self._values[self._fields[name]]
+
+    def __contains__(self, name) -> bool:
+        return name in self._fields
+
+    def get(self, name, default=None):
+        pos = self._fields.get(name)
+        return self._values[pos] if pos is not None else default
+
+    def to_dict(self) -> dict:
+        return {name: self._values[pos] for name, pos in self._fields.items()}
+
+    def __repr__(self):
+        return f"BarSnapshot({self.time}, close={self.close})"
+
+
+class TailView:
+    """
+    Array-backed view of a frame ending at a given bar (its latest by default).
+
+    Columns are extracted once per frame (zero-copy numpy views where pandas
+    allows it) and shared by every strategy and filter reading the frame.
+    `latest`/`prev(n)` return cached BarSnapshots, `window(col, n)` returns the
+    last n values of a column. `seek`/`advance` move the end bar in O(1), so a
+    backtest can replay a frame without slicing it on every bar.
+    """
+    __slots__ = ('_columns', '_fields', '_index', '_end', '_snapshots', '_day_start')
+
+    def __init__(self, columns: Dict[str, np.ndarray], index, end: Optional[int] = None):
+        self._columns = columns
+        self._fields = {name: pos for pos, name in enumerate(columns)}
+        self._index = index
+        self._end = len(index) - 1 if end is None else end
+        self._snapshots = {}
+        self._day_start = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, end: Optional[int] = None) -> 'TailView':
+        return cls({col: df[col].to_numpy() for col in df.columns}, df.index, end)
+
+    @staticmethod
+    def of(data: dict, key: str) -> Optional['TailView']:
+        """
+        Returns the pre-extracted view for a timeframe, or builds one from the frame.
+        """
+        views = data.get('views')
+        if views and key in views:
+            return views[key]
+        df = data.get(key)
+        return TailView.from_frame(df) if df is not None else None
+
+    def __len__(self) -> int:
+        return self._end + 1
+
+    @property
+    def end(self) -> int:
+        """Position of the latest visible bar in the underlying frame (-1 = none)."""
+        return self._end
+
+    def seek(self, end: int):
+        """Moves the latest visible bar to position `end`."""
+        if end != self._end:
+            self._end = end
+            self._snapshots.clear()
+
+    def advance(self, n: int = 1):
+        self.seek(self._end + n)
+
+    def __contains__(self, col) -> bool:
+        return col in self._columns
+
+    @property
+    def empty(self) -> bool:
+        return self._end < 0
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    @property
+    def time(self):
+        return self._index[self._end]
+
+    @property
+    def latest(self) -> BarSnapshot:
+        return self.prev(0)
+
+    def prev(self, n: int = 1) -> BarSnapshot:
+        """Snapshot of the bar `n` bars before the latest one."""
+        snap = self._snapshots.get(n)
+        if snap is None:
+            pos = self._end - n
+            if pos < 0:
+                raise IndexError(f"Only {len(self)} bars available")
+            values = []
+            for arr in self._columns.values():
+                v = arr[pos]
+                values.append(v.item() if isinstance(v, np.generic) else v)
+            snap = BarSnapshot(self._index[pos], self._fields, tuple(values))
+            self._snapshots[n] = snap
+        return snap
+
+    def column(self, col: str) -> np.ndarray:
+        """All values of a column up to and including the latest bar."""
+        return self._columns[col][:self._end + 1]
+
+    def window(self, col: str, n: int) -> np.ndarray:
+        """The last `n` values of a column (fewer if not enough bars)."""
+        return self._columns[col][max(0, self._end - n + 1):self._end + 1]
+
+    def today_slice(self, col: str) -> np.ndarray:
+        """Values of a column for the latest bar's calendar day, up to the latest bar."""
+        if self._day_start is None:
+            # First position of each bar's day, computed once per frame
+            days = pd.DatetimeIndex(self._index).normalize().asi8
+            starts = np.concatenate([[0], np.flatnonzero(days[1:] != days[:-1]) + 1])
+            self._day_start = starts[np.searchsorted(starts, np.arange(len(days)), side='right') - 1]
+        if self._end < 0:
+            return self._columns[col][:0]
+        return self._columns[col][self._day_start[self._end]:self._end + 1]
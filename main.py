@@ -1,27 +1,32 @@
 import asyncio
 import logging
-import joblib
 import os
 import sys
 
-from config.config import SYMBOLS, MIN_CONFIDENCE_SCORE, GOLD_CONFIDENCE_THRESHOLD
+from typing import Optional
+from config.config import SYMBOLS, MIN_CONFIDENCE_SCORE, GOLD_CONFIDENCE_THRESHOLD, EXECUTION_MODE, PROCESS_POOL_WORKERS, MACRO_BASKET
 from data.fetcher import DataFetcher
-from indicators.calculations import IndicatorCalculator
-from data.news_fetcher import NewsFetcher
+from data.news_fetcher import CachedNewsFetcher
+from data.news_archive import NewsArchive
+from filters.news_index import NewsIndex
 from alerts.service import TelegramService
+from alerts.rationale import RationaleDispatcher
 from ai.analyst import AIAnalyst
-from filters.correlation import CorrelationAnalyzer
+from filters.correlation import CorrelationAnalyzer, RollingCorrelation
+from filters.macro_regime import MacroRegimeEngine
 from tools.tv_renderer import TVChartRenderer
 from audit.journal import SignalJournal
+from audit.optimizer import MultiplierCache
+from filters.risk_state import RiskState
+from filters.ml_pregrader import MLPreGrader
 from audit.performance_analyzer import PerformanceAnalyzer
-from strategies.smc_strategy import SMCStrategy
-from strategies.breakout_strategy import BreakoutStrategy
-from strategies.price_action_strategy import PriceActionStrategy
+from strategies.registry import StrategyRegistry
+from engine.process_pool import ProcessPoolScanner, build_symbol_frames
+from training.model_registry import ModelHandle
 
-# Load ML Model
-ML_MODEL = None
-if os.path.exists("training/win_prob_model.joblib"):
-    ML_MODEL = joblib.load("training/win_prob_model.joblib")
+# V16.0: Win-probability model from the versioned registry. Loaded on first use
+# and hot-swapped between cycles when a retrained version is activated.
+ML_MODEL = ModelHandle()
 
 # Setup Logging
 # Ensure logs directory exists
@@ -37,19 +42,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def apply_signal_gates(symbol: str, strategy_id: str, result: dict) -> Optional[dict]:
+    """
+    Applies the dynamic strategy multiplier and the confidence threshold to a strategy signal.
+    """
+    multiplier = PerformanceAnalyzer.get_strategy_multiplier(strategy_id)
+    result['confidence'] = round(result['confidence'] * multiplier, 1)
+    result['pair'] = result.get('pair', symbol)
+    
+    # Filter by Confidence Threshold
+    threshold = GOLD_CONFIDENCE_THRESHOLD if symbol == "GC=F" else MIN_CONFIDENCE_SCORE
+    if result['confidence'] >= threshold:
+        return result
+    return None
+
 async def process_symbol(symbol: str, data: dict, news_events: list, ai_analyst: AIAnalyst, data_batch: dict, strategies: list) -> list:
     # 1. Add Indicators to all timeframes (Pre-processing for all strategies)
-    h1_df = IndicatorCalculator.add_indicators(data['h1'], "h1")
-    m15_df = IndicatorCalculator.add_indicators(data['m15'], "m15")
-    m5_df = IndicatorCalculator.add_indicators(data['m5'], "m5")
-    
-    updated_data = {
-        'h1': h1_df, 
-        'm15': m15_df, 
-        'm5': m5_df, 
-        'h4': data.get('h4'),
-        'd1': data.get('d1')
-    }
+    updated_data = build_symbol_frames(data)
     
     # V15.0 Performance: Parallelize strategy analysis per symbol
     tasks = [strategy.analyze(symbol, updated_data, news_events, data_batch) for strategy in strategies]
@@ -62,17 +71,28 @@ async def process_symbol(symbol: str, data: dict, news_events: list, ai_analyst:
             continue
         if result:
             # Apply Dynamic Strategy Multiplier
-            multiplier = PerformanceAnalyzer.get_strategy_multiplier(strategies[i].get_id())
-            result['confidence'] = round(result['confidence'] * multiplier, 1)
-            result['pair'] = result.get('pair', symbol)
-            
-            # Filter by Confidence Threshold
-            threshold = GOLD_CONFIDENCE_THRESHOLD if symbol == "GC=F" else MIN_CONFIDENCE_SCORE
-            if result['confidence'] >= threshold:
-                signals.append(result)
+            signal = apply_signal_gates(symbol, strategies[i].get_id(), result)
+            if signal:
+                signals.append(signal)
             
     return signals
 
+async def process_symbols_in_pool(scanner: ProcessPoolScanner, symbol_data: dict, news_events: list, market_data: dict) -> list:
+    """
+    V16.0 Process-Pool Mode: CPU-bound analysis runs in worker processes,
+    AI grading and signal gating stay on the event loop.
+    """
+    candidates = await scanner.scan(symbol_data, news_events, market_data)
+    results = []
+    for symbol, items in candidates.items():
+        signals = []
+        for strategy_id, result in items:
+            signal = apply_signal_gates(symbol, strategy_id, result)
+            if signal:
+                signals.append(signal)
+        results.append(signals)
+    return results
+
 async def main():
     is_actions = os.getenv("GITHUB_ACTIONS") == "true"
     
@@ -85,94 +105,157 @@ async def main():
     
     telegram_service = TelegramService()
     ai_analyst = AIAnalyst()
+    # V16.0: Two-phase alerts - AI rationale is posted as a reply after delivery
+    rationales = RationaleDispatcher(telegram_service, ai_analyst)
     renderer = TVChartRenderer()
     journal = SignalJournal()
+    # V16.0: Lot sizing reads an in-memory risk state kept current by journal writes
+    journal.subscribe(RiskState.for_journal().on_journal_event)
+    # V16.0: TP multipliers are cached and only recomputed when trades resolve
+    multiplier_cache = MultiplierCache.for_journal()
+    journal.subscribe(multiplier_cache.on_journal_event)
     
     # Startup Heartbeat
     if os.getenv("SEND_HEARTBEAT") == "true":
         await telegram_service.test_connection()
         
-    # Initialize Strategies
-    strategies = [SMCStrategy(), BreakoutStrategy(), PriceActionStrategy()]
+    # Initialize Strategies (V16.0: only those enabled for a monitored symbol, sharing one AI client)
+    registry = StrategyRegistry(ai_analyst=ai_analyst)
+    strategies = registry.load(SYMBOLS)
+    logger.info(f"Strategies loaded: {', '.join(s.get_name() for s in strategies)}")
+    # V16.0: The shipped win-probability model screens setups before any LLM call
+    pregrader = MLPreGrader(ML_MODEL)
+    registry.ai_grader.pregrader = pregrader
     analyzer = PerformanceAnalyzer()
     analyzer.calculate_weights() # Initial calculation
+    # V16.0: Weights stay in memory and are updated from the rows the journal appends
+    journal.subscribe(analyzer.service.on_journal_event)
+    
+    scanner = None
+    if EXECUTION_MODE == "process":
+        scanner = ProcessPoolScanner(max_workers=PROCESS_POOL_WORKERS, ai_grader=registry.ai_grader)
+        logger.info(f"⚙️ Process-pool execution enabled ({PROCESS_POOL_WORKERS or os.cpu_count()} workers)")
     
     last_processed_candle = {}
+    # V16.0: H1 return correlation across the universe, updated bar by bar for the portfolio filter
+    correlation = RollingCorrelation()
+    macro_engine = MacroRegimeEngine()
+    # V16.0: One cached calendar source for the whole session (conditional GETs, on-disk cache)
+    # Every new payload is archived so backtests can replay the historical news filter
+    news_fetcher = CachedNewsFetcher(archive=NewsArchive())
     
-    while True:
-        try:
-            news_fetcher = NewsFetcher()
-            news_events = news_fetcher.fetch_news()
-            
-            fetcher = DataFetcher()
-            market_data = await fetcher.get_latest_data()
-            logger.info(f"Fetched Data Keys: {list(market_data.keys())}")
+    try:
+        while True:
+            try:
+                # V16.0: Indexed once per payload change, strategies do bisect lookups
+                news_events = NewsIndex.of(news_fetcher.fetch_news())
+                analyzer.service.refresh()
+                # V16.0: Fresh AI latency budget for this cycle
+                registry.ai_grader.begin_cycle()
+                # V16.0: Pick up a newly activated model version (loaded and warmed before the swap)
+                ML_MODEL.refresh()
             
-            if not market_data:
-                if is_actions:
-                    break
-                await asyncio.sleep(60)
-                continue
+                fetcher = DataFetcher()
+                market_data = await fetcher.get_latest_data()
+                logger.info(f"Fetched Data Keys: {list(market_data.keys())}")
+                correlation.update_from_frames({s: d.get('h1') for s, d in market_data.items() if isinstance(d, dict)})
+                # V16.0: Macro regime advanced once per cycle; strategies read the published snapshot
+                market_context = macro_engine.context(market_data)
             
-            tasks = []
-            for symbol, data in market_data.items():
-                if symbol in ['DXY', '^TNX']:
+                if not market_data:
+                    if is_actions:
+                        break
+                    await asyncio.sleep(60)
                     continue
-                
-                # Deduplication (only for local continuous mode)
-                if not is_actions:
-                    # Robust check for m5 availability
-                    if 'm5' not in data:
-                        logger.warning(f"Skipping {symbol}: Missing 'm5' data. Available: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
+            
+                tasks = []
+                symbol_batch = {}
+                for symbol, data in market_data.items():
+                    if symbol in MACRO_BASKET:
                         continue
+                
+                    # Deduplication (only for local continuous mode)
+                    if not is_actions:
+                        # Robust check for m5 availability
+                        if 'm5' not in data:
+                            logger.warning(f"Skipping {symbol}: Missing 'm5' data. Available: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
+                            continue
                         
-                    latest_time = data['m5'].index[-1]
-                    if last_processed_candle.get(symbol) == latest_time:
+                        latest_time = data['m5'].index[-1]
+                        if last_processed_candle.get(symbol) == latest_time:
+                            continue
+                        last_processed_candle[symbol] = latest_time
+                
+                    symbol_strategies = registry.for_symbol(symbol)
+                    if not symbol_strategies:
                         continue
-                    last_processed_candle[symbol] = latest_time
                 
-                tasks.append(process_symbol(symbol, data, news_events, ai_analyst, market_data, strategies))
+                    if scanner:
+                        symbol_batch[symbol] = data
+                    else:
+                        tasks.append(process_symbol(symbol, data, news_events, ai_analyst, market_context, symbol_strategies))
             
-            if not tasks:
-                if is_actions:
-                    break
-                await asyncio.sleep(60)
-                continue
+                if not tasks and not symbol_batch:
+                    if is_actions:
+                        break
+                    await asyncio.sleep(60)
+                    continue
 
-            results = await asyncio.gather(*tasks)
-            # results is a list of lists (signals from each strategy)
-            valid_signals = [s for sublist in results for s in sublist if s is not None]
+                if scanner:
+                    results = await process_symbols_in_pool(scanner, symbol_batch, news_events, market_context)
+                else:
+                    results = await asyncio.gather(*tasks)
+                # results is a list of lists (signals from each strategy)
+                valid_signals = [s for sublist in results for s in sublist if s is not None]
 
-            if valid_signals:
-                # 11. Portfolio Correlation Filter
-                filtered_signals = CorrelationAnalyzer.filter_signals(valid_signals)
+                if valid_signals:
+                    # V16.0: Batched win probability, the correlation filter's priority key
+                    pregrader.attach(valid_signals)
+                    # 11. Portfolio Correlation Filter
+                    filtered_signals = CorrelationAnalyzer.filter_signals(valid_signals, correlation=correlation)
                 
-                for signal in filtered_signals:
-                    # Capture Chart
-                    try:
-                        photo = await renderer.render_chart(signal['symbol'], market_data[signal['symbol']])
-                        message = telegram_service.format_signal(signal)
-                        await telegram_service.send_chart(photo, message)
-                    except Exception as e:
-                        logger.error(f"Renderer Error: {e}")
-                        # Fallback to text signaling
-                        message = telegram_service.format_signal(signal)
-                        await telegram_service.send_signal(message)
+                    rationale_follows = rationales.will_follow(news_events)
+                    for signal in filtered_signals:
+                        # Capture Chart
+                        try:
+                            photo = await renderer.render_chart(signal['symbol'], market_data[signal['symbol']])
+                            message = telegram_service.format_signal(signal, rationale_follows=rationale_follows)
+                            sent = await telegram_service.send_chart(photo, message)
+                        except Exception as e:
+                            logger.error(f"Renderer Error: {e}")
+                            # Fallback to text signaling
+                            message = telegram_service.format_signal(signal, rationale_follows=rationale_follows)
+                            sent = await telegram_service.send_signal(message)
+                        # V16.0: Phase two runs in the background, the next alert goes out now
+                        rationales.dispatch(sent, signal, news_events)
                     
-                    # Log to Journal
-                    journal.log_signal(signal)
+                        # Log to Journal
+                        journal.log_signal(signal)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Multiplier cache: {multiplier_cache.stats()}")
+                        if registry.ai_grader.active:
+                            cache_stats = registry.ai_grader.cache_stats()
+                            if cache_stats is not None:
+                                logger.debug(f"AI score cache: {cache_stats}")
+                            logger.debug(f"AI provider health: {registry.ai_grader.health()}")
             
-            if is_actions: 
-                logger.info("✅ GitHub Actions Scan Complete.")
-                break
+                if is_actions: 
+                    # V16.0: Let pending rationale replies land before the process exits
+                    await rationales.drain()
+                    logger.info("✅ GitHub Actions Scan Complete.")
+                    break
                 
-        except Exception as e:
-            if is_actions:
-                raise e
-            logger.error(f"Error in main loop: {e}")
-            await asyncio.sleep(30)
+            except Exception as e:
+                if is_actions:
+                    raise e
+                logger.error(f"Error in main loop: {e}")
+                await asyncio.sleep(30)
             
-        await asyncio.sleep(60)
+            await asyncio.sleep(60)
+    finally:
+        # V16.0: Worker processes and shared-memory segments are released on every exit path
+        if scanner:
+            scanner.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
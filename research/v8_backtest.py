@@ -3,8 +3,8 @@ import pandas as pd
 import joblib
 import os
 import sys
-from datetime import datetime, timedelta, time
-from config.config import SYMBOLS, EMA_TREND, MIN_CONFIDENCE_SCORE, GOLD_CONFIDENCE_THRESHOLD, ATR_MULTIPLIER, ADR_THRESHOLD_PERCENT, ASIAN_RANGE_MIN_PIPS, DXY_SYMBOL, TNX_SYMBOL, INSTITUTIONAL_TF
+from datetime import datetime, timedelta, time, timezone
+from config.config import SYMBOLS, EMA_TREND, MIN_CONFIDENCE_SCORE, GOLD_CONFIDENCE_THRESHOLD, ATR_MULTIPLIER, ADR_THRESHOLD_PERCENT, ASIAN_RANGE_MIN_PIPS, INSTITUTIONAL_TF, MACRO_BASKET
 from data.fetcher import DataFetcher
 from indicators.calculations import IndicatorCalculator
 from strategy.displacement import DisplacementAnalyzer
@@ -13,14 +13,23 @@ from strategy.scoring import ScoringEngine
 from strategy.imbalance import ImbalanceDetector
 from strategy.crt import CRTAnalyzer
 from filters.session_filter import SessionFilter
+from filters.daily_bias import DailyBias
 from strategies.smc_strategy import SMCStrategy
 from strategies.breakout_strategy import BreakoutStrategy
 from strategies.price_action_strategy import PriceActionStrategy
 from audit.performance_analyzer import PerformanceAnalyzer
 from audit.optimizer import AutoOptimizer
+from engine.asof_view import AsOfView
+from filters.macro_regime import MacroRegimeEngine
+from data.news_archive import NewsArchive
+from filters.risk_manager import RiskManager
+from filters.risk_state import RiskState
+from filters.ai_grader import AIGrader
 
 # Performance Tuning
 os.environ['DISABLE_AI_GRADER'] = 'true'
+# V16.0: AI_GRADER_MODE=replay (recorded live grades) or surrogate (local model) keeps
+# the AI stage in the backtest without network calls; live mode stays disabled above
 
 # Load ML Model
 ML_MODEL = None
@@ -42,15 +51,12 @@ async def run_v8_backtest(days=30):
     valid_symbols = []
     
     print("Fetching data...")
-    # Fetch DXY first
-    dxy_h1 = DataFetcher.fetch_range(DXY_SYMBOL, "1h", start=start_date, end=end_date)
-    if dxy_h1 is not None and not dxy_h1.empty:
-        dxy_h1 = IndicatorCalculator.add_indicators(dxy_h1, "h1")
-        
-    # Fetch TNX (Macro Confluence)
-    tnx_h1 = DataFetcher.fetch_range(TNX_SYMBOL, "1h", start=start_date, end=end_date)
-    if tnx_h1 is not None and not tnx_h1.empty:
-        tnx_h1 = IndicatorCalculator.add_indicators(tnx_h1, "h1")
+    # Macro basket (H1) for the vectorized regime columns
+    macro_frames = {}
+    for key, (ticker, _, _) in MACRO_BASKET.items():
+        macro_h1 = DataFetcher.fetch_range(ticker, "1h", start=start_date, end=end_date)
+        if macro_h1 is not None and not macro_h1.empty:
+            macro_frames[key] = macro_h1
     
     for symbol in SYMBOLS:
         h1 = DataFetcher.fetch_range(symbol, "1h", start=start_date, end=end_date)
@@ -65,7 +71,8 @@ async def run_v8_backtest(days=30):
                 'h4': IndicatorCalculator.add_indicators(h4, "h4"),
                 'm15': IndicatorCalculator.add_indicators(m15, "15m"),
                 'm5': IndicatorCalculator.add_indicators(m5, "5m"),
-                'd1': IndicatorCalculator.add_indicators(d1, "d1")
+                # V16.0: Daily bias for every D1 bar up front; the SMC D1 read becomes a row lookup
+                'd1': DailyBias.annotate(IndicatorCalculator.add_indicators(d1, "d1"))
             }
             valid_symbols.append(symbol)
     
@@ -73,6 +80,10 @@ async def run_v8_backtest(days=30):
         print("❌ No data fetched. Check internet or symbols.")
         return
     
+    # V16.0: Historical calendar from the local archive, filtered at each bar time
+    news_index = NewsArchive().query(start_date, datetime.now(timezone.utc))
+    print(f"News Filter: {len(news_index)} archived events" if news_index else "News Filter: archive empty (no historical news blocking)")
+    
     # Timeline based on earliest m5 index, filtered to the requested test period
     full_timeline = all_data[valid_symbols[0]]['m5'].index
     timeline = full_timeline[full_timeline >= test_start_date]
@@ -83,155 +94,172 @@ async def run_v8_backtest(days=30):
     
     cooldowns = {s: timeline[0] - timedelta(days=1) for s in SYMBOLS}
     
+    # V16.0: Macro regime for the whole timeline in one pass (last closed H1 bar per M5 bar)
+    macro_engine = MacroRegimeEngine()
+    macro_regime = macro_engine.regime_frame(macro_frames, index=timeline)
+    macro_versions = macro_regime['version'].to_numpy()
+    macro_snapshot = None
+    
+    # V16.0 Performance: As-of views over the full frames (M5 cursor, HTFs aligned to their
+    # last closed bar, no look-ahead) and each symbol's M5 position for every timeline bar
+    views = {symbol: AsOfView(all_data[symbol]) for symbol in valid_symbols}
+    timeline_pos = {symbol: all_data[symbol]['m5'].index.get_indexer(timeline) for symbol in valid_symbols}
+    
     # Initialize Strategies
-    strategies = [SMCStrategy(), BreakoutStrategy(), PriceActionStrategy()]
+    ai_grader = AIGrader()
+    print(f"AI Grader: {ai_grader.mode if ai_grader.backend is not None else 'disabled (flat ' + str(AIGrader.DEFAULT_SCORE) + ')'}")
+    strategies = [SMCStrategy(ai_grader), BreakoutStrategy(ai_grader), PriceActionStrategy(ai_grader)]
     analyzer = PerformanceAnalyzer()
     analyzer.calculate_weights()
     
     # Initialize performance caching
     cached_multipliers = AutoOptimizer().get_optimized_multipliers(verbose=False)
     
-    print(f"Simulating {len(timeline)} bars (M5 resolution)...")
+    # V16.0: Size from a simulated risk state fed with this run's own outcomes, each
+    # released only once its exit bar has closed (the live journal is not consulted)
+    clock = {'t': timeline[0]}
+    risk_state = RiskState(clock=lambda: clock['t'])
+    previous_state = RiskManager.install(risk_state)
+    open_trades = [] # (exit_time, trade_id, status, r)
+    
+    try:
+        print(f"Simulating {len(timeline)} bars (M5 resolution)...")
     
-    for i, t in enumerate(timeline):
-        if i % 1000 == 0:
-            print(f"Progress: {i}/{len(timeline)} bars ({(i/len(timeline))*100:.1f}%)")
+        for i, t in enumerate(timeline):
+            if i % 1000 == 0:
+                print(f"Progress: {i}/{len(timeline)} bars ({(i/len(timeline))*100:.1f}%)")
         
-        for symbol in valid_symbols:
-            if t < cooldowns[symbol]: continue
-            
-            m5_df_full = all_data[symbol]['m5']
-            if t not in m5_df_full.index: continue
-            
-            m5_idx = m5_df_full.index.get_loc(t)
-            if m5_idx < 200: continue
-            
-            m15_df_full = all_data[symbol]['m15']
-            m15_idx = m15_df_full.index.get_indexer([t], method='pad')[0]
-            
-            h1_df_full = all_data[symbol]['h1']
-            h1_idx = h1_df_full.index.get_indexer([t], method='pad')[0]
+            clock['t'] = t
+            if macro_snapshot is None or macro_snapshot.version != macro_versions[i]:
+                macro_snapshot = macro_engine.snapshot_at(macro_regime, i)
+            if open_trades and open_trades[0][0] <= t:
+                for exit_time, trade_id, status, r_val in [tr for tr in open_trades if tr[0] <= t]:
+                    risk_state.on_result(trade_id, status, r_val, timestamp=trades[trade_id]['t'])
+                open_trades = [tr for tr in open_trades if tr[0] > t]
+        
+            for symbol in valid_symbols:
+                if t < cooldowns[symbol]: continue
             
-            h4_df_full = all_data[symbol]['h4']
-            h4_idx = h4_df_full.index.get_indexer([t], method='pad')[0]
+                m5_df_full = all_data[symbol]['m5']
+                m5_idx = timeline_pos[symbol][i]
+                if m5_idx < 200: continue
             
-            d1_df_full = all_data[symbol]['d1']
-            d1_idx = d1_df_full.index.get_indexer([t], method='pad')[0]
-
-            # Fast Views (iloc slicing returns views, not copies in many cases)
-            state_m5 = m5_df_full.iloc[:m5_idx+1]
-            state_m15 = m15_df_full.iloc[:m15_idx+1]
-            state_h1 = h1_df_full.iloc[:h1_idx+1]
-            state_h4 = h4_df_full.iloc[:h4_idx+1]
-            state_d1 = d1_df_full.iloc[:d1_idx+1]
+                # O(1) cursor move, no per-bar slicing
+                view = views[symbol]
+                view.seek(m5_idx)
+                if not view.ready: continue
             
-            latest_m5 = m5_df_full.iloc[m5_idx]
-            latest_m15 = m15_df_full.iloc[m15_idx]
-            latest_h1 = h1_df_full.iloc[h1_idx]
+                latest_m5 = view.latest
 
-            # Simplified Market context for speed
-            market_context = {'DXY': None, '^TNX': None}
+                # Simplified Market context for speed (macro bias from the precomputed regime)
+                market_context = {'DXY': None, '^TNX': None, 'macro': macro_snapshot}
 
-            for strategy in strategies:
-                try:
-                    signal = await strategy.analyze(symbol, {
-                        'h1': state_h1, 'h4': state_h4, 'm15': state_m15, 'm5': state_m5, 'd1': state_d1
-                    }, [], market_context) 
+                for strategy in strategies:
+                    try:
+                        signal = await strategy.analyze(symbol, view.data, news_index, market_context) 
                     
-                    if not signal: continue
+                        if not signal: continue
                     
-                    # Apply Dynamic Strategy Multiplier
-                    multiplier = PerformanceAnalyzer.get_strategy_multiplier(strategy.get_id())
-                    if strategy.get_id() == "smc_institutional": multiplier = 1.0 
-                    confidence = round(signal['confidence'] * multiplier, 1)
+                        # Apply Dynamic Strategy Multiplier
+                        multiplier = PerformanceAnalyzer.get_strategy_multiplier(strategy.get_id())
+                        if strategy.get_id() == "smc_institutional": multiplier = 1.0 
+                        confidence = round(signal['confidence'] * multiplier, 1)
                     
-                    threshold = GOLD_CONFIDENCE_THRESHOLD if symbol == "GC=F" else MIN_CONFIDENCE_SCORE
-                    if confidence < threshold: continue
+                        threshold = GOLD_CONFIDENCE_THRESHOLD if symbol == "GC=F" else MIN_CONFIDENCE_SCORE
+                        if confidence < threshold: continue
                     
-                    # Execute Trade
-                    opt_mult = cached_multipliers.get(symbol, ATR_MULTIPLIER)
-                    levels = EntryLogic.calculate_levels(state_m5, signal['direction'], signal.get('sweep_level', latest_m5['close']), latest_m5['atr'], symbol=symbol, opt_mult=opt_mult)
+                        # Execute Trade
+                        opt_mult = cached_multipliers.get(symbol, ATR_MULTIPLIER)
+                        levels = EntryLogic.calculate_levels(view['m5'], signal['direction'], signal.get('sweep_level', latest_m5['close']), latest_m5['atr'], symbol=symbol, opt_mult=opt_mult)
                     
-                    m5_start_idx = m5_df_full.index.get_indexer([t], method='nearest')[0]
-                    hit = None
-                    tp0_hit = False
-                    be_active = False
-                    direction = signal['direction']
-                    entry_p = signal['entry_price']
+                        m5_start_idx = m5_idx
+                        hit = None
+                        tp0_hit = False
+                        be_active = False
+                        direction = signal['direction']
+                        entry_p = signal['entry_price']
                     
-                    from config.config import PARTIAL_SIZE, BE_TRIGGER_ATR
+                        from config.config import PARTIAL_SIZE, BE_TRIGGER_ATR
                     
-                    for j in range(m5_start_idx + 1, min(m5_start_idx + 288, len(m5_df_full))):
-                        fut = m5_df_full.iloc[j]
-                        if direction == "BUY":
-                            if fut['high'] >= levels['tp0']: tp0_hit = True
-                            if fut['high'] >= levels['be_trigger']: be_active = True
+                        for j in range(m5_start_idx + 1, min(m5_start_idx + 288, len(m5_df_full))):
+                            fut = m5_df_full.iloc[j]
+                            if direction == "BUY":
+                                if fut['high'] >= levels['tp0']: tp0_hit = True
+                                if fut['high'] >= levels['be_trigger']: be_active = True
                             
-                            if fut['low'] <= levels['sl']:
-                                hit = "LOSS"
-                                if tp0_hit: hit = "PARTIAL_LOSS" # Hit TP0 then SL before BE
-                                break
-                            if be_active and fut['low'] <= entry_p:
-                                hit = "BE"
-                                break
-                            if fut['high'] >= levels['tp2']:
-                                hit = "WIN"
-                                break
-                        else:
-                            if fut['low'] <= levels['tp0']: tp0_hit = True
-                            if fut['low'] <= levels['be_trigger']: be_active = True
+                                if fut['low'] <= levels['sl']:
+                                    hit = "LOSS"
+                                    if tp0_hit: hit = "PARTIAL_LOSS" # Hit TP0 then SL before BE
+                                    break
+                                if be_active and fut['low'] <= entry_p:
+                                    hit = "BE"
+                                    break
+                                if fut['high'] >= levels['tp2']:
+                                    hit = "WIN"
+                                    break
+                            else:
+                                if fut['low'] <= levels['tp0']: tp0_hit = True
+                                if fut['low'] <= levels['be_trigger']: be_active = True
                             
-                            if fut['high'] >= levels['sl']:
-                                hit = "LOSS"
-                                if tp0_hit: hit = "PARTIAL_LOSS"
-                                break
-                            if be_active and fut['high'] >= entry_p:
-                                hit = "BE"
-                                break
-                            if fut['low'] <= levels['tp2']:
-                                hit = "WIN"
-                                break
+                                if fut['high'] >= levels['sl']:
+                                    hit = "LOSS"
+                                    if tp0_hit: hit = "PARTIAL_LOSS"
+                                    break
+                                if be_active and fut['high'] >= entry_p:
+                                    hit = "BE"
+                                    break
+                                if fut['low'] <= levels['tp2']:
+                                    hit = "WIN"
+                                    break
                     
-                    if hit:
-                        # R-Multiple Calculation with PARTIAL_SIZE (default 0.5)
-                        # Assumes entry-to-sl is roughly 1R distance for simplicity in this V8 mock
-                        # TP0 (0.5 ATR) is approx 1R if SL is 0.5 ATR from entry
-                        r_tp0 = 1.0 # 1R gain on half
-                        r_sl = -1.0 # 1R loss on half
-                        r_tp2 = 3.0 # Approx 3R gain on half (if TP2 is 1.5 ATR)
+                        if hit:
+                            # R-Multiple Calculation with PARTIAL_SIZE (default 0.5)
+                            # Assumes entry-to-sl is roughly 1R distance for simplicity in this V8 mock
+                            # TP0 (0.5 ATR) is approx 1R if SL is 0.5 ATR from entry
+                            r_tp0 = 1.0 # 1R gain on half
+                            r_sl = -1.0 # 1R loss on half
+                            r_tp2 = 3.0 # Approx 3R gain on half (if TP2 is 1.5 ATR)
                         
-                        if hit == "WIN":
-                            r_val = (PARTIAL_SIZE * r_tp0) + ((1-PARTIAL_SIZE) * r_tp2)
-                        elif hit == "BE":
-                            r_val = (PARTIAL_SIZE * r_tp0) + ((1-PARTIAL_SIZE) * 0)
-                        elif hit == "PARTIAL_LOSS":
-                            r_val = (PARTIAL_SIZE * r_tp0) + ((1-PARTIAL_SIZE) * r_sl)
-                        else: # Full LOSS
-                            r_val = -1.0
+                            if hit == "WIN":
+                                r_val = (PARTIAL_SIZE * r_tp0) + ((1-PARTIAL_SIZE) * r_tp2)
+                            elif hit == "BE":
+                                r_val = (PARTIAL_SIZE * r_tp0) + ((1-PARTIAL_SIZE) * 0)
+                            elif hit == "PARTIAL_LOSS":
+                                r_val = (PARTIAL_SIZE * r_tp0) + ((1-PARTIAL_SIZE) * r_sl)
+                            else: # Full LOSS
+                                r_val = -1.0
                             
-                        trades.append({
-                            't': t, 
-                            'symbol': symbol, 
-                            'dir': direction, 
-                            'res': hit, 
-                            'score': confidence, 
-                            'r': r_val, 
-                            'strategy_id': strategy.get_id(),
-                            'confidence': confidence,
-                            'tp0_hit': tp0_hit,
-                            'be_active': be_active
-                        })
-                        if hit == "WIN": total_wins += 1
-                        elif hit == "LOSS": total_losses += 1
-                        elif hit == "BE": total_breakevens += 1
+                            trades.append({
+                                't': t, 
+                                'symbol': symbol, 
+                                'dir': direction, 
+                                'res': hit, 
+                                'score': confidence, 
+                                'r': r_val, 
+                                'strategy_id': strategy.get_id(),
+                                'confidence': confidence,
+                                'tp0_hit': tp0_hit,
+                                'be_active': be_active,
+                                'lots': signal.get('risk_details', {}).get('lots')
+                            })
+                            trade_id = len(trades) - 1
+                            risk_state.on_open(trade_id, symbol, t)
+                            open_trades.append((m5_df_full.index[j] + timedelta(minutes=5), trade_id, "BREAKEVEN" if hit == "BE" else hit, r_val))
+                            open_trades.sort(key=lambda tr: tr[0])
+                            if hit == "WIN": total_wins += 1
+                            elif hit == "LOSS": total_losses += 1
+                            elif hit == "BE": total_breakevens += 1
                         
-                        cooldowns[symbol] = t + timedelta(hours=4) # Shorter cooldown for independent strategies
-                        break # Only one strategy per bar per symbol for backtest consistency
-                except Exception as e:
-                    print(f"ERROR executing strategy {strategy.get_id()} for {symbol}: {e}")
-                    continue
+                            cooldowns[symbol] = t + timedelta(hours=4) # Shorter cooldown for independent strategies
+                            break # Only one strategy per bar per symbol for backtest consistency
+                    except Exception as e:
+                        print(f"ERROR executing strategy {strategy.get_id()} for {symbol}: {e}")
+                        continue
             
-            # Strategy loop ends
+                # Strategy loop ends
+    finally:
+        # The simulated state never outlives the run, even when it fails
+        RiskManager.install(previous_state)
 
     # Final Report
     print("\n" + "═"*55)
@@ -244,6 +272,8 @@ async def run_v8_backtest(days=30):
     wr = (total_wins / (total_wins + total_losses) * 100) if (total_wins + total_losses) > 0 else 0
     print(f"Total R-Multiple: {total_r:+.1f}R")
     print(f"Adjusted Win Rate: {wr:.1f} %")
+    if ai_grader.backend is not None:
+        print(f"AI Backend: {ai_grader.backend.stats()}")
     print("═"*55)
     
     # Save to CSV for Audit
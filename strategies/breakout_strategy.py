@@ -7,15 +7,17 @@ from config.config import (
     EMA_FAST, EMA_SLOW, ATR_MULTIPLIER
 )
 from indicators.calculations import IndicatorCalculator
+from indicators.snapshot import TailView
 from filters.session_filter import SessionFilter
 from filters.macro_filter import MacroFilter
 from filters.risk_manager import RiskManager
 from filters.ai_grader import AIGrader
+from filters.ml_pregrader import MLPreGrader
 
 class BreakoutStrategy(BaseStrategy):
-    def __init__(self):
+    def __init__(self, ai_grader: Optional[AIGrader] = None):
         super().__init__()
-        self.ai_grader = AIGrader()
+        self.ai_grader = ai_grader or AIGrader()
     
     def get_id(self) -> str:
         return "breakout_master"
@@ -25,20 +27,21 @@ class BreakoutStrategy(BaseStrategy):
 
     async def analyze(self, symbol: str, data: Dict[str, pd.DataFrame], news_events: list, market_context: dict) -> Optional[dict]:
         try:
-            m5_df = data['m5']
-            m15_df = data['m15']
+            # V16.0 Performance: Latest-bar snapshots instead of row Series
+            m5 = TailView.of(data, 'm5')
+            m15_bar = TailView.of(data, 'm15').latest
             
-            if len(m5_df) < 50: return None
+            if len(m5) < 50: return None
             
             # --- V14.0 Performance: Read pre-calculated regime ---
-            regime = m15_df.iloc[-1].get('regime', 'RANGING')
+            regime = m15_bar.get('regime', 'RANGING')
             if regime != "TRENDING":
                 return None
             
             # Re-initialize AIGrader once if possible (Performance Optimization)
             # But since it's disabled, the overhead is minimal.
 
-            latest = m5_df.iloc[-1]
+            latest = m5.latest
             
             # 1. Bollinger Band Squeeze (Simplified)
             atr_now = latest.get('atr')
@@ -49,16 +52,17 @@ class BreakoutStrategy(BaseStrategy):
             if atr_avg == 0: return None
 
             # 2. Key Level Breakout (Asian Range) - V14.0 Performance Optimization
-            asian_h = m15_df.iloc[-1].get('asian_high', 0)
-            asian_l = m15_df.iloc[-1].get('asian_low', 0)
+            asian_h = m15_bar.get('asian_high', 0)
+            asian_l = m15_bar.get('asian_low', 0)
             
             if asian_h == 0: 
                 return None
             
             direction = None
-            if latest['close'] > asian_h and m5_df['close'].iloc[-2] <= asian_h:
+            prev_close = m5.prev(1)['close']
+            if latest['close'] > asian_h and prev_close <= asian_h:
                 direction = "BUY"
-            elif latest['close'] < asian_l and m5_df['close'].iloc[-2] >= asian_l:
+            elif latest['close'] < asian_l and prev_close >= asian_l:
                 direction = "SELL"
                 
             if not direction:
@@ -77,7 +81,7 @@ class BreakoutStrategy(BaseStrategy):
                 return None
 
             # 5. Filter: Session
-            if not SessionFilter.is_valid_session(check_time=m5_df.index[-1]):
+            if not SessionFilter.is_valid_session(check_time=m5.time):
                 return None
 
             # --- V13.0 AI Setup Grader (Neural Shield) ---
@@ -89,7 +93,8 @@ class BreakoutStrategy(BaseStrategy):
                 'rsi': rsi,
                 'adr_status': "Normal", # Breakout is less ADR-sensitive than SMC
                 'macro_bias': str(macro_bias),
-                'va_status': "N/A"
+                'va_status': "N/A",
+                'ml_features': MLPreGrader.features(data, direction)
             }
             ai_score = await self.ai_grader.get_score(setup_data)
             
@@ -115,6 +120,7 @@ class BreakoutStrategy(BaseStrategy):
                 'layers': [],
                 'confidence': ai_score,
                 'risk_details': risk_details,
+                'ml_features': setup_data['ml_features'],
                 'session': f"Active {regime} Breakout"
             }
         except Exception as e:
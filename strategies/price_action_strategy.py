@@ -7,15 +7,17 @@ from config.config import (
     EMA_FAST, EMA_SLOW, ATR_MULTIPLIER
 )
 from indicators.calculations import IndicatorCalculator
+from indicators.snapshot import TailView
 from filters.session_filter import SessionFilter
 from filters.macro_filter import MacroFilter
 from filters.risk_manager import RiskManager
 from filters.ai_grader import AIGrader
+from filters.ml_pregrader import MLPreGrader
 
 class PriceActionStrategy(BaseStrategy):
-    def __init__(self):
+    def __init__(self, ai_grader: Optional[AIGrader] = None):
         super().__init__()
-        self.ai_grader = AIGrader()
+        self.ai_grader = ai_grader or AIGrader()
     
     def get_id(self) -> str:
         return "price_action_specialist"
@@ -25,17 +27,18 @@ class PriceActionStrategy(BaseStrategy):
 
     async def analyze(self, symbol: str, data: Dict[str, pd.DataFrame], news_events: list, market_context: dict) -> Optional[dict]:
         try:
-            m5_df = data['m5']
-            m15_df = data['m15']
-            if len(m5_df) < 50: return None
+            # V16.0 Performance: Latest-bar snapshots instead of row Series
+            m5 = TailView.of(data, 'm5')
+            m15_bar = TailView.of(data, 'm15').latest
+            if len(m5) < 50: return None
             
             # --- V14.0 Performance: Read pre-calculated regime ---
-            regime = m15_df.iloc[-1].get('regime', 'RANGING')
+            regime = m15_bar.get('regime', 'RANGING')
             if regime != "RANGING":
                 return None
 
-            latest = m5_df.iloc[-1]
-            prev = m5_df.iloc[-2]
+            latest = m5.latest
+            prev = m5.prev(1)
             
             # 1. Trend Filter (EMA 50 alignment)
             ema_50 = latest.get('ema_50')
@@ -90,7 +93,7 @@ class PriceActionStrategy(BaseStrategy):
                 return None
 
             # 6. Session Filter
-            if not SessionFilter.is_valid_session(check_time=m5_df.index[-1]):
+            if not SessionFilter.is_valid_session(check_time=m5.time):
                 return None
 
             # --- V13.0 AI Setup Grader (Neural Shield) ---
@@ -102,7 +105,8 @@ class PriceActionStrategy(BaseStrategy):
                 'rsi': rsi,
                 'adr_status': "Normal",
                 'macro_bias': str(macro_bias),
-                'va_status': "N/A"
+                'va_status': "N/A",
+                'ml_features': MLPreGrader.features(data, direction)
             }
             ai_score = await self.ai_grader.get_score(setup_data)
             
@@ -128,6 +132,7 @@ class PriceActionStrategy(BaseStrategy):
                 'layers': [],
                 'confidence': ai_score, # Baseline
                 'risk_details': risk_details,
+                'ml_features': setup_data['ml_features'],
                 'session': f"Range {regime} Reversal"
             }
         except Exception as e:
@@ -0,0 +1,107 @@
+import importlib
+import inspect
+import logging
+from importlib.metadata import entry_points
+from typing import Dict, List, Optional
+
+from config.config import STRATEGY_REGISTRY, ENABLED_STRATEGIES, SYMBOL_STRATEGIES
+from filters.ai_grader import AIGrader
+
+logger = logging.getLogger(__name__)
+
+
+class StrategyRegistry:
+    """
+    Config and entry-point driven catalogue of strategies.
+
+    Strategy modules are only imported, and strategies only instantiated, when
+    they are enabled for at least one scanned symbol. Every strategy built here
+    shares one AIGrader (and through it one AIAnalyst / genai client).
+    """
+    ENTRY_POINT_GROUP = "mumofx.strategies"
+
+    def __init__(self, specs: Optional[Dict[str, object]] = None, enabled: Optional[List[str]] = None,
+                 symbol_strategies: Optional[Dict[str, List[str]]] = None, ai_analyst=None,
+                 ai_grader: Optional[AIGrader] = None, use_entry_points: bool = True):
+        self.specs = dict(STRATEGY_REGISTRY if specs is None else specs)
+        if use_entry_points:
+            for ep in StrategyRegistry._discover():
+                # Built-ins win on id clashes
+                self.specs.setdefault(ep.name, ep)
+
+        self.enabled = list(ENABLED_STRATEGIES if enabled is None else enabled) or list(self.specs)
+        for strategy_id in self.enabled:
+            if strategy_id not in self.specs:
+                logger.warning(f"Unknown strategy '{strategy_id}' enabled; skipping")
+        self.enabled = [s for s in self.enabled if s in self.specs]
+
+        self.symbol_strategies = SYMBOL_STRATEGIES if symbol_strategies is None else symbol_strategies
+        self._ai_analyst = ai_analyst
+        self._ai_grader = ai_grader
+        self._instances = {}
+
+    @staticmethod
+    def _discover() -> list:
+        try:
+            return list(entry_points(group=StrategyRegistry.ENTRY_POINT_GROUP))
+        except Exception as e:
+            logger.warning(f"Strategy entry point discovery failed: {e}")
+            return []
+
+    @staticmethod
+    def load_class(spec):
+        """Resolves a "module:Class" string or an entry point to a strategy class."""
+        if isinstance(spec, str):
+            module_name, _, class_name = spec.partition(":")
+            return getattr(importlib.import_module(module_name), class_name)
+        return spec.load()
+
+    @property
+    def ai_grader(self) -> AIGrader:
+        """The grader shared by every strategy built by this registry."""
+        if self._ai_grader is None:
+            self._ai_grader = AIGrader(analyst=self._ai_analyst)
+        return self._ai_grader
+
+    @property
+    def loaded(self) -> List[str]:
+        """Ids of the strategies instantiated so far."""
+        return list(self._instances)
+
+    def ids_for_symbol(self, symbol: str) -> List[str]:
+        subset = self.symbol_strategies.get(symbol)
+        if subset is None:
+            return list(self.enabled)
+        return [s for s in self.enabled if s in subset]
+
+    def get(self, strategy_id: str):
+        """Imports and instantiates a strategy on first use."""
+        strategy = self._instances.get(strategy_id)
+        if strategy is None:
+            cls = StrategyRegistry.load_class(self.specs[strategy_id])
+            if 'ai_grader' in inspect.signature(cls).parameters:
+                strategy = cls(ai_grader=self.ai_grader)
+            else:
+                strategy = cls()
+            self._instances[strategy_id] = strategy
+        return strategy
+
+    def _get_many(self, strategy_ids: List[str]) -> list:
+        strategies = []
+        for strategy_id in strategy_ids:
+            try:
+                strategies.append(self.get(strategy_id))
+            except Exception as e:
+                logger.error(f"Failed to load strategy '{strategy_id}': {e}")
+        return strategies
+
+    def for_symbol(self, symbol: str) -> list:
+        """Strategies to run on `symbol`, in enablement order."""
+        return self._get_many(self.ids_for_symbol(symbol))
+
+    def load(self, symbols: List[str]) -> list:
+        """Instantiates every strategy enabled for at least one of `symbols`."""
+        needed = []
+        for symbol in symbols:
+            needed += [s for s in self.ids_for_symbol(symbol) if s not in needed]
+        return self._get_many(needed)
@@ -1,4 +1,5 @@
 from .base_strategy import BaseStrategy
+import asyncio
 from typing import Optional, Dict
 import pandas as pd
 import traceback
@@ -7,9 +8,11 @@ from config.config import (
     MIN_CONFIDENCE_SCORE, 
     GOLD_CONFIDENCE_THRESHOLD,
     EMA_TREND,
-    ASIAN_RANGE_MIN_PIPS
+    ASIAN_RANGE_MIN_PIPS,
+    AI_SPECULATIVE_GRADING
 )
 from indicators.calculations import IndicatorCalculator
+from indicators.snapshot import TailView
 from strategy.displacement import DisplacementAnalyzer
 from strategy.entry import EntryLogic
 from strategy.scoring import ScoringEngine
@@ -21,13 +24,14 @@ from filters.news_filter import NewsFilter
 from filters.risk_manager import RiskManager
 from filters.macro_filter import MacroFilter
 from filters.ai_grader import AIGrader
+from filters.ml_pregrader import MLPreGrader
 from filters.daily_bias import DailyBias
 from audit.optimizer import AutoOptimizer
 
 class SMCStrategy(BaseStrategy):
-    def __init__(self):
+    def __init__(self, ai_grader: Optional[AIGrader] = None):
         super().__init__()
-        self.ai_grader = AIGrader()  # V13: Initialize once, reuse for all signals
+        self.ai_grader = ai_grader or AIGrader()  # V13: Initialize once, reuse for all signals
     
     def get_id(self) -> str:
         return "smc_institutional"
@@ -36,22 +40,24 @@ class SMCStrategy(BaseStrategy):
         return "SMC Institutional"
 
     async def analyze(self, symbol: str, data: Dict[str, pd.DataFrame], news_events: list, market_context: dict) -> Optional[dict]:
+        speculative = None
         try:
-            h1_df = data.get('h1')
-            m15_df = data.get('m15')
-            m5_df = data.get('m5')
-            h4_df = data.get('h4')
-            d1_df = data.get('d1')
+            # V16.0 Performance: Latest-bar snapshots, extracted once per frame per cycle.
+            # Views also come from an AsOfView in backtests, so no frame is read directly.
+            h1, m15, m5 = TailView.of(data, 'h1'), TailView.of(data, 'm15'), TailView.of(data, 'm5')
+            d1 = TailView.of(data, 'd1')
             
-            if h1_df is None or m15_df is None or m5_df is None: return None
+            if h1 is None or m15 is None or m5 is None: return None
+            
+            h1_bar, m15_bar, m5_bar = h1.latest, m15.latest, m5.latest
             
             is_gold = symbol in ["GC=F", "XAUUSD=X"]
 
             # --- V14.0 Performance: Read pre-calculated regime ---
-            regime = m15_df.iloc[-1].get('regime', 'RANGING')
+            regime = m15_bar.get('regime', 'RANGING')
             
             # Phase 6: Daily Bias Analysis (Chop Override)
-            daily_analysis = DailyBias.analyze(d1_df) if d1_df is not None else {'bias': 'NEUTRAL', 'strength': 'WEAK'}
+            daily_analysis = DailyBias.analyze(d1) if d1 is not None else {'bias': 'NEUTRAL', 'strength': 'WEAK'}
             
             # Gold Exception: Institutional sweeps often happen during "Choppy" consolidation
             # Daily Bias Override: Allow trading in Chop if Daily Trend is STRONG
@@ -62,15 +68,15 @@ class SMCStrategy(BaseStrategy):
                 return None
             
             # Higher Timeframe Trend (Narrative)
-            h1_close = h1_df.iloc[-1]['close']
-            h1_ema = h1_df.iloc[-1].get(f'ema_{EMA_TREND}')
+            h1_close = h1_bar['close']
+            h1_ema = h1_bar.get(f'ema_{EMA_TREND}')
             if h1_ema is None: return None
             
             h1_trend = "BULLISH" if h1_close > h1_ema else "BEARISH"
             h1_dist = (h1_close - h1_ema) / h1_ema if h1_ema != 0 else 0
 
             # adaptive lookback based on price time
-            price_time = m5_df.index[-1]
+            price_time = m5.time
             now_hour = price_time.hour
             if 13 <= now_hour <= 21: lookback = 50
             elif 7 <= now_hour < 13: lookback = 35
@@ -79,21 +85,21 @@ class SMCStrategy(BaseStrategy):
             if is_gold:
                 lookback = 20 # Gold Specialist: 5 hours (Faster structure)
 
-            if len(m15_df) < lookback + 5: 
+            if len(m15) < lookback + 5: 
                 return None
             
             # V14.0 Performance: Read pre-calculated structural levels
             # Instead of on-the-fly max/min scans, we use 36-bar rolling columns
             # which were pre-processed in IndicatorCalculator.add_indicators
-            prev_high = m15_df.iloc[-1].get('prev_high_36', 0)
-            prev_low = m15_df.iloc[-1].get('prev_low_36', 0)
+            prev_high = m15_bar.get('prev_high_36', 0)
+            prev_low = m15_bar.get('prev_low_36', 0)
             
             if prev_high == 0 or prev_low == 0: return None
             
             # Check if M5 price is CURRENTLY sweeping that M15 level
-            latest_high = m5_df['high'].iloc[-1]
-            latest_low = m5_df['low'].iloc[-1]
-            latest_close = m5_df['close'].iloc[-1]
+            latest_high = m5_bar['high']
+            latest_low = m5_bar['low']
+            latest_close = m5_bar['close']
             
             direction = None
             sweep_level = 0
@@ -109,11 +115,12 @@ class SMCStrategy(BaseStrategy):
             
             # If not current, check RECENT M5 bars for a sweep (Delayed Entry model)
             if not direction:
+                recent_lows, recent_highs, recent_closes = m5.window('low', 20), m5.window('high', 20), m5.window('close', 20)
                 for i in range(2, 20):
-                    if i >= len(m5_df): break
-                    c_low = m5_df['low'].iloc[-i]
-                    c_high = m5_df['high'].iloc[-i]
-                    c_close = m5_df['close'].iloc[-i]
+                    if i >= len(m5): break
+                    c_low = recent_lows[-i]
+                    c_high = recent_highs[-i]
+                    c_close = recent_closes[-i]
                     if c_low < prev_low and c_close > prev_low:
                         direction = "BUY"
                         sweep_level = prev_low
@@ -126,12 +133,67 @@ class SMCStrategy(BaseStrategy):
             if not direction:
                 return None
 
+            # --- V16.0: AI setup inputs, known as soon as the direction is ---
+            # Value Area: Read pre-calculated columns (V14.0)
+            vah = m5_bar.get('vah', 0)
+            val = m5_bar.get('val', 0)
+            in_value = False
+            if vah > 0:
+                if direction == "BUY" and latest_close <= vah: in_value = True
+                elif direction == "SELL" and latest_close >= val: in_value = True
+
+            macro_bias = MacroFilter.get_macro_bias(market_context)
+
+            # Additional Quant Metrics (V14.0: Read pre-calculated ADR)
+            adr = h1_bar.get('adr', 0.0)
+            today_highs = h1.today_slice('high')
+            current_range = today_highs.max() - h1.today_slice('low').min() if len(today_highs) else 0
+            adr_exhausted = False
+            if adr > 0 and current_range >= (adr * 0.9): 
+                adr_exhausted = True
+
+            setup_data = {
+                'symbol': symbol,
+                'strategy_id': self.get_id(),
+                'direction': direction,
+                'regime': regime,
+                'rsi': m5_bar.get('rsi'),
+                'adr_status': "Exhausted" if adr_exhausted else "Normal",
+                'macro_bias': str(macro_bias),
+                'va_status': "Inside" if in_value else "Outside",
+                'ml_features': MLPreGrader.features(data, direction)
+            }
 
-                
             h1_aligned = (direction == "BUY" and h1_trend == "BULLISH") or (direction == "SELL" and h1_trend == "BEARISH")
+            crt_validation = CRTAnalyzer.validate_setup(m15, direction)
+            
+            # Gold Exception: CRT can be strict, so use bonus if low confidence
+            if is_gold and not crt_validation and not h1_aligned:
+                 # Gold needs at least H1 alignment OR CRT
+                 return None
+
+            # Filters
+            # V16.0: Backtests evaluate the wash zone at the bar time ('as_of'), live uses now
+            is_news_safe = NewsFilter.is_news_safe(news_events, symbol, check_time=data.get('as_of'))
+            
+            if is_gold:
+                # Gold Optimization: Allow pre-London moves (07:00 UTC)
+                is_session = 7 <= price_time.hour <= 21
+            else:
+                is_session = SessionFilter.is_valid_session(check_time=price_time)
+                
+            if not is_news_safe or not is_session:
+                return None
+
+            if AI_SPECULATIVE_GRADING:
+                # V16.0: Speculative grade. Hard filters ran first, so only setups that
+                # reach scoring are graded; the urgent grade skips the batch window and
+                # its model call is in flight after one yield, overlapping the rule checks below
+                speculative = asyncio.ensure_future(self.ai_grader.get_score(setup_data, urgent=True))
+                await asyncio.sleep(0)
             
             # 4H Level Alignment - V14.0 Performance Optimization
-            h4_latest = h4_df.iloc[-1]
+            h4_latest = TailView.of(data, 'h4').latest
             h4_high = h4_latest.get('h4_high', 0)
             h4_low = h4_latest.get('h4_low', 0)
             
@@ -141,70 +203,31 @@ class SMCStrategy(BaseStrategy):
                     h4_sweep = True
                 elif direction == "SELL" and latest_high > h4_high and latest_close < h4_high:
                     h4_sweep = True
-                    
-            crt_validation = CRTAnalyzer.validate_setup(m15_df, direction)
-            
-            # Gold Exception: CRT can be strict, so use bonus if low confidence
-            if is_gold and not crt_validation and not h1_aligned:
-                 # Gold needs at least H1 alignment OR CRT
-                 return None
 
             # FVGs - V14.0 Performance Optimization
             has_fvg = False
             if direction == "BUY":
-                has_fvg = m5_df.iloc[-1].get('fvg_bullish', False) or m15_df.iloc[-1].get('fvg_bullish', False)
+                has_fvg = m5_bar.get('fvg_bullish', False) or m15_bar.get('fvg_bullish', False)
             elif direction == "SELL":
-                has_fvg = m5_df.iloc[-1].get('fvg_bearish', False) or m15_df.iloc[-1].get('fvg_bearish', False)
+                has_fvg = m5_bar.get('fvg_bearish', False) or m15_bar.get('fvg_bearish', False)
             
-            displaced = DisplacementAnalyzer.is_displaced(m5_df, direction)
+            displaced = DisplacementAnalyzer.is_displaced(m5, direction)
             
             # BOS (Break of Structure) - V14.0 Performance Optimization
             bos_confirmed = False
             if direction == "BUY":
-                bos_confirmed = m5_df.iloc[-1].get('bos_buy', False)
+                bos_confirmed = m5_bar.get('bos_buy', False)
             elif direction == "SELL":
-                bos_confirmed = m5_df.iloc[-1].get('bos_sell', False)
-            
-            # --- V14.0 Value Area: Read pre-calculated columns ---
-            vah = m5_df.iloc[-1].get('vah', 0)
-            val = m5_df.iloc[-1].get('val', 0)
-            in_value = False
-            if vah > 0:
-                if direction == "BUY" and latest_close <= vah: in_value = True
-                elif direction == "SELL" and latest_close >= val: in_value = True
-
-            entry = EntryLogic.check_pullback(m5_df, direction)
+                bos_confirmed = m5_bar.get('bos_sell', False)
             
-            # Filters
-            is_news_safe = NewsFilter.is_news_safe(news_events, symbol)
+            entry = EntryLogic.check_pullback(m5, direction)
             
             # --- V12.0 Macro & Session ---
-            macro_bias = MacroFilter.get_macro_bias(market_context)
             is_macro_safe = MacroFilter.is_macro_safe(symbol, direction, macro_bias)
             
-            if is_gold:
-                # Gold Optimization: Allow pre-London moves (07:00 UTC)
-                is_session = 7 <= price_time.hour <= 21
-            else:
-                is_session = SessionFilter.is_valid_session(check_time=price_time)
-                
-            if not is_news_safe or not is_session:
-                return None
-            
-            # Additional Quant Metrics (V14.0: Read pre-calculated ADR)
-            adr = h1_df.iloc[-1].get('adr', 0.0)
-            
-            today = h1_df.index[-1].date()
-            today_data = h1_df[h1_df.index.date == today]
-            current_range = today_data['high'].max() - today_data['low'].min() if not today_data.empty else 0
-            
-            adr_exhausted = False
-            if adr > 0 and current_range >= (adr * 0.9): 
-                adr_exhausted = True
-                
             # asian_range = IndicatorCalculator.get_asian_range(m15_df)
-            asian_h = m15_df.iloc[-1].get('asian_high', 0)
-            asian_l = m15_df.iloc[-1].get('asian_low', 0)
+            asian_h = m15_bar.get('asian_high', 0)
+            asian_l = m15_bar.get('asian_low', 0)
             
             asian_sweep = False
             asian_quality = False
@@ -222,9 +245,9 @@ class SMCStrategy(BaseStrategy):
                 elif direction == "SELL" and latest_high > asian_h:
                     asian_sweep = True
 
-            poc = m5_df.iloc[-1].get('poc', 0)
-            atr = m5_df.iloc[-1]['atr']
-            ema_slope = IndicatorCalculator.calculate_ema_slope(h1_df, f'ema_{EMA_TREND}')
+            poc = m5_bar.get('poc', 0)
+            atr = m5_bar['atr']
+            ema_slope = IndicatorCalculator.calculate_ema_slope(h1, f'ema_{EMA_TREND}')
 
             # Scoring
             score_details = {
@@ -234,7 +257,7 @@ class SMCStrategy(BaseStrategy):
                 'displaced': displaced,
                 'pullback': entry is not None,
                 'session': "Active",
-                'volatile': VolatilityFilter.is_volatile(m5_df),
+                'volatile': VolatilityFilter.is_volatile(m5),
                 'asian_sweep': asian_sweep,
                 'asian_quality': asian_quality,
                 'adr_exhausted': adr_exhausted,
@@ -277,17 +300,10 @@ class SMCStrategy(BaseStrategy):
             confidence = ScoringEngine.calculate_score(score_details)
             
             # --- V13.0 AI Setup Grader (Neural Shield) ---
-            setup_data = {
-                'symbol': symbol,
-                'strategy_id': self.get_id(),
-                'direction': direction,
-                'regime': regime,
-                'rsi': m5_df.iloc[-1].get('rsi'),
-                'adr_status': "Exhausted" if adr_exhausted else "Normal",
-                'macro_bias': str(macro_bias),
-                'va_status': "Inside" if in_value else "Outside"
-            }
-            ai_score = await self.ai_grader.get_score(setup_data)
+            if speculative is not None:
+                ai_score = await speculative
+            else:
+                ai_score = await self.ai_grader.get_score(setup_data)
             
             # Weight the AI score into the final confidence
             final_confidence = (confidence * 0.4) + (ai_score * 0.6)
@@ -297,7 +313,7 @@ class SMCStrategy(BaseStrategy):
             if final_confidence >= threshold:
                 setup_quality = "A+" if final_confidence >= 9.0 else "A" if final_confidence >= 8.5 else "B"
                 opt_mult = AutoOptimizer.get_multiplier_for_symbol(symbol)
-                levels = EntryLogic.calculate_levels(m5_df, direction, sweep_level, atr, symbol=symbol, opt_mult=opt_mult)
+                levels = EntryLogic.calculate_levels(m5, direction, sweep_level, atr, symbol=symbol, opt_mult=opt_mult)
                 risk_details = RiskManager.calculate_lot_size(symbol, latest_close, levels['sl'])
                 layers = RiskManager.calculate_layers(risk_details['lots'], latest_close, levels['sl'], direction, setup_quality)
                 
@@ -315,6 +331,7 @@ class SMCStrategy(BaseStrategy):
                     'layers': layers,
                     'confidence': final_confidence,
                     'risk_details': risk_details,
+                    'ml_features': setup_data['ml_features'],
                     'session': "Active",
                     'h4_sweep': h4_sweep,
                     'crt_phase': crt_validation.get('phase', 'ACC') if crt_validation else 'ACC'
@@ -324,3 +341,7 @@ class SMCStrategy(BaseStrategy):
 
         except Exception as e:
             return None
+        finally:
+            # V16.0: A setup that errored out does not leave its speculative grade running
+            if speculative is not None and not speculative.done():
+                speculative.cancel()
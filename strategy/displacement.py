@@ -1,17 +1,44 @@
 import pandas as pd
 from config.config import DISPLACEMENT_BODY_PERCENT
+from indicators.snapshot import BarSnapshot, TailView
 
 class DisplacementAnalyzer:
+    @staticmethod
+    def displaced_series(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        V16.0: `is_displaced` for every bar in one pass. Returns the
+        'displaced_buy' / 'displaced_sell' columns.
+        """
+        candle_range = df['high'] - df['low']
+        body_ratio = (df['close'] - df['open']).abs() / candle_range.where(candle_range != 0)
+        is_strong = body_ratio >= DISPLACEMENT_BODY_PERCENT
+        return pd.DataFrame({
+            'displaced_buy': is_strong & (df['close'] > df['open']),
+            'displaced_sell': is_strong & (df['close'] < df['open'])
+        }, index=df.index)
+
     @staticmethod
     def is_displaced(m1_df: pd.DataFrame, direction: str) -> bool:
         """
         Confirms smart money intent via displacement candle.
         direction: 'BUY' or 'SELL'
+        Accepts a DataFrame, a TailView or the latest BarSnapshot.
         """
-        if m1_df.empty or len(m1_df) < 1:
+        if isinstance(m1_df, BarSnapshot):
+            latest = m1_df
+        elif m1_df.empty or len(m1_df) < 1:
             return False
+        elif isinstance(m1_df, TailView):
+            latest = m1_df.latest
+        else:
+            latest = m1_df.iloc[-1]
+
+        # V16.0: Precomputed columns when available
+        if direction in ("BUY", "SELL"):
+            col = f'displaced_{direction.lower()}'
+            if col in latest:
+                return bool(latest[col])
 
-        latest = m1_df.iloc[-1]
         body = abs(latest['close'] - latest['open'])
         candle_range = latest['high'] - latest['low']
 
@@ -1,20 +1,46 @@
 import pandas as pd
 from config.config import RSI_BUY_LOW, RSI_BUY_HIGH, RSI_SELL_LOW, RSI_SELL_HIGH, EMA_FAST, ATR_MULTIPLIER
+from indicators.snapshot import TailView
 
 class EntryLogic:
+    @staticmethod
+    def pullback_series(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        V16.0: `check_pullback` triggers for every bar in one pass. Returns the
+        'pullback_buy' / 'pullback_sell' columns.
+        """
+        ema20 = df[f'ema_{EMA_FAST}'].astype(float)
+        rsi = df['rsi'].astype(float)
+        prev_rsi = rsi.shift(1)
+        return pd.DataFrame({
+            'pullback_buy': (prev_rsi <= RSI_BUY_HIGH) & (rsi > RSI_BUY_HIGH) & (df['low'] <= ema20 * 1.001),
+            'pullback_sell': (prev_rsi >= RSI_SELL_LOW) & (rsi < RSI_SELL_LOW) & (df['high'] >= ema20 * 0.999)
+        }, index=df.index)
+
     @staticmethod
     def check_pullback(df: pd.DataFrame, direction: str) -> dict:
         """
         Checks for pullback to EMA20 and RSI confirmation.
         Returns entry details if valid.
+        Accepts a DataFrame or a pre-extracted TailView.
         """
         if df.empty or len(df) < 2:
             return None
 
-        latest = df.iloc[-1]
-        prev = df.iloc[-2]
+        if isinstance(df, TailView):
+            latest, prev = df.latest, df.prev(1)
+        else:
+            latest = df.iloc[-1]
+            prev = df.iloc[-2]
         ema20 = latest[f'ema_{EMA_FAST}']
         rsi = latest['rsi']
+
+        # V16.0: Precomputed trigger columns when available
+        if direction in ("BUY", "SELL") and f'pullback_{direction.lower()}' in latest:
+            if not latest[f'pullback_{direction.lower()}']:
+                return None
+            return {'entry_price': latest['close'], 'ema_zone': ema20, 'rsi_val': rsi}
+
         prev_rsi = prev['rsi']
 
         # Entry Zone: Price within a small buffer of EMA20
@@ -49,7 +75,7 @@ class EntryLogic:
         """
         Calculates Stop Loss and Take Profit levels (V8.0 Session Adaptive).
         """
-        latest_price = df.iloc[-1]['close']
+        latest_price = df.latest.close if isinstance(df, TailView) else df.iloc[-1]['close']
         
         # Session Tuning (V8.0)
         # Default TP2 multiplier is 1.5
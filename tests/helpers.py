@@ -0,0 +1,74 @@
+"""Shared test factories and stand-ins, imported from tests.helpers."""
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from ai.analyst import AIAnalyst
+from filters.ai_grader import AIGrader
+from filters.ai_score_cache import AIScoreCache
+
+
+def make_frame(periods=300, freq="5min", seed=1, step=0.0008, open_noise=0.0003, wick=None):
+    """Synthetic OHLCV random walk. High/low sit `wick` from the close, or a random wick when None."""
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, step, periods))
+    index = pd.date_range("2026-01-05", periods=periods, freq=freq, tz="UTC")
+    opens = close + rng.normal(0, open_noise, periods)
+    if wick is None:
+        high = close + np.abs(rng.normal(0.0008, 0.0003, periods))
+        low = close - np.abs(rng.normal(0.0008, 0.0003, periods))
+    else:
+        high, low = close + wick, close - wick
+    return pd.DataFrame({
+        'open': opens,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.integers(100, 1000, periods).astype(float)
+    }, index=index)
+
+
+class RsiModel:
+    """predict_proba stand-in: win probability = rsi / 100. Records each batch size."""
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, frame):
+        self.calls.append(len(frame))
+        p = frame['rsi'].to_numpy() / 100
+        return np.column_stack([1 - p, p])
+
+
+class SlowClient:
+    """Synchronous genai client stand-in that blocks like a real model round trip."""
+    def __init__(self, delay=0.0, text='{"score": 8.0, "trap_risk": "LOW", "reason": "ok"}'):
+        self.delay = delay
+        self.text = text
+        self.active = 0
+        self.peak = 0
+        self.prompts = []
+        self.lock = threading.Lock()
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.prompts.append(contents)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return SimpleNamespace(text=self.text)
+
+
+def make_grader(client, batch_window=0, **kwargs):
+    """Live AIGrader on `client` with an in-memory cache."""
+    analyst = AIAnalyst()
+    analyst.client = client
+    analyst.model_id = "test-model"
+    grader = AIGrader(analyst=analyst, batch_window=batch_window, cache=AIScoreCache(":memory:"), **kwargs)
+    grader.disabled = False
+    return grader
@@ -1,5 +1,22 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
 import pytest
+from google import genai
+
 from ai.analyst import AIAnalyst
+from config.config import AI_FALLBACK_SCORE, AI_OUTPUT_TOKENS_PER_SETUP, AI_TIMEOUT_SECONDS
+from filters.ai_breaker import CircuitBreaker
+from filters.ai_score_cache import AIScoreCache
+from filters.ml_pregrader import MLPreGrader
+from indicators.calculations import IndicatorCalculator
+from strategies.smc_strategy import SMCStrategy
+from strategy.scoring import ScoringEngine
+from tests.helpers import RsiModel, SlowClient, make_frame, make_grader
 
 @pytest.mark.asyncio
 async def test_ai_validation_no_key():
@@ -24,3 +41,307 @@ async def test_ai_sentiment_no_key():
     analyst = AIAnalyst()
     sentiment = await analyst.get_market_sentiment([], "EURUSD")
     assert "Neutral" in sentiment
+
+@pytest.mark.asyncio
+async def test_grader_does_not_block_event_loop():
+    grader = make_grader(SlowClient(0.3))
+    ticks = []
+
+    async def heartbeat():
+        for _ in range(5):
+            ticks.append(asyncio.get_running_loop().time())
+            await asyncio.sleep(0.02)
+
+    score, _ = await asyncio.gather(grader.get_score({'symbol': 'EURUSD=X', 'direction': 'BUY'}), heartbeat())
+    assert score == 8.0
+    # The loop kept running while the model call was in flight
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.25
+
+@pytest.mark.asyncio
+async def test_grader_timeout_and_concurrency_limit():
+    client = SlowClient(0.1)
+    grader = make_grader(client)
+    with patch("ai.analyst.AI_MAX_CONCURRENCY", 2), patch.object(AIAnalyst, "_limits", {}):
+        setups = [{'symbol': f'S{i}', 'direction': 'BUY'} for i in range(6)]
+        scores = await asyncio.gather(*(grader.get_score(s) for s in setups))
+    assert scores == [8.0] * 6
+    assert client.peak <= 2
+
+    # A response slower than the budget falls back instead of holding the scan
+    slow = make_grader(SlowClient(0.5))
+    with patch("filters.ai_grader.AI_TIMEOUT_SECONDS", 0.05):
+        start = asyncio.get_running_loop().time()
+        assert await slow.get_score({"symbol": "GBPUSD=X", "direction": "SELL"}) == AI_FALLBACK_SCORE
+        assert asyncio.get_running_loop().time() - start < 0.3
+
+@pytest.mark.asyncio
+async def test_concurrent_setups_share_one_batched_call():
+    reply = '{"grades": [{"id": 1, "score": 4.0, "trap_risk": "HIGH", "reason": "trap"}, {"id": 0, "score": 9.0, "trap_risk": "LOW", "reason": "ok"}]}'
+    client = SlowClient(0.2, text=reply)
+    grader = make_grader(client, batch_window=0.02)
+    setups = [
+        {'symbol': 'EURUSD=X', 'direction': 'BUY', 'regime': 'TRENDING'},
+        {'symbol': 'GBPUSD=X', 'direction': 'SELL', 'regime': 'RANGING'},
+        {'symbol': 'USDJPY=X', 'direction': 'BUY', 'regime': 'CHOPPY'},
+    ]
+
+    start = asyncio.get_running_loop().time()
+    # The duplicate EURUSD request joins the same batch entry
+    scores = await asyncio.gather(*(grader.get_score(s) for s in setups + setups[:1]))
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert scores == [9.0, 4.0, AI_FALLBACK_SCORE, 9.0]  # setup 2 missing from the reply -> fallback
+    assert grader.model_calls == 1 and client.peak == 1
+    assert elapsed < 0.4  # one round trip, not three
+    assert '{"id":2,"symbol":"USDJPY=X"' in grader._prompt(setups)
+
+    # Graded setups are served from the cache on the next cycle
+    assert await grader.get_score(setups[1]) == 4.0
+    assert grader.model_calls == 1
+
+def test_breaker_opens_and_half_opens():
+    now = {'t': 0.0}
+    breaker = CircuitBreaker(failures=2, p95_limit=1.0, cooldown=60, clock=lambda: now['t'])
+
+    breaker.record_failure(0.2)
+    assert breaker.allow()
+    breaker.record_failure(0.2)
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    now['t'] = 61
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_success(0.3)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    # Slow but successful responses open it on p95 latency
+    for _ in range(CircuitBreaker.MIN_SAMPLES):
+        breaker.record_success(2.0)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()['p95'] == 2.0 and breaker.stats()['opens'] == 2
+
+class BrokenClient:
+    """Client stand-in for a provider outage; counts attempted calls."""
+    calls = 0
+
+    def __init__(self):
+        self.models = self
+
+    def generate_content(self, model, contents, config=None):
+        BrokenClient.calls += 1
+        raise RuntimeError("503 overloaded")
+
+@pytest.mark.asyncio
+async def test_failing_provider_falls_back_to_local_model():
+    BrokenClient.calls = 0
+    grader = make_grader(BrokenClient())
+    grader.pregrader = MLPreGrader(RsiModel(), reject_below=0.0)
+    setup = {'symbol': 'EURUSD=X', 'direction': 'BUY',
+             'ml_features': dict(rsi=82.0, body_ratio=0.5, atr_norm=0.001, displaced=1, h1_trend=1)}
+
+    scores = [await grader.get_score(dict(setup, direction=d)) for d in ('BUY', 'SELL', 'BUY', 'SELL', 'BUY')]
+    # A confident local score (8.2) is capped: no setup passes an AI gate while the provider is down
+    assert scores == [AI_FALLBACK_SCORE] * 5
+    # The breaker opened after 3 failures; later setups never reached the provider
+    assert BrokenClient.calls == 3
+    health = grader.health()
+    assert health['state'] == 'OPEN' and health['fallbacks'] == 5
+    # Below the cap the local model's score is kept
+    weak = dict(setup, ml_features=dict(setup['ml_features'], rsi=40.0))
+    assert await grader.get_score(weak) == 4.0
+
+    # A spent cycle budget skips the provider as well
+    grader.breaker = type(grader.breaker)()
+    grader.cycle_budget = 1e-9
+    grader.begin_cycle()
+    assert await grader.get_score(dict(setup, regime='X')) == AI_FALLBACK_SCORE
+    assert BrokenClient.calls == 3
+
+@pytest.mark.asyncio
+async def test_cancelled_setup_leaves_the_batch():
+    grader = make_grader(SlowClient(0.0), batch_window=0.05)
+
+    speculative = asyncio.create_task(grader.get_score({'symbol': 'EURUSD=X', 'direction': 'BUY'}))
+    await asyncio.sleep(0)
+    speculative.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await speculative
+    assert grader._pending == {}
+
+    # The batch window closes with nothing to send: no model call was paid for
+    await asyncio.sleep(0.1)
+    assert grader.model_calls == 0
+
+class GeminiStandIn(BaseHTTPRequestHandler):
+    """Local generateContent endpoint: grades every prompted setup 8.5 and reports token usage."""
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        GeminiStandIn.requests.append((self.path, body))
+        prompt = body['contents'][0]['parts'][0]['text']
+        ids = [json.loads(line)['id'] for line in prompt.splitlines() if line.startswith('{"id"')]
+        grades = {'grades': [{'id': i, 'score': 8.5, 'trap_risk': 'LOW', 'reason': 'ok'} for i in ids]}
+        reply = json.dumps({
+            'candidates': [{'content': {'role': 'model', 'parts': [{'text': json.dumps(grades)}]}, 'finishReason': 'STOP'}],
+            'usageMetadata': {'promptTokenCount': 40 * len(ids), 'candidatesTokenCount': 15 * len(ids)}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def gemini_stand_in():
+    server = HTTPServer(('127.0.0.1', 0), GeminiStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    GeminiStandIn.requests = []
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+@pytest.mark.asyncio
+async def test_grader_uses_json_mode_and_tracks_tokens(gemini_stand_in):
+    grader = make_grader(genai.Client(api_key="test", http_options={'base_url': gemini_stand_in}), batch_window=0.02)
+    setups = [{'symbol': s, 'strategy_id': 'smc_institutional', 'direction': 'BUY', 'regime': 'TRENDING',
+               'rsi': 41.23456, 'adr_status': 'Normal', 'macro_bias': 'NEUTRAL', 'va_status': 'Inside'}
+              for s in ('EURUSD=X', 'GBPUSD=X', 'AUDUSD=X')]
+
+    assert await asyncio.gather(*(grader.get_score(s) for s in setups)) == [8.5] * 3
+
+    path, body = GeminiStandIn.requests[0]
+    assert len(GeminiStandIn.requests) == 1 and path.endswith('/models/test-model:generateContent')
+    config = body['generationConfig']
+    assert config['responseMimeType'] == 'application/json'
+    assert config['responseSchema']['properties']['grades']['type'] == 'ARRAY'
+    assert config['maxOutputTokens'] == 3 * AI_OUTPUT_TOKENS_PER_SETUP
+    # Compact prompt: one JSON line per setup, no free-text answer format
+    prompt = body['contents'][0]['parts'][0]['text']
+    assert '"rsi":41.2' in prompt and len(grader._prompt(setups[:1])) < 700
+
+    health = grader.health()
+    assert (health['prompt_tokens'], health['output_tokens'], health['tokens_per_setup']) == (120, 45, 55)
+    assert grader.last_call['setups'] == 3 and grader.last_call['prompt'] == 120
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_does_not_wedge_the_breaker():
+    grader = make_grader(SlowClient(0.2))
+    grader.breaker = CircuitBreaker(cooldown=0)
+    grader.breaker.record_failure()
+    grader.breaker._open("test")
+
+    # The half-open probe's caller is cancelled mid-call (e.g. a speculative grade)
+    probe = asyncio.create_task(grader.get_score({'symbol': 'EURUSD=X', 'direction': 'BUY'}))
+    await asyncio.sleep(0.05)
+    assert grader.breaker.state == CircuitBreaker.HALF_OPEN
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    # The next setup may probe again and closes the breaker
+    assert await grader.get_score({'symbol': 'GBPUSD=X', 'direction': 'SELL'}) == 8.0
+    assert grader.breaker.state == CircuitBreaker.CLOSED and grader.fallbacks == 0
+
+@pytest.mark.asyncio
+async def test_abandoned_call_keeps_its_slot_until_the_thread_finishes():
+    client = SlowClient(0.3)
+    analyst = make_grader(client).analyst
+    with patch("ai.analyst.AI_MAX_CONCURRENCY", 1), patch.object(AIAnalyst, "_limits", {}):
+        with pytest.raises(asyncio.TimeoutError):
+            await analyst.generate("hung", timeout=0.05)
+        # The hung request still occupies the only worker: a new call waits for the
+        # slot instead of queueing behind it inside the executor
+        with pytest.raises(asyncio.TimeoutError):
+            await analyst.generate("queued", timeout=0.05)
+        assert client.peak == 1
+        await asyncio.sleep(0.3)
+        assert await analyst.generate("after", timeout=1) == client.text
+
+def test_client_has_http_timeout():
+    with patch("ai.analyst.GEMINI_API_KEY", "key"), patch("ai.analyst.genai.Client") as client_cls:
+        AIAnalyst()
+    assert client_cls.call_args.kwargs['http_options'] == {'timeout': int(AI_TIMEOUT_SECONDS * 1000)}
+
+class SlowGrader:
+    """Grader stand-in that takes a round trip and records cancellations."""
+    def __init__(self):
+        self.started = self.finished = self.cancelled = 0
+        self.urgent = []
+        self.setups = []
+
+    async def get_score(self, setup_data: dict, urgent: bool = False) -> float:
+        self.started += 1
+        self.setups.append(setup_data)
+        self.urgent.append(urgent)
+        try:
+            await asyncio.sleep(0.005)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished += 1
+        return 8.0
+
+def speculative_bars(start=250, end=600):
+    # M5 and M15 share one price path so M5 bars actually sweep M15 structure
+    m5 = IndicatorCalculator.add_indicators(make_frame(600, "5min", 1), "m5")
+    m15 = IndicatorCalculator.add_indicators(make_frame(600, "5min", 1), "m15")
+    h1 = IndicatorCalculator.add_indicators(make_frame(400, "1h", 3), "h1")
+    h4, d1 = make_frame(100, "4h", 4), make_frame(60, "1D", 5)
+    return [{'m5': m5.iloc[:i], 'm15': m15.iloc[:i], 'h1': h1, 'h4': h4, 'd1': d1} for i in range(start, end)]
+
+@pytest.mark.asyncio
+async def test_speculative_grading_matches_serial():
+    serial, speculative = SMCStrategy(SlowGrader()), SMCStrategy(SlowGrader())
+    for data in speculative_bars():
+        expected = await serial.analyze("EURUSD=X", data, [], {})
+        with patch("strategies.smc_strategy.AI_SPECULATIVE_GRADING", True):
+            assert await speculative.analyze("EURUSD=X", data, [], {}) == expected
+    # Hard filters run before the grade starts: exactly the setups the serial path grades, sent urgently
+    assert speculative.ai_grader.finished == speculative.ai_grader.started == serial.ai_grader.finished > 0
+    assert speculative.ai_grader.cancelled == 0
+    assert all(speculative.ai_grader.urgent) and not any(serial.ai_grader.urgent)
+
+@pytest.mark.asyncio
+async def test_speculative_grade_overlaps_rule_checks():
+    # Bars whose setups pass the hard filters and reach scoring, one per cache key
+    probe, graded = SMCStrategy(SlowGrader()), {}
+    for data in speculative_bars():
+        before = probe.ai_grader.started
+        await probe.analyze("EURUSD=X", data, [], {})
+        if probe.ai_grader.started > before:
+            graded.setdefault(AIScoreCache.key(probe.ai_grader.setups[-1]), data)
+    graded = list(graded.values())
+    assert len(graded) >= 2
+
+    score = ScoringEngine.calculate_score
+    for speculate in (False, True):
+        client = SlowClient(delay=0.1)
+        strategy = SMCStrategy(make_grader(client, batch_window=None))  # Default coalescing window
+        in_flight = []
+
+        def slow_score(details):
+            time.sleep(0.02)  # Rule work the model call can overlap
+            in_flight.append(client.active)
+            return score(details)
+
+        with patch("strategies.smc_strategy.AI_SPECULATIVE_GRADING", speculate), \
+             patch("strategies.smc_strategy.ScoringEngine.calculate_score", side_effect=slow_score):
+            for data in graded[:3]:
+                await strategy.analyze("EURUSD=X", data, [], {})
+        assert len(in_flight) == len(graded[:3])
+        # Serial: the model is only called after scoring; speculative: it is already running
+        assert in_flight == ([1] * len(in_flight) if speculate else [0] * len(in_flight))
+
+@pytest.mark.asyncio
+async def test_rejected_setups_make_no_model_call():
+    client = SlowClient()
+    strategy = SMCStrategy(make_grader(client, batch_window=None))
+    with patch("strategies.smc_strategy.AI_SPECULATIVE_GRADING", True), \
+         patch("strategies.smc_strategy.NewsFilter.is_news_safe", return_value=False):
+        for data in speculative_bars():
+            assert await strategy.analyze("EURUSD=X", data, [], {}) is None
+    await asyncio.sleep(0.1)  # Past the batch window: nothing was queued either
+    assert client.prompts == [] and strategy.ai_grader.model_calls == 0
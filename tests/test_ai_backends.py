@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from ai.analyst import AIAnalyst
+from filters.ai_backends import GradeLog, ReplayBackend, SurrogateBackend
+from filters.ai_grader import AIGrader
+from filters.ml_pregrader import MLPreGrader
+from tests.helpers import RsiModel, SlowClient, make_grader
+
+def make_setup(symbol, rsi=42.0):
+    return {'symbol': symbol, 'strategy_id': 'breakout_master', 'direction': 'BUY', 'rsi': rsi,
+            'ml_features': dict(rsi=rsi, body_ratio=0.6, atr_norm=0.001, displaced=1, h1_trend=1)}
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    log = GradeLog(str(tmp_path / "grades.db"))
+    recorder = make_grader(SlowClient(text='{"score": 8.7, "trap_risk": "LOW", "reason": "ok"}'), mode='record', recorder=log)
+
+    assert await recorder.get_score(make_setup('EURUSD=X')) == 8.7
+    assert await recorder.get_score(make_setup('EURUSD=X')) == 8.7  # cache hit
+    # A provider fallback is not a live grade and is never logged
+    recorder.breaker._open("test")
+    await recorder.get_score(make_setup('USDJPY=X'))
+    assert list(log.load().values()) == [8.7]
+
+    # Replay: no client, no network, grades served from the log
+    replay = AIGrader(analyst=AIAnalyst(), backend=ReplayBackend(log))
+    replay.disabled = True
+    assert replay.active
+    assert await replay.get_score(make_setup('EURUSD=X', rsi=43.0)) == 8.7  # same RSI bucket
+    assert await replay.get_score(make_setup('GBPUSD=X')) == AIGrader.DEFAULT_SCORE
+    assert replay.backend.stats() == {'mode': 'replay', 'grades': 1, 'hits': 1, 'misses': 1}
+
+@pytest.mark.asyncio
+async def test_surrogate_scores_from_local_model():
+    grader = AIGrader(analyst=AIAnalyst(), backend=SurrogateBackend(MLPreGrader(RsiModel())))
+    scores = await asyncio.gather(grader.get_score(make_setup('EURUSD=X', rsi=80.0)),
+                                  grader.get_score({'symbol': 'GBPUSD=X', 'ml_features': None}))
+    assert scores == [8.0, AIGrader.DEFAULT_SCORE]
+    assert grader.backend.stats() == {'mode': 'surrogate', 'scored': 1, 'defaulted': 1}
+
+def test_mode_from_config(monkeypatch):
+    monkeypatch.setattr('filters.ai_grader.AI_GRADER_MODE', 'surrogate')
+    grader = AIGrader()
+    assert grader.mode == 'surrogate' and isinstance(grader.backend, SurrogateBackend)
+    monkeypatch.setattr('filters.ai_grader.AI_GRADER_MODE', 'live')
+    assert AIGrader().backend is None
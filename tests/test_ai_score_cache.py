@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+from filters.ai_grader import AIGrader
+from filters.ai_score_cache import AIScoreCache
+
+def make_setup(**overrides):
+    setup = {
+        'symbol': 'EURUSD=X', 'strategy_id': 'smc_institutional', 'direction': 'BUY',
+        'regime': 'TRENDING', 'rsi': 41.2, 'adr_status': 'Normal',
+        'macro_bias': "{'DXY': 'BEARISH'}", 'va_status': 'Inside'
+    }
+    setup.update(overrides)
+    return setup
+
+def test_key_uses_full_normalized_setup():
+    base = AIScoreCache.key(make_setup())
+    # Same RSI bucket -> same grade; any other field -> different setup
+    assert AIScoreCache.key(make_setup(rsi=44.9)) == base
+    assert AIScoreCache.key(make_setup(rsi=45.1)) != base
+    assert AIScoreCache.key(make_setup(va_status='Outside')) != base
+    assert AIScoreCache.key(make_setup(strategy_id='breakout_master')) != base
+    assert AIScoreCache.key(dict(reversed(list(make_setup().items())))) == base
+
+def test_ttl_lru_and_stats():
+    now = {'t': 1000.0}
+    cache = AIScoreCache(":memory:", ttl=300, max_entries=2, clock=lambda: now['t'])
+
+    assert cache.get(make_setup()) is None
+    cache.put(make_setup(), 8.5)
+    assert cache.get(make_setup(rsi=43.0)) == 8.5
+
+    now['t'] += 10
+    cache.put(make_setup(symbol='GBPUSD=X'), 6.0)
+    now['t'] += 10
+    cache.get(make_setup())  # EURUSD becomes most recently used
+    now['t'] += 10
+    cache.put(make_setup(symbol='USDJPY=X'), 7.0)
+    assert len(cache) == 2
+    assert cache.get(make_setup(symbol='GBPUSD=X')) is None  # least recently used, evicted
+    assert cache.get(make_setup()) == 8.5
+
+    now['t'] += 300
+    assert cache.get(make_setup()) is None  # expired
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (3, 3, 1)
+    assert stats['hit_rate'] == 0.5
+
+def test_grades_survive_restart(tmp_path):
+    db_path = str(tmp_path / "ai_cache.db")
+    AIScoreCache(db_path).put(make_setup(), 9.0)
+    assert AIScoreCache(db_path).get(make_setup()) == 9.0
+    assert AIScoreCache.shared(db_path) is AIScoreCache.shared(db_path)
+
+def test_grader_cache_stats_never_open_the_cache():
+    grader = AIGrader()
+    with patch.object(AIScoreCache, "shared") as shared:
+        assert grader.cache_stats() is None
+    assert not shared.called and grader._cache is None
+
+    grader = AIGrader(cache=AIScoreCache(":memory:"))
+    assert grader.cache_stats()['hits'] == 0
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from ai.analyst import AIAnalyst
+from alerts.rationale import RationaleDispatcher
+from alerts.service import RATIONALE_PENDING, TelegramService
+
+NEWS = [{'title': 'CPI', 'country': 'USD', 'impact': 'High', 'date': '2026-01-05T13:30:00+00:00'}]
+
+class SlowAnalyst:
+    """Analyst stand-in whose rationale takes a model round trip."""
+    client = object()
+
+    async def get_market_sentiment(self, news_events, symbol):
+        await asyncio.sleep(0.2)
+        return f"Institutional Rationale: {symbol} swept liquidity."
+
+@pytest.mark.asyncio
+async def test_alert_is_delivered_before_the_rationale():
+    with patch("telegram.Bot") as mock_bot_cls:
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=lambda **kwargs: SimpleNamespace(message_id=len(bot.send_message.call_args_list)))
+        mock_bot_cls.return_value = bot
+        with patch("alerts.service.TELEGRAM_BOT_TOKEN", "token"), patch("alerts.service.TELEGRAM_CHAT_ID", "chat"):
+            service = TelegramService()
+        rationales = RationaleDispatcher(service, SlowAnalyst())
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for symbol in ("EURUSD=X", "GBPUSD=X"):
+            sent = await service.send_signal(f"{symbol} alert")
+            rationales.dispatch(sent, {'symbol': symbol}, NEWS)
+        # Both alerts went out without waiting on the model
+        assert loop.time() - start < 0.1
+        assert bot.send_message.call_count == 2 and rationales.pending == 2
+
+        await rationales.drain(timeout=1)
+        assert rationales.sent == 2 and rationales.pending == 0
+        replies = bot.send_message.call_args_list[2:]
+        assert sorted(r.kwargs['reply_to_message_id'] for r in replies) == [1, 2]
+        assert "GBPUSD=X swept liquidity" in replies[-1].kwargs['text']
+
+@pytest.mark.asyncio
+async def test_rationale_skipped_or_contained():
+    telegram = MagicMock()
+    telegram.send_reply = AsyncMock(return_value=True)
+    rationales = RationaleDispatcher(telegram, SlowAnalyst())
+    message = SimpleNamespace(message_id=7)
+
+    # Undelivered alert, no news to reason about, or no model client: nothing scheduled
+    assert rationales.dispatch(None, {'symbol': 'EURUSD=X'}, NEWS) is None
+    assert rationales.dispatch(message, {'symbol': 'EURUSD=X'}, []) is None
+    assert RationaleDispatcher(telegram, SimpleNamespace(client=None)).dispatch(message, {'symbol': 'EURUSD=X'}, NEWS) is None
+
+    # A failing model call is logged and counted, never raised into the scan loop
+    broken = SimpleNamespace(client=object(), get_market_sentiment=AsyncMock(side_effect=RuntimeError("503")))
+    rationales = RationaleDispatcher(telegram, broken)
+    await rationales.dispatch(message, {'symbol': 'EURUSD=X'}, NEWS)
+    assert rationales.failed == 1 and not telegram.send_reply.called
+
+def make_signal():
+    return {
+        'symbol': 'EURUSD=X', 'direction': 'BUY', 'setup_quality': 'A', 'entry_tf': 'M5', 'session': 'London',
+        'layers': [{'label': f'L{i}', 'lots': 0.01, 'price': 1.1 - i * 0.001} for i in range(3)],
+        'sl': 1.09, 'tp0': 1.105, 'tp1': 1.11, 'tp2': 1.12, 'liquidity_event': 'M15_SWEEP', 'entry_zone': '1.1000',
+        'risk_details': {'lots': 0.03, 'risk_cash': 1.0, 'risk_percent': 2.0, 'pips': 10, 'warning': ''},
+        'atr_status': 'NORMAL', 'confidence': 8.5, 'win_prob': 0.6
+    }
+
+@pytest.mark.asyncio
+async def test_keyless_alert_promises_no_rationale():
+    with patch("ai.analyst.GEMINI_API_KEY", None):
+        rationales = RationaleDispatcher(MagicMock(), AIAnalyst())
+    assert not rationales.will_follow(NEWS)
+    assert rationales.dispatch(SimpleNamespace(message_id=7), {'symbol': 'EURUSD=X'}, NEWS) is None
+
+    message = TelegramService().format_signal(make_signal(), rationale_follows=rationales.will_follow(NEWS))
+    assert RATIONALE_PENDING not in message and "AI Market Analysis" not in message
+
+    # With a model client and news the alert announces the reply it will get
+    assert RationaleDispatcher(MagicMock(), SlowAnalyst()).will_follow(NEWS)
+    assert RATIONALE_PENDING in TelegramService().format_signal(make_signal(), rationale_follows=True)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from engine.alignment import TimeframeAlignment
+
+def naive_last_closed(base_index, htf_index, base_dur, htf_dur):
+    """Reference: boolean-mask scan per bar."""
+    out = []
+    for t in base_index:
+        closed = np.where(htf_index + htf_dur <= t + base_dur)[0]
+        out.append(closed[-1] if len(closed) else -1)
+    return np.array(out)
+
+def test_alignment_has_no_lookahead():
+    m5 = pd.date_range("2026-01-05 00:00", periods=60, freq="5min", tz="UTC")
+    h1 = pd.date_range("2026-01-05 00:00", periods=5, freq="1h", tz="UTC")
+    alignment = TimeframeAlignment(m5, {'h1': h1})
+
+    # 00:50 M5 bar closes at 00:55: the 00:00 H1 bar is still forming
+    assert alignment.position('h1', m5.get_loc(pd.Timestamp("2026-01-05 00:50", tz="UTC"))) == -1
+    # 00:55 M5 bar closes at 01:00, exactly when the 00:00 H1 bar closes
+    assert alignment.position('h1', m5.get_loc(pd.Timestamp("2026-01-05 00:55", tz="UTC"))) == 0
+    assert alignment.position('h1', m5.get_loc(pd.Timestamp("2026-01-05 01:30", tz="UTC"))) == 0
+    assert not alignment.ready(0) and alignment.ready(len(m5) - 1)
+
+def test_alignment_matches_mask_reference_with_gaps():
+    m5 = pd.date_range("2026-01-05", periods=2000, freq="5min", tz="UTC")
+    m5 = m5.delete(np.arange(300, 420)) # Data gap
+    m15 = pd.date_range("2026-01-05", periods=700, freq="15min", tz="UTC")
+    h4 = pd.date_range("2026-01-05", periods=50, freq="4h", tz="UTC")
+    alignment = TimeframeAlignment(m5, {'m15': m15, 'h4': h4})
+
+    np.testing.assert_array_equal(alignment.positions['m15'], naive_last_closed(m5, m15, pd.Timedelta("5min"), pd.Timedelta("15min")))
+    np.testing.assert_array_equal(alignment.positions['h4'], naive_last_closed(m5, h4, pd.Timedelta("5min"), pd.Timedelta("4h")))
+    assert alignment.locate(len(m5) - 1) == {'m15': int(alignment.positions['m15'][-1]), 'h4': int(alignment.positions['h4'][-1])}
+
+def test_alignment_extend_matches_full_build():
+    m5 = pd.date_range("2026-01-05", periods=500, freq="5min", tz="UTC")
+    h1 = pd.date_range("2026-01-05", periods=45, freq="1h", tz="UTC")
+
+    live = TimeframeAlignment(m5[:200], {'h1': h1[:10]})
+    # HTF bar arrives late, after base bars that should map to it
+    live.extend(frames={'h1': h1[:20]})
+    live.extend(base_index=m5[:350])
+    live.extend(base_index=m5, frames={'h1': h1})
+
+    full = TimeframeAlignment(m5, {'h1': h1})
+    np.testing.assert_array_equal(live.positions['h1'], full.positions['h1'])
+
+    # A rolling window (first bar dropped) rebuilds instead of appending
+    live.extend(base_index=m5[12:], frames={'h1': h1[1:]})
+    np.testing.assert_array_equal(live.positions['h1'], TimeframeAlignment(m5[12:], {'h1': h1[1:]}).positions['h1'])
@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+import pandas as pd
+from engine.asof_view import AsOfView
+from engine.process_pool import DeferredAIGrader
+from indicators.calculations import IndicatorCalculator
+from indicators.snapshot import TailView
+from filters.ai_grader import AIGrader
+from strategies.breakout_strategy import BreakoutStrategy
+from strategies.price_action_strategy import PriceActionStrategy
+from strategies.smc_strategy import SMCStrategy
+from tests.helpers import make_frame
+
+@pytest.fixture(scope="module")
+def frames():
+    return {
+        'm5': IndicatorCalculator.add_indicators(make_frame(1500, "5min", 1), "m5"),
+        'm15': IndicatorCalculator.add_indicators(make_frame(500, "15min", 2), "m15"),
+        'h1': IndicatorCalculator.add_indicators(make_frame(400, "1h", 3), "h1"),
+        'h4': make_frame(100, "4h", 4),
+        'd1': make_frame(60, "1D", 5)
+    }
+
+def test_asof_view_cursor(frames):
+    view = AsOfView(frames, cursor=400)
+    assert view.time == frames['m5'].index[400]
+    assert view.latest.close == frames['m5']['close'].iloc[400]
+    assert view.prev(2).close == frames['m5']['close'].iloc[398]
+
+    # 400th M5 bar (09:20 open) closes 09:25: last closed H1 bar opened 08:00
+    assert view['h1'].time == pd.Timestamp("2026-01-06 08:00", tz="UTC")
+    np.testing.assert_array_equal(view.window('close', 3), frames['m5']['close'].iloc[398:401].to_numpy())
+
+    h1 = frames['h1'].iloc[:view['h1'].end + 1]
+    today = h1[h1.index.date == h1.index[-1].date()]
+    np.testing.assert_array_equal(view['h1'].today_slice('high'), today['high'].to_numpy())
+
+    view.advance(12)
+    assert view.cursor == 412 and view.latest.close == frames['m5']['close'].iloc[412]
+    assert view['h1'].time == pd.Timestamp("2026-01-06 09:00", tz="UTC")
+
+def test_view_helpers_match_frames(frames):
+    m15 = frames['m15'].iloc[:300]
+    view = TailView.from_frame(frames['m15'], end=299)
+    assert IndicatorCalculator.detect_crt_phases(view) == IndicatorCalculator.detect_crt_phases(m15)
+    assert IndicatorCalculator.calculate_ema_slope(view, 'ema_100') == IndicatorCalculator.calculate_ema_slope(m15, 'ema_100')
+
+@pytest.mark.asyncio
+async def test_strategies_match_sliced_frames(frames):
+
+    strategies = [SMCStrategy(), BreakoutStrategy(), PriceActionStrategy()]
+    for strategy in strategies:
+        strategy.ai_grader = DeferredAIGrader(fixed_score=AIGrader.DEFAULT_SCORE)
+
+    view = AsOfView(frames)
+    signals = 0
+    for i in range(1000, 1100):
+        view.seek(i)
+        pos = view.alignment.locate(i)
+        sliced = {tf: frames[tf].iloc[:pos[tf] + 1] for tf in ('m15', 'h1', 'h4', 'd1')}
+        sliced['m5'] = frames['m5'].iloc[:i + 1]
+        for strategy in strategies:
+            result = await strategy.analyze("EURUSD=X", view.data, [], {})
+            assert result == await strategy.analyze("EURUSD=X", sliced, [], {})
+            signals += result is not None
+    assert signals > 0
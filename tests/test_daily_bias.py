@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters.daily_bias import DailyBias
+from engine.alignment import TimeframeAlignment
+from engine.asof_view import AsOfView
+from indicators.snapshot import TailView
+
+def make_d1(periods=90, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 1.10 + np.cumsum(rng.normal(0, 0.004, periods))
+    open_ = close - rng.normal(0, 0.004, periods)
+    index = pd.date_range("2025-10-01", periods=periods, freq="1D", tz="UTC")
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.uniform(0, 0.002, periods),
+        'low': np.minimum(open_, close) - rng.uniform(0, 0.002, periods),
+        'close': close,
+    }, index=index)
+
+def assert_same(row, scalar):
+    assert row['daily_bias'] == scalar['bias']
+    assert row['daily_strength'] == scalar['strength']
+    if 'ema_20' in scalar:
+        assert row['ema_20'] == pytest.approx(scalar['ema_20'])
+
+@pytest.mark.parametrize("with_ema_column", [False, True])
+def test_analyze_all_matches_scalar(with_ema_column):
+    d1 = make_d1()
+    if with_ema_column:
+        d1['ema_20'] = d1['close'].ewm(span=20, adjust=False).mean()
+    daily = DailyBias.analyze_all(d1)
+
+    strengths = set()
+    for i in range(len(d1)):
+        scalar = DailyBias.analyze(d1.iloc[:i + 1])
+        assert_same(daily.iloc[i], scalar)
+        strengths.add(scalar['strength'])
+    # The fixture exercises both outcomes
+    assert strengths == {'STRONG', 'WEAK'}
+
+def test_annotated_frame_is_a_row_read():
+    d1 = DailyBias.annotate(make_d1())
+    plain = make_d1()
+    for i in (10, 49, 60, 89):
+        view = TailView.from_frame(d1, end=i)
+        assert DailyBias.analyze(view) == pytest.approx(DailyBias.analyze(plain.iloc[:i + 1]))
+
+def test_align_maps_closed_days_onto_intraday_bars():
+    d1 = make_d1()
+    daily = DailyBias.analyze_all(d1)
+    m5 = pd.date_range("2025-12-20 22:00", "2025-12-22 02:00", freq="5min", tz="UTC")
+    alignment = TimeframeAlignment(m5, {'d1': d1.index})
+    context = DailyBias.align(daily, alignment.positions['d1'])
+
+    for i, t in enumerate(m5):
+        # Last day fully closed when this M5 bar closes
+        closed = d1.index[d1.index + pd.Timedelta(days=1) <= t + pd.Timedelta(minutes=5)]
+        scalar = DailyBias.analyze(d1.loc[:closed[-1]])
+        assert context['bias'][i] == scalar['bias']
+        assert context['strength'][i] == scalar['strength']
+
+    # Before any closed day: neutral
+    early = TimeframeAlignment(pd.date_range("2025-09-30", periods=3, freq="5min", tz="UTC"), {'d1': d1.index})
+    assert list(DailyBias.align(daily, early.positions['d1'])['bias']) == ['NEUTRAL'] * 3
+
+def test_asof_view_reads_annotated_d1():
+    d1 = DailyBias.annotate(make_d1())
+    m5_index = pd.date_range("2025-12-01", periods=600, freq="5min", tz="UTC")
+    m5 = pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0}, index=m5_index)
+    view = AsOfView({'m5': m5, 'd1': d1})
+    for cursor in (0, 287, 288, 599):
+        view.seek(cursor)
+        pos = view.alignment.position('d1', cursor)
+        assert DailyBias.analyze(view['d1'])['bias'] == DailyBias.analyze(make_d1().iloc[:pos + 1])['bias']
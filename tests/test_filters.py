@@ -1,7 +1,8 @@
 import pytest
+import numpy as np
 import pandas as pd
 from filters.risk_manager import RiskManager
-from filters.correlation import CorrelationAnalyzer
+from filters.correlation import CorrelationAnalyzer, RollingCorrelation
 from filters.session_filter import SessionFilter
 from filters.volatility_filter import VolatilityFilter
 from config.config import ACCOUNT_BALANCE, MIN_LOT_SIZE
@@ -88,3 +89,68 @@ def test_volatility_filter():
         'atr_avg': [0.0001, 0.0002]
     })
     assert bool(VolatilityFilter.is_volatile(df)) is True
+
+def make_h1_frames(periods=200, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-05", periods=periods, freq="1h", tz="UTC")
+    common = rng.normal(0, 0.001, periods)
+    returns = {
+        "EURUSD=X": common + rng.normal(0, 0.0002, periods),
+        "GBPUSD=X": common + rng.normal(0, 0.0002, periods),
+        "GC=F": rng.normal(0, 0.001, periods),
+    }
+    return {s: pd.DataFrame({'close': 1.1 * np.exp(np.cumsum(r))}, index=index) for s, r in returns.items()}
+
+def test_rolling_correlation_matches_pandas():
+    frames = make_h1_frames()
+    # Gold has gaps: pairs only use overlapping bars
+    frames["GC=F"] = frames["GC=F"].drop(frames["GC=F"].index[50:60])
+    corr = RollingCorrelation(window=48, min_periods=10)
+
+    # Feed bar by bar, well past several window rollovers
+    for end in range(20, 201, 7):
+        corr.update_from_frames({s: df.loc[:frames["EURUSD=X"].index[end - 1]] for s, df in frames.items()})
+    corr.update_from_frames(frames)
+
+    log_returns = pd.DataFrame({s: np.log(df['close']).diff() for s, df in frames.items()})
+    expected = log_returns.iloc[:-1].tail(48).corr(min_periods=10)
+    np.testing.assert_allclose(corr.matrix().loc[expected.index, expected.columns].to_numpy(), expected.to_numpy(), atol=1e-9)
+    assert len(corr) == 48
+    assert corr.correlation("EURUSD=X", "GBPUSD=X") > 0.9
+    assert corr.correlation("EURUSD=X", "UNKNOWN") == 0.0
+
+def test_correlation_exposure_cap():
+    corr = RollingCorrelation(window=48, min_periods=10)
+    corr.update_from_frames(make_h1_frames())
+    signals = [
+        {'symbol': 'EURUSD=X', 'direction': 'BUY', 'confidence': 9.0},
+        {'symbol': 'GBPUSD=X', 'direction': 'BUY', 'confidence': 8.5},
+        {'symbol': 'GC=F', 'direction': 'BUY', 'confidence': 8.0},
+    ]
+    # GBPUSD doubles the EURUSD bet; gold is independent
+    filtered = CorrelationAnalyzer.filter_signals(signals, correlation=corr, max_exposure=3.0)
+    assert [s['symbol'] for s in filtered] == ['EURUSD=X', 'GC=F']
+
+    # Without a correlation matrix only the currency map applies (same-side USD is fine)
+    assert len(CorrelationAnalyzer.filter_signals(signals)) == 3
+
+def test_opposite_signal_on_accepted_symbol_is_rejected():
+    corr = RollingCorrelation(window=48, min_periods=10)
+    corr.update_from_frames(make_h1_frames())
+    signals = [
+        {'symbol': 'GC=F', 'direction': 'BUY', 'confidence': 9.0, 'strategy_id': 'smc'},
+        {'symbol': 'GC=F', 'direction': 'SELL', 'confidence': 8.5, 'strategy_id': 'breakout'},
+        {'symbol': 'GC=F', 'direction': 'BUY', 'confidence': 8.0, 'strategy_id': 'price_action'},
+    ]
+    # Gold is not in the currency map: only the symbol check keeps the SELL out
+    for correlation in (corr, None):
+        filtered = CorrelationAnalyzer.filter_signals(signals, correlation=correlation)
+        assert [s['strategy_id'] for s in filtered] == ['smc', 'price_action']
+
+def test_currency_map_covers_nzd_and_yahoo_symbols():
+    signals = [
+        {'pair': 'NZDUSD=X', 'direction': 'SELL', 'confidence': 9.0},
+        {'pair': 'EURUSD=X', 'direction': 'BUY', 'confidence': 8.5},
+    ]
+    filtered = CorrelationAnalyzer.filter_signals(signals)
+    assert [s['pair'] for s in filtered] == ['NZDUSD=X']
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters.macro_filter import MacroFilter
+from filters.macro_regime import MacroRegimeEngine
+
+BASKET = {"DXY": ("DX-Y.NYB", "DXY", -1), "^TNX": ("^TNX", "TNX", -1)}
+
+def make_macro(periods=120, seed=11):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-05", periods=periods, freq="1h", tz="UTC")
+    return {
+        key: pd.DataFrame({'close': 100 + np.cumsum(rng.normal(0, 0.3, periods))}, index=index)
+        for key in BASKET
+    }
+
+def test_incremental_matches_vectorized():
+    frames = make_macro()
+    engine = MacroRegimeEngine(basket=BASKET, ema_period=20)
+    regime = engine.regime_frame(frames)
+
+    for end in range(1, 121, 9):
+        snapshot = engine.update({k: df.iloc[:end] for k, df in frames.items()}, include_last=True)
+        row = regime.iloc[end - 1]
+        assert snapshot['DXY'] == ('BULLISH' if row['DXY_trend'] > 0 else 'BEARISH')
+        assert snapshot['TNX'] == ('BULLISH' if row['TNX_trend'] > 0 else 'BEARISH')
+        assert snapshot['RISK'] == row['RISK']
+        assert snapshot.features['DXY']['ema'] == pytest.approx(row['DXY_ema'])
+
+def test_forming_bar_is_not_committed():
+    frames = make_macro()
+    regime = MacroRegimeEngine(basket=BASKET).regime_frame(frames)
+    engine = MacroRegimeEngine(basket=BASKET)
+
+    snapshot = engine.update(frames)
+    # State holds the EMA of closed bars only; the forming bar gets a provisional EMA
+    assert engine._state['DXY']['ema'] == pytest.approx(regime['DXY_ema'].iloc[-2])
+    assert snapshot.features['DXY']['ema'] == pytest.approx(regime['DXY_ema'].iloc[-1])
+
+    # Same data again: nothing new, same published snapshot
+    assert engine.update(frames) is snapshot
+
+    # A new bar publishes a new version
+    extended = {k: pd.concat([df, df.iloc[[-1]].set_axis([df.index[-1] + pd.Timedelta(hours=1)])]) for k, df in frames.items()}
+    assert engine.update(extended).version == snapshot.version + 1
+
+def test_macro_filter_reads_snapshot():
+    index = pd.date_range("2026-01-05", periods=30, freq="1h", tz="UTC")
+    rising = pd.DataFrame({'close': np.linspace(100, 110, 30)}, index=index)
+    engine = MacroRegimeEngine(basket=BASKET)
+    context = engine.context({'DXY': rising, '^TNX': rising})
+
+    bias = MacroFilter.get_macro_bias(context)
+    assert bias == {'DXY': 'BULLISH', 'TNX': 'BULLISH', 'RISK': 'OFF'}
+    assert not MacroFilter.is_macro_safe("EURUSD=X", "BUY", bias)
+    assert MacroFilter.is_macro_safe("EURUSD=X", "SELL", bias)
+
+    # Only one series available: no unanimous risk call
+    assert MacroRegimeEngine(basket=BASKET).update({'DXY': rising})['RISK'] == 'NEUTRAL'
+
+def test_regime_aligned_to_base_bars_without_lookahead():
+    frames = make_macro(48)
+    engine = MacroRegimeEngine(basket=BASKET)
+    m5 = pd.date_range("2026-01-04 23:00", "2026-01-05 12:00", freq="5min", tz="UTC")
+    regime = engine.regime_frame(frames, index=m5)
+    full = engine.regime_frame(frames)
+
+    # The 10:00 H1 bar closes at 11:00, which is when the 10:55 M5 bar closes
+    assert regime.loc["2026-01-05 10:50", 'DXY_ema'] == full.loc["2026-01-05 09:00", 'DXY_ema']
+    assert regime.loc["2026-01-05 10:55", 'DXY_ema'] == full.loc["2026-01-05 10:00", 'DXY_ema']
+    # Before the first H1 close the regime is neutral
+    assert regime.iloc[0]['RISK'] == 'NEUTRAL' and regime.iloc[0]['DXY_trend'] == 0
+    assert np.isnan(regime.iloc[0]['DXY_ema'])
+
+    # Snapshots rebuilt only when the bias version moves
+    snapshot = engine.snapshot_at(regime, 30)
+    assert snapshot.version == regime['version'].iloc[30]
+    assert set(snapshot.bias) == {'DXY', 'TNX', 'RISK'}
@@ -4,11 +4,18 @@ import asyncio
 import os
 from unittest.mock import patch, MagicMock, AsyncMock
 from main import process_symbol, main
+from data.news_archive import NewsArchive
 
 class BreakLoop(BaseException): 
     """Custom exception to break out of main loop in tests"""
     pass
 
+@pytest.fixture(autouse=True)
+def isolated_news_archive(tmp_path):
+    """main() archives calendars to a throwaway DB, never database/news_archive.db."""
+    with patch("main.NewsArchive", lambda: NewsArchive(str(tmp_path / "news_archive.db"))):
+        yield
+
 @pytest.fixture
 def mock_data():
     """Standard mock data with all required columns"""
@@ -33,7 +40,7 @@ def mock_data():
 @pytest.mark.asyncio
 async def test_news_rejection(mock_data):
     """Lines 120-121: News safety filter rejection"""
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
         # NewsFilter is imported in strategies.smc_strategy
         with patch("strategies.smc_strategy.NewsFilter.is_news_safe", return_value=False):
             from strategies.smc_strategy import SMCStrategy
@@ -44,9 +51,9 @@ async def test_news_rejection(mock_data):
 @pytest.mark.asyncio
 async def test_adr_exhausted_true(mock_data):
     """Line 137: ADR exhausted branch"""
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
-        with patch("main.IndicatorCalculator.calculate_adr", return_value=pd.Series(index=mock_data['h1'].index, data=0.01)):
-            with patch("main.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 0, 'asian_low': 0})):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+        with patch("indicators.calculations.IndicatorCalculator.calculate_adr", return_value=pd.Series(index=mock_data['h1'].index, data=0.01)):
+            with patch("indicators.calculations.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 0, 'asian_low': 0})):
                 # Patch dependencies inside SMCStrategy
                 with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=10.0):
                     with patch("main.MIN_CONFIDENCE_SCORE", 0):
@@ -78,9 +85,9 @@ async def test_adr_exhausted_true(mock_data):
 @pytest.mark.asyncio
 async def test_asian_sweep_buy(mock_data):
     """Line 152: Asian BUY sweep detection"""
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
-        with patch("main.IndicatorCalculator.calculate_adr", return_value=1.0):
-            with patch("main.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 1.1, 'asian_low': 1.0})):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+        with patch("indicators.calculations.IndicatorCalculator.calculate_adr", return_value=1.0):
+            with patch("indicators.calculations.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 1.1, 'asian_low': 1.0})):
                 with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=10.0):
                     with patch("main.MIN_CONFIDENCE_SCORE", 0):
                         with patch("strategies.smc_strategy.EntryLogic.calculate_levels", return_value={'sl': 1.0, 'tp0': 1.2, 'tp1': 1.3, 'tp2': 1.4}):
@@ -113,9 +120,9 @@ async def test_asian_sweep_buy(mock_data):
 @pytest.mark.asyncio
 async def test_asian_sweep_sell(mock_data):
     """Line 154: Asian SELL sweep detection"""
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
-        with patch("main.IndicatorCalculator.calculate_adr", return_value=1.0):
-            with patch("main.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 1.1, 'asian_low': 1.0})):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+        with patch("indicators.calculations.IndicatorCalculator.calculate_adr", return_value=1.0):
+            with patch("indicators.calculations.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 1.1, 'asian_low': 1.0})):
                 with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=10.0):
                     with patch("main.MIN_CONFIDENCE_SCORE", 0):
                         with patch("strategies.smc_strategy.EntryLogic.calculate_levels", return_value={'sl': 1.0, 'tp0': 1.2, 'tp1': 1.3, 'tp2': 1.4}):
@@ -148,8 +155,8 @@ async def test_asian_sweep_sell(mock_data):
 @pytest.mark.asyncio
 async def test_ai_rejection(mock_data):
     """Lines 201-202: AI validation rejection"""
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
-        with patch("main.IndicatorCalculator.calculate_adr", return_value=1.0):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+        with patch("indicators.calculations.IndicatorCalculator.calculate_adr", return_value=1.0):
             with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=9.5):
                 ai_mock = AsyncMock()
                 ai_mock.validate_signal.return_value = {'valid': False, 'institutional_logic': 'Rejected'}
@@ -161,8 +168,8 @@ async def test_ai_rejection(mock_data):
 @pytest.mark.asyncio
 async def test_dxy_sell_confluence(mock_data):
     """Line 236: DXY SELL+BULLISH confluence"""
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
-        with patch("main.IndicatorCalculator.calculate_adr", return_value=1.0):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+        with patch("indicators.calculations.IndicatorCalculator.calculate_adr", return_value=1.0):
             with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=10.0):
                 with patch("main.MIN_CONFIDENCE_SCORE", 0):
                     with patch("strategies.smc_strategy.EntryLogic.calculate_levels", return_value={'sl': 1.0, 'tp0': 1.2, 'tp1': 1.3, 'tp2': 1.4}):
@@ -201,8 +208,8 @@ async def test_dxy_sell_confluence(mock_data):
 @pytest.mark.asyncio
 async def test_dxy_divergence(mock_data):
     """Line 238: DXY divergence"""
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
-        with patch("main.IndicatorCalculator.calculate_adr", return_value=1.0):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+        with patch("indicators.calculations.IndicatorCalculator.calculate_adr", return_value=1.0):
             with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=10.0):
                 with patch("main.MIN_CONFIDENCE_SCORE", 0):
                     with patch("strategies.smc_strategy.EntryLogic.calculate_levels", return_value={'sl': 1.0, 'tp0': 1.2, 'tp1': 1.3, 'tp2': 1.4}):
@@ -225,7 +232,7 @@ async def test_dxy_divergence(mock_data):
                                 mock_data['m5'] = mock_data['m15'].copy()
                                 mock_data['m5'].iloc[-1, mock_data['m5'].columns.get_loc('low')] = 0.95
                                 
-                                with patch("main.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 1.1, 'asian_low': 1.0})):
+                                with patch("indicators.calculations.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=mock_data['m15'].index, data={'asian_high': 1.1, 'asian_low': 1.0})):
                                     from strategies.smc_strategy import SMCStrategy
                                     mock_signal = {'symbol': 'GC=F', 'direction': 'BUY', 'confidence': 10.0, 'confluence': 'Divergence'}
                                     with patch.object(SMCStrategy, 'analyze', new_callable=AsyncMock, return_value=mock_signal):
@@ -291,7 +298,7 @@ async def test_renderer_success():
                         mock_rend.render_chart.return_value = b"chart"
                         with patch("main.TVChartRenderer", return_value=mock_rend):
                             with patch("main.SignalJournal", return_value=MagicMock()):
-                                with patch("main.NewsFetcher.fetch_news", return_value=[]):
+                                with patch("main.CachedNewsFetcher.fetch_news", return_value=[]):
                                     await main()
                                     mock_tel.send_chart.assert_called()
 
@@ -24,10 +24,10 @@ async def test_process_symbol():
     data['m15'].iloc[-1, data['m15'].columns.get_loc('close')] = 1.13 # Recovery
     
     # Mock components used in process_symbol
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
         with patch("strategies.smc_strategy.DisplacementAnalyzer.is_displaced", return_value=True):
             with patch("strategies.smc_strategy.EntryLogic.check_pullback", return_value={'entry_price': 1.1, 'ema_zone': 1.1, 'rsi_val': 50}):
-                with patch("main.IndicatorCalculator.calculate_poc", return_value=1.1):
+                with patch("indicators.calculations.IndicatorCalculator.calculate_poc", return_value=1.1):
                     with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=9.5):
                         with patch("strategies.smc_strategy.RiskManager.calculate_lot_size", return_value={'lots': 0.01, 'risk_cash': 1.0, 'risk_percent': 2.0, 'pips': 10, 'warning': ''}):
                             with patch("strategies.smc_strategy.RiskManager.calculate_layers", return_value=[]):
@@ -37,8 +37,8 @@ async def test_process_symbol():
                                     ai_mock = MagicMock()
                                     ai_mock.validate_signal = AsyncMock(return_value={'valid': True, 'institutional_logic': 'Banks buying', 'score_adjustment': 0.1})
                                     
-                                    with patch("main.IndicatorCalculator.calculate_adr", return_value=pd.Series(index=data['h1'].index, data=100.0)):
-                                        with patch("main.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=data['m15'].index, data={'asian_high': 1.11, 'asian_low': 1.1})):
+                                    with patch("indicators.calculations.IndicatorCalculator.calculate_adr", return_value=pd.Series(index=data['h1'].index, data=100.0)):
+                                        with patch("indicators.calculations.IndicatorCalculator.calculate_asian_range", return_value=pd.DataFrame(index=data['m15'].index, data={'asian_high': 1.11, 'asian_low': 1.1})):
                                             from strategies.smc_strategy import SMCStrategy
                                             mock_signal = {'symbol': symbol, 'direction': 'BUY', 'confidence': 9.5}
                                             with patch.object(SMCStrategy, 'analyze', new_callable=AsyncMock, return_value=mock_signal):
@@ -56,7 +56,7 @@ async def test_process_symbol_no_sweep():
     data = create_mock_data()
     # No sweep here, just flat
     
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
         with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=5.0): # Low score
              from strategies.smc_strategy import SMCStrategy
              
@@ -71,7 +71,7 @@ async def test_process_symbol_low_confidence():
     symbol = "EURUSD=X"
     data = create_mock_data()
     
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
         with patch("strategies.smc_strategy.DisplacementAnalyzer.is_displaced", return_value=True):
              with patch("strategies.smc_strategy.EntryLogic.check_pullback", return_value={'entry_price': 1.1}):
                  with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=6.0): # < 8.0
@@ -91,7 +91,7 @@ async def test_process_symbol_ai_rejection():
     symbol = "EURUSD=X"
     data = create_mock_data()
     
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
          with patch("strategies.smc_strategy.DisplacementAnalyzer.is_displaced", return_value=True):
              with patch("strategies.smc_strategy.EntryLogic.check_pullback", return_value={'entry_price': 1.1}):
                  with patch("strategies.smc_strategy.ScoringEngine.calculate_score", return_value=9.0):
@@ -124,7 +124,7 @@ async def test_process_symbol_gold_dxy_confluence():
     symbol = "GC=F"
     data = create_mock_data()
     
-    with patch("main.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+    with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
         with patch("strategies.smc_strategy.DisplacementAnalyzer.is_displaced", return_value=True):
              # Ensure DXY logic is mocked if needed
              pass
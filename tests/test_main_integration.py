@@ -3,10 +3,21 @@ import pandas as pd
 import asyncio
 from datetime import datetime, timedelta
 from unittest.mock import patch, AsyncMock, MagicMock
+from data.news_archive import NewsArchive
+from filters.ai_score_cache import AIScoreCache
 
 class BreakLoop(BaseException):
     pass
 
+@pytest.fixture(autouse=True)
+def isolated_databases(tmp_path):
+    """main() archives calendars and caches grades in throwaway DBs, never database/*.db."""
+    cache = AIScoreCache(str(tmp_path / "ai_cache.db"))
+    with patch("main.NewsArchive", lambda: NewsArchive(str(tmp_path / "news_archive.db"))), \
+         patch("filters.ai_score_cache.AI_CACHE_PATH", str(tmp_path / "ai_cache.db")), \
+         patch.object(AIScoreCache, "shared", lambda *args, **kwargs: cache):
+        yield
+
 @pytest.mark.asyncio
 async def test_integration_full_trading_cycle():
     """
@@ -85,7 +96,7 @@ async def test_integration_full_trading_cycle():
             mock_fetcher.get_latest_data.return_value = market_data
             mock_fetcher_class.return_value = mock_fetcher
             
-            with patch("main.NewsFetcher") as mock_news_class:
+            with patch("main.CachedNewsFetcher") as mock_news_class:
                 mock_news = MagicMock()
                 mock_news.fetch_news.return_value = []
                 mock_news_class.return_value = mock_news
@@ -150,7 +161,7 @@ async def test_integration_local_mode_deduplication():
             mock_fetcher.get_latest_data.side_effect = mock_get_data
             mock_fetcher_class.return_value = mock_fetcher
             
-            with patch("main.NewsFetcher") as mock_news_class:
+            with patch("main.CachedNewsFetcher") as mock_news_class:
                 mock_news = MagicMock()
                 mock_news.fetch_news.return_value = []
                 mock_news_class.return_value = mock_news
@@ -173,7 +184,7 @@ async def test_integration_empty_market_data():
             }
             mock_fetcher_class.return_value = mock_fetcher
             
-            with patch("main.NewsFetcher") as mock_news_class:
+            with patch("main.CachedNewsFetcher") as mock_news_class:
                 mock_news = MagicMock()
                 mock_news.fetch_news.return_value = []
                 mock_news_class.return_value = mock_news
@@ -212,7 +223,7 @@ async def test_integration_news_rejection():
             mock_fetcher.get_latest_data.return_value = market_data
             mock_fetcher_class.return_value = mock_fetcher
             
-            with patch("main.NewsFetcher") as mock_news_class:
+            with patch("main.CachedNewsFetcher") as mock_news_class:
                 mock_news = MagicMock()
                 mock_news.fetch_news.return_value = high_impact_news
                 mock_news_class.return_value = mock_news
@@ -256,7 +267,7 @@ async def test_integration_multi_strategy_concurrency():
             mock_fetcher.get_latest_data.return_value = market_data
             mock_fetcher_class.return_value = mock_fetcher
             
-            with patch("main.NewsFetcher") as mock_news_class:
+            with patch("main.CachedNewsFetcher") as mock_news_class:
                 mock_news = MagicMock()
                 mock_news.fetch_news.return_value = []
                 mock_news_class.return_value = mock_news
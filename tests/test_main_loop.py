@@ -3,12 +3,19 @@ import os
 from main import main
 from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime
+from data.news_archive import NewsArchive
+
+@pytest.fixture(autouse=True)
+def isolated_news_archive(tmp_path):
+    """main() archives calendars to a throwaway DB, never database/news_archive.db."""
+    with patch("main.NewsArchive", lambda: NewsArchive(str(tmp_path / "news_archive.db"))):
+        yield
 
 @pytest.mark.asyncio
 async def test_main_loop_single_shot():
     # Test main() in single-shot mode (GITHUB_ACTIONS=true)
     with patch.dict(os.environ, {"GITHUB_ACTIONS": "true"}):
-        with patch("main.NewsFetcher.fetch_news", return_value=[]):
+        with patch("main.CachedNewsFetcher.fetch_news", return_value=[]):
             with patch("main.DataFetcher.get_latest_data", return_value={}):
                 with patch("main.TelegramService") as mock_tg_cls:
                     mock_tg = MagicMock()
@@ -33,7 +40,7 @@ async def test_main_loop_with_signal():
         }
         # Mocking h1 dates to avoid index errors in process_symbol (though we mock process_symbol itself)
         
-        with patch("main.NewsFetcher.fetch_news", return_value=[]):
+        with patch("main.CachedNewsFetcher.fetch_news", return_value=[]):
             with patch("main.DataFetcher.get_latest_data", return_value=mock_data):
                 with patch("main.process_symbol", AsyncMock(return_value={'symbol': 'EURUSD=X', 'confidence': 9.0})):
                     with patch("main.CorrelationAnalyzer.filter_signals", return_value=[{'symbol': 'EURUSD=X', 'confidence': 9.0}]):
@@ -54,3 +61,16 @@ async def test_main_loop_with_signal():
                                 with patch("main.SignalJournal"):
                                     await main()
                                     mock_tg.send_chart.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_main_shuts_down_pool_when_scan_raises():
+    # Actions mode re-raises scan errors; the worker pool is still shut down
+    with patch.dict(os.environ, {"GITHUB_ACTIONS": "true"}), \
+         patch("main.EXECUTION_MODE", "process"), \
+         patch("main.ProcessPoolScanner") as mock_scanner_cls, \
+         patch("main.CachedNewsFetcher.fetch_news", side_effect=RuntimeError("calendar down")), \
+         patch("main.TelegramService"), patch("main.AIAnalyst"), \
+         patch("main.TVChartRenderer"), patch("main.SignalJournal"):
+        with pytest.raises(RuntimeError, match="calendar down"):
+            await main()
+    mock_scanner_cls.return_value.shutdown.assert_called_once()
@@ -0,0 +1,54 @@
+import asyncio
+
+import joblib
+import pytest
+
+from filters.ml_pregrader import MLPreGrader
+from indicators.calculations import IndicatorCalculator
+from tests.helpers import RsiModel, SlowClient, make_frame, make_grader
+
+def test_features_match_training_inputs():
+    data = {
+        'm15': IndicatorCalculator.add_indicators(make_frame(300, "15min", 1, open_noise=0.0004, wick=0.001), "m15"),
+        'h1': IndicatorCalculator.add_indicators(make_frame(300, "1h", 2, open_noise=0.0004, wick=0.001), "h1"),
+    }
+    features = MLPreGrader.features(data, "BUY")
+    bar = data['m15'].iloc[-1]
+    assert list(features) == list(MLPreGrader.FEATURES)
+    assert features['rsi'] == pytest.approx(bar['rsi'])
+    assert features['atr_norm'] == pytest.approx(bar['atr'] / bar['close'])
+    assert features['displaced'] == float(bar['displaced_buy'])
+    assert features['h1_trend'] in (1.0, -1.0)
+    # Warm-up bars (NaN indicators) give no feature vector
+    assert MLPreGrader.features({'m15': data['m15'].iloc[:5], 'h1': data['h1']}, "BUY") is None
+
+    # The shipped model scores the vector
+    probs = MLPreGrader(joblib.load("training/win_prob_model.joblib")).predict([features, None])
+    assert 0.0 <= probs[0] <= 1.0 and probs[1] is None
+
+def test_attach_sets_win_prob_in_one_call():
+    model = RsiModel()
+    signals = [
+        {'symbol': 'EURUSD=X', 'ml_features': dict(rsi=80, body_ratio=0.5, atr_norm=0.001, displaced=1, h1_trend=1)},
+        {'symbol': 'GBPUSD=X', 'ml_features': None},
+        {'symbol': 'USDJPY=X', 'ml_features': dict(rsi=30, body_ratio=0.5, atr_norm=0.001, displaced=0, h1_trend=-1)},
+    ]
+    MLPreGrader(model).attach(signals)
+    assert model.calls == [2]
+    assert [s.get('win_prob') for s in signals] == [0.8, None, 0.3]
+    assert not any('ml_features' in s for s in signals)
+
+@pytest.mark.asyncio
+async def test_grader_skips_llm_for_confident_rejects():
+    client = SlowClient()
+    model = RsiModel()
+    grader = make_grader(client, batch_window=0.01, pregrader=MLPreGrader(model, reject_below=0.35))
+
+    def setup(symbol, rsi):
+        return {'symbol': symbol, 'direction': 'BUY', 'rsi': rsi,
+                'ml_features': dict(rsi=rsi, body_ratio=0.5, atr_norm=0.001, displaced=1, h1_trend=1)}
+
+    scores = await asyncio.gather(grader.get_score(setup('EURUSD=X', 20)), grader.get_score(setup('GBPUSD=X', 60)))
+    assert scores == [2.0, 8.0]  # rejected setup scored from its win probability
+    assert model.calls == [2] and len(client.prompts) == 1 and 'GBPUSD' in client.prompts[0]
+    assert grader.prefiltered == 1
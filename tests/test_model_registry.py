@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from filters.ml_pregrader import MLPreGrader
+from training.model_registry import FEATURES, LEGACY_VERSION, ModelHandle, ModelRegistry
+
+class ConstantModel:
+    """Picklable model stand-in: every row gets win probability `p`; counts batched calls."""
+    calls = []
+
+    def __init__(self, p, classes=2):
+        self.p = p
+        self.classes = classes
+
+    def predict_proba(self, X):
+        ConstantModel.calls.append((self.p, len(X), list(X.columns)))
+        row = [1 - self.p, self.p] + [0.0] * (self.classes - 2)
+        return np.array([row] * len(X))
+
+def rows(n):
+    return [dict(rsi=50.0 + i, body_ratio=0.5, atr_norm=0.001, displaced=1.0, h1_trend=1.0) for i in range(n)]
+
+def test_versions_are_lazy_warmed_and_hot_swapped(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "models"), legacy_path=str(tmp_path / "none.joblib"))
+    v1 = registry.register(ConstantModel(0.6), train_window={'samples': 100}, metrics={'accuracy': 0.61})
+    assert registry.active_version() == v1
+    assert registry.metadata(v1)['metrics'] == {'accuracy': 0.61}
+
+    ConstantModel.calls = []
+    handle = ModelHandle(registry, warmup_rows=8)
+    assert handle.version is None and not handle.refresh()  # Nothing loaded before first use
+
+    # One vectorized call for the whole cycle (after the 8-row warm-up), columns in model order
+    grader = MLPreGrader(handle)
+    reordered = [{k: row[k] for k in reversed(FEATURES)} for row in rows(5)]
+    assert grader.predict(reordered) == [0.6] * 5
+    assert ConstantModel.calls == [(0.6, 8, list(FEATURES)), (0.6, 5, list(FEATURES))]
+    assert handle.version == v1
+
+    # A retrained version goes live on the next refresh, warmed before the swap
+    v2 = registry.register(ConstantModel(0.2), warmup_sample=[list(r.values()) for r in rows(3)])
+    ConstantModel.calls = []
+    assert handle.refresh() and handle.version == v2 and handle.swaps == 1
+    assert ConstantModel.calls == [(0.2, 3, list(FEATURES))]
+    assert grader.predict(rows(2)) == [0.2, 0.2]
+    assert not handle.refresh()
+
+    # Rolling back is just re-activating the old version
+    registry.activate(v1)
+    assert handle.refresh() and grader.predict(rows(1)) == [0.6]
+    with pytest.raises(ValueError):
+        registry.activate("v-missing")
+
+def test_prune_keeps_newest_and_active_versions(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "models"), legacy_path=str(tmp_path / "none.joblib"))
+    with patch("training.model_registry.datetime") as clock:
+        versions = []
+        for day in range(1, 5):
+            clock.now.return_value = datetime(2026, 1, day, tzinfo=timezone.utc)
+            versions.append(registry.register(ConstantModel(0.5)))
+    registry.activate(versions[0])  # Rolled back to the oldest
+
+    assert registry.prune(keep=2) == versions[1:2]
+    assert registry.versions() == [versions[0]] + versions[2:]
+    assert registry.active_version() == versions[0] and registry.prune(keep=2) == []
+
+def test_broken_version_never_replaces_the_serving_one(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "models"), legacy_path=str(tmp_path / "none.joblib"))
+    good = registry.register(ConstantModel(0.7))
+    handle = ModelHandle(registry)
+    assert handle.current() is not None
+
+    registry.register(ConstantModel(0.9, classes=3))  # Fails the warm-up shape check
+    assert not handle.refresh()
+    assert handle.version == good
+    assert MLPreGrader(handle).predict(rows(1)) == [0.7]
+
+def test_legacy_model_and_missing_model(tmp_path):
+    legacy = ModelRegistry(str(tmp_path / "empty"))  # Shipped training/win_prob_model.joblib
+    assert legacy.active_version() == LEGACY_VERSION
+    probs = MLPreGrader(ModelHandle(legacy)).predict(rows(4))
+    assert len(probs) == 4 and all(0.0 <= p <= 1.0 for p in probs)
+
+    nothing = ModelHandle(ModelRegistry(str(tmp_path / "empty"), legacy_path=str(tmp_path / "none.joblib")))
+    grader = MLPreGrader(nothing)
+    assert not grader.available
+    assert grader.predict(rows(2)) == [None, None]
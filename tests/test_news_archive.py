@@ -0,0 +1,54 @@
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+from data.news_archive import NewsArchive
+from data.news_fetcher import CachedNewsFetcher
+from filters.news_filter import NewsFilter
+
+WEEK_1 = [
+    {"country": "USD", "impact": "High", "date": "2025-06-06T08:30:00-04:00", "title": "Non-Farm Employment Change", "forecast": "130K", "previous": "177K"},
+    {"country": "EUR", "impact": "High", "date": "2025-06-05T12:15:00Z", "title": "Main Refinancing Rate", "forecast": "2.15%", "previous": "2.40%"},
+    {"country": "GBP", "impact": "Low", "date": "2025-06-04T08:30:00Z", "title": "Construction PMI"},
+]
+WEEK_2 = [
+    # Same NFP event re-published with the actual value
+    dict(WEEK_1[0], actual="139K"),
+    {"country": "USD", "impact": "High", "date": "2025-06-11T08:30:00-04:00", "title": "CPI m/m", "forecast": "0.2%", "previous": "0.2%"},
+]
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = NewsArchive(db_path=str(tmp_path / "news_archive.db"))
+    archive.append(WEEK_1)
+    archive.append(WEEK_2)
+    return archive
+
+def test_overlapping_snapshots_are_deduplicated(archive):
+    assert len(archive) == 4
+    events = archive.query("2025-06-01", "2025-06-30")
+    assert [e['title'] for e in events] == ["Construction PMI", "Main Refinancing Rate", "Non-Farm Employment Change", "CPI m/m"]
+    assert events[2]['actual'] == "139K"
+
+def test_range_query_filters(archive):
+    usd_high = archive.query("2025-06-06", "2025-06-07", currencies=["USD"], impacts=["High"])
+    assert [e['title'] for e in usd_high] == ["Non-Farm Employment Change"]
+    assert archive.query("2025-07-01", "2025-07-31") == []
+
+def test_historical_news_filter(archive):
+    index = archive.query("2025-06-01", "2025-06-30")
+    nfp = pd.Timestamp("2025-06-06T12:30:00Z")
+    assert not NewsFilter.is_news_safe(index, "EURUSD=X", check_time=nfp - pd.Timedelta(minutes=5))
+    assert NewsFilter.is_news_safe(index, "EURUSD=X", check_time=nfp - pd.Timedelta(hours=3))
+    assert NewsFilter.is_news_safe(index, "GBPJPY=X", check_time=nfp)
+
+def test_fetcher_archives_new_payloads(tmp_path):
+    archive = MagicMock()
+    response = MagicMock(status_code=200, headers={'ETag': '"a"'})
+    response.json.return_value = WEEK_1
+    session = MagicMock()
+    session.get.return_value = response
+
+    fetcher = CachedNewsFetcher(cache_path=str(tmp_path / "news.json"), session=session, clock=lambda: 1000.0, archive=archive)
+    fetcher.fetch_news()
+    archive.append.assert_called_once()
+    assert list(archive.append.call_args[0][0]) == WEEK_1
@@ -0,0 +1,109 @@
+import pytest
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from data.news_fetcher import CachedNewsFetcher
+from filters.news_index import NewsIndex
+
+NOW = datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc).timestamp()
+
+class CalendarServer:
+    """Local stand-in for the Forex Factory calendar endpoint."""
+    def __init__(self, events):
+        self.events = events
+        self.etag = '"v1"'
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                if self.headers.get('If-None-Match') == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = json.dumps(server.events).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('ETag', server.etag)
+                self.send_header('Last-Modified', 'Mon, 05 Jan 2026 07:00:00 GMT')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/calendar.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def event(title, date, impact="Medium", country="USD"):
+    return {"title": title, "country": country, "impact": impact, "date": date, "forecast": "", "previous": ""}
+
+@pytest.fixture
+def server():
+    srv = CalendarServer([event("ISM Services PMI", "2026-01-07T15:00:00Z")])
+    yield srv
+    srv.stop()
+
+def test_conditional_requests_on_interval(server, tmp_path):
+    clock = [NOW]
+    fetcher = CachedNewsFetcher(url=server.url, cache_path=str(tmp_path / "news.json"),
+                                refresh_interval=3600, event_refresh_interval=300, clock=lambda: clock[0])
+
+    events = fetcher.fetch_news()
+    assert isinstance(events, NewsIndex) and [e['title'] for e in events] == ["ISM Services PMI"]
+    assert 'If-None-Match' not in server.requests[0]
+
+    # Within the interval: served from memory, no round trip
+    clock[0] += 60
+    assert fetcher.fetch_news() is events
+    assert len(server.requests) == 1
+
+    # Interval elapsed: conditional request, 304 keeps the same index
+    clock[0] += 3600
+    assert fetcher.fetch_news() is events
+    assert server.requests[1]['If-None-Match'] == '"v1"'
+    assert fetcher.stats['not_modified'] == 1
+
+    # Payload changed upstream
+    server.etag = '"v2"'
+    server.events = server.events + [event("CPI m/m", "2026-01-08T13:30:00Z", "High")]
+    clock[0] += 3600
+    assert len(fetcher.fetch_news()) == 2
+
+def test_refresh_tightens_near_high_impact(server, tmp_path):
+    server.events = [event("Non-Farm Employment Change", "2026-01-05T08:40:00Z", "High")]
+    clock = [NOW]
+    fetcher = CachedNewsFetcher(url=server.url, cache_path=str(tmp_path / "news.json"),
+                                refresh_interval=3600, event_refresh_interval=300, clock=lambda: clock[0])
+    fetcher.fetch_news()
+    assert fetcher.next_refresh == NOW + 300
+
+    # Well after the wash zone: back to the normal interval
+    clock[0] = NOW + 3 * 3600
+    fetcher.fetch_news()
+    assert fetcher.next_refresh == clock[0] + 3600
+
+def test_serves_disk_cache_when_remote_down(server, tmp_path):
+    cache_path = str(tmp_path / "news.json")
+    CachedNewsFetcher(url=server.url, cache_path=cache_path, clock=lambda: NOW).fetch_news()
+    server.stop()
+
+    # New process, remote down, refresh due: the persisted payload is served
+    fetcher = CachedNewsFetcher(url=server.url, cache_path=cache_path, refresh_interval=3600,
+                                event_refresh_interval=300, clock=lambda: NOW + 7200)
+    events = fetcher.fetch_news()
+    assert [e['title'] for e in events] == ["ISM Services PMI"]
+    assert fetcher.stats['errors'] == 1
+    assert fetcher.next_refresh == NOW + 7200 + 300
+
+def test_empty_when_nothing_cached(tmp_path):
+    fetcher = CachedNewsFetcher(url="http://127.0.0.1:9/calendar.json", cache_path=str(tmp_path / "news.json"), clock=lambda: NOW)
+    assert fetcher.fetch_news() == []
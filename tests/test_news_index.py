@@ -0,0 +1,55 @@
+import pickle
+import pandas as pd
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytz
+from filters.news_index import NewsIndex
+from filters.news_filter import NewsFilter
+
+EVENTS = [
+    {"country": "USD", "impact": "High", "date": "2026-01-02T08:30:00-05:00", "title": "Non-Farm Employment Change", "forecast": "200K", "previous": "150K"},
+    {"country": "USD", "impact": "Medium", "date": "2026-01-02T10:00:00-05:00", "title": "ISM Services PMI", "forecast": "52.0", "previous": "53.1"},
+    {"country": "EUR", "impact": "High", "date": "2026-01-01T09:00:00Z", "title": "German CPI m/m", "forecast": "0.2%", "previous": "0.2%"},
+    {"country": "USD", "impact": "Low", "date": "2026-01-02T08:35:00-05:00", "title": "Fed Talk"},
+    {"country": "JPY", "impact": "High", "date": "2026-01-02T08:30:00-05:00", "title": "BOJ Rate"},
+    {"country": "USD", "impact": "High", "title": "No date"},
+]
+
+def test_index_is_a_list_of_raw_events():
+    index = NewsIndex(EVENTS)
+    assert list(index) == EVENTS
+    assert index[:2] == EVENTS[:2]
+    assert NewsIndex.of(index) is index
+    assert sorted(index.currencies) == ["EUR", "JPY", "USD"]
+
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored.has_high_impact(["USD"], "2026-01-02T13:40:00Z")
+
+def test_wash_zone_at_any_time():
+    index = NewsIndex(EVENTS)
+    nfp = pd.Timestamp("2026-01-02T13:30:00Z")
+
+    assert index.has_high_impact(["EUR", "USD"], nfp + timedelta(minutes=30))
+    assert not index.has_high_impact(["EUR", "USD"], nfp + timedelta(minutes=31))
+    assert not index.has_high_impact(["GBP"], nfp)
+    assert not NewsFilter.is_news_safe(index, "EURUSD=X", check_time=nfp - timedelta(minutes=10))
+    assert NewsFilter.is_news_safe(index, "EURUSD=X", check_time=nfp - timedelta(hours=2))
+
+    upcoming = NewsFilter.get_upcoming_events(index, "EURUSD=X", check_time=nfp - timedelta(minutes=10))
+    # Low impact and other currencies are excluded
+    assert [e['title'] for e in upcoming] == ["Non-Farm Employment Change"]
+    assert upcoming[0]['minutes_away'] == 10.0
+    assert upcoming[0]['bias'] == "BULLISH"
+    assert upcoming[0]['time'] == datetime(2026, 1, 2, 13, 30, tzinfo=pytz.UTC)
+
+def test_list_input_matches_index():
+    at = pd.Timestamp("2026-01-02T14:50:00Z")
+    assert NewsFilter.get_upcoming_events(EVENTS, "EURUSD=X", check_time=at) == \
+        NewsFilter.get_upcoming_events(NewsIndex(EVENTS), "EURUSD=X", check_time=at)
+    assert [e['title'] for e in NewsFilter.get_upcoming_events(EVENTS, "EURUSD=X", check_time=at)] == ["ISM Services PMI"]
+
+def test_default_check_time_is_now():
+    with patch("filters.news_filter.datetime") as mock_dt:
+        mock_dt.now.return_value = pd.Timestamp("2026-01-01T09:20:00Z")
+        assert NewsFilter.is_news_safe(EVENTS, "EURUSD=X") is False
+        assert NewsFilter.is_news_safe(EVENTS, "GBPJPY=X") is True
@@ -0,0 +1,108 @@
+import pytest
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, AsyncMock, patch
+from engine.shared_frames import SharedFrameSet, attach_frame
+from engine.process_pool import ProcessPoolScanner, DeferredAIGrader
+from filters.ai_grader import AIGrader
+from tests.helpers import make_frame
+
+def pool_frame(periods=300, freq="5min", seed=1):
+    return make_frame(periods, freq, seed, step=0.0005, open_noise=0.0002, wick=0.001)
+
+def make_symbol_data(seed=1):
+    return {
+        'm5': pool_frame(300, "5min", seed),
+        'm15': pool_frame(300, "15min", seed + 1),
+        'h1': pool_frame(300, "1h", seed + 2),
+        'h4': pool_frame(100, "4h", seed + 3),
+        'd1': pool_frame(100, "1D", seed + 4)
+    }
+
+def test_shared_frame_roundtrip():
+    df = pool_frame(50)
+    df['flag'] = df['close'] > df['open']
+    df['regime'] = "RANGING" # object columns are not shared
+
+    with SharedFrameSet() as frames:
+        spec = frames.publish(df)
+        rebuilt = attach_frame(spec)
+
+    assert 'regime' not in rebuilt.columns
+    assert rebuilt['flag'].dtype == bool
+    assert rebuilt['volume'].dtype == df['volume'].dtype
+    pd.testing.assert_index_equal(rebuilt.index, df.index)
+    pd.testing.assert_frame_equal(rebuilt, df.drop(columns=['regime']), check_freq=False)
+
+@pytest.mark.asyncio
+async def test_deferred_grader_records_unknown_setups():
+    setup = {'symbol': 'EURUSD=X', 'direction': 'BUY'}
+    grader = DeferredAIGrader()
+    assert await grader.get_score(setup) == DeferredAIGrader.OPTIMISTIC_SCORE
+    assert grader.requested == [setup]
+
+    graded = DeferredAIGrader(scores={AIGrader.fingerprint(setup): 6.0})
+    assert await graded.get_score(setup) == 6.0
+    assert graded.requested == []
+
+    assert await DeferredAIGrader(fixed_score=7.0).get_score(setup) == 7.0
+
+class GatedStrategy:
+    """Mimics the Breakout gate: confidence is the AI score, rejected below 7.5."""
+    def __init__(self):
+        self.ai_grader = None
+
+    def get_id(self): return "gated"
+    def get_name(self): return "Gated"
+
+    async def analyze(self, symbol, data, news_events, market_context):
+        score = await self.ai_grader.get_score({'symbol': symbol, 'direction': 'BUY'})
+        if score < 7.5:
+            return None
+        return {'symbol': symbol, 'direction': 'BUY', 'confidence': score}
+
+@pytest.mark.asyncio
+async def test_scanner_grades_candidates_on_event_loop():
+    grader = MagicMock()
+    grader.active = True
+    grader.get_score = AsyncMock(side_effect=lambda setup: 9.0 if setup['symbol'] == "EURUSD=X" else 5.0)
+
+    scanner = ProcessPoolScanner(ai_grader=grader, executor=ThreadPoolExecutor(max_workers=2))
+    batch = {'EURUSD=X': make_symbol_data(1), 'GBPUSD=X': make_symbol_data(2)}
+
+    with patch("engine.process_pool._worker_strategies", return_value=[GatedStrategy()]):
+        with patch("engine.process_pool.IndicatorCalculator.add_indicators", side_effect=lambda df, tf: df):
+            signals = await scanner.scan(batch, [], {})
+    scanner.shutdown()
+
+    assert signals['EURUSD=X'] == [('gated', {'symbol': 'EURUSD=X', 'direction': 'BUY', 'confidence': 9.0})]
+    assert signals['GBPUSD=X'] == []
+    # One real grade per distinct candidate setup
+    assert grader.get_score.await_count == 2
+
+@pytest.mark.asyncio
+async def test_scanner_matches_in_process_analysis():
+    from strategies.smc_strategy import SMCStrategy
+    from strategies.breakout_strategy import BreakoutStrategy
+    from strategies.price_action_strategy import PriceActionStrategy
+    from engine.process_pool import build_symbol_frames
+
+    batch = {'EURUSD=X': make_symbol_data(3), 'GC=F': make_symbol_data(4)}
+
+    grader = MagicMock()
+    grader.active = False
+    scanner = ProcessPoolScanner(max_workers=2, ai_grader=grader)
+    try:
+        signals = await scanner.scan({s: {tf: df.copy() for tf, df in d.items()} for s, d in batch.items()}, [], {})
+    finally:
+        scanner.shutdown()
+
+    for symbol, data in batch.items():
+        frames = build_symbol_frames({tf: df.copy() for tf, df in data.items()})
+        expected = []
+        for strategy in [SMCStrategy(), BreakoutStrategy(), PriceActionStrategy()]:
+            strategy.ai_grader = DeferredAIGrader(fixed_score=AIGrader.DEFAULT_SCORE)
+            result = await strategy.analyze(symbol, frames, [], {})
+            if result:
+                expected.append(strategy.get_id())
+        assert [sid for sid, _ in signals[symbol]] == expected
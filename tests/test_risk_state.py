@@ -0,0 +1,86 @@
+import sqlite3
+from datetime import datetime
+from unittest.mock import patch
+
+from audit.journal import SignalJournal
+from filters.risk_manager import RiskManager
+from filters.risk_state import RiskState
+
+def make_signal(symbol="EURUSD=X"):
+    return {
+        'symbol': symbol, 'direction': 'BUY', 'entry_price': 1.1, 'sl': 1.09,
+        'tp0': 1.105, 'tp1': 1.11, 'tp2': 1.12, 'confidence': 8.5, 'session': 'London',
+        'strategy_id': 'smc_institutional'
+    }
+
+def test_state_loads_once_and_follows_journal_events(tmp_path):
+    db_path = str(tmp_path / "signals.db")
+    journal = SignalJournal(db_path)
+    state = RiskState(db_path)
+    journal.subscribe(state.on_journal_event)
+
+    with patch("audit.journal.pd.DataFrame.to_csv"):
+        for _ in range(3):
+            journal.log_signal(make_signal())
+    assert state.open_positions() == 3
+    assert state.open_positions("GBPUSD=X") == 0
+
+    with patch.object(state, "_load", wraps=state._load) as load:
+        for signal_id in (1, 2, 3):
+            journal.update_signal_result(signal_id, 'WIN', 20.0)
+        assert state.recent() == ['WIN', 'WIN', 'WIN']
+        assert state.multiplier() == 1.25
+        assert state.open_positions() == 0
+        assert state.daily_pnl() == 60.0
+        # Own writes arrive as events, no reload from the DB
+        load.assert_not_called()
+
+def test_state_reloads_on_external_writes(tmp_path):
+    db_path = str(tmp_path / "signals.db")
+    SignalJournal(db_path)
+    state = RiskState(db_path)
+    assert state.multiplier() == 1.0
+
+    # Another process (the auditor) resolves trades
+    conn = sqlite3.connect(db_path)
+    for i in range(2):
+        conn.execute("INSERT INTO signals (timestamp, symbol, status) VALUES (?, 'EURUSD=X', 'LOSS')", (f"2026-01-0{i + 1}",))
+    conn.commit()
+    conn.close()
+    assert state.multiplier() == 0.75
+
+def test_missing_db_is_not_created(tmp_path):
+    db_path = tmp_path / "missing.db"
+    state = RiskState(str(db_path))
+    assert state.multiplier() == 1.0
+    assert not db_path.exists()
+
+def test_simulated_state_drives_sizing():
+    now = {'t': datetime(2026, 1, 5, 10)}
+    sim = RiskState(clock=lambda: now['t'])
+    base = RiskManager.calculate_lot_size("EURUSD=X", 1.1001, 1.1000, state=sim)
+
+    for trade_id in range(3):
+        sim.on_open(trade_id, "EURUSD=X", f"2026-01-05 0{trade_id}:00")
+        sim.on_result(trade_id, 'WIN', 1.0, timestamp=f"2026-01-05 0{trade_id}:00")
+    assert sim.daily_pnl() == 3.0
+
+    previous = RiskManager.install(sim)
+    try:
+        boosted = RiskManager.calculate_lot_size("EURUSD=X", 1.1001, 1.1000)
+    finally:
+        RiskManager.install(previous)
+    assert boosted['lots'] > base['lots']
+
+    # A breakeven ends the run; an older loss does not enter the window
+    sim.on_result(3, 'BREAKEVEN', 0.0, timestamp="2026-01-05 04:00")
+    assert sim.multiplier() == 1.0
+    for trade_id in range(4, 9):
+        sim.on_result(trade_id, 'LOSS', -1.0, timestamp=f"2026-01-05 0{trade_id + 1}:00")
+    assert sim.multiplier() == 0.75
+    sim.on_result(99, 'WIN', 1.0, timestamp="2026-01-04 23:00")
+    assert sim.recent() == ['LOSS'] * 5
+
+    # New day resets the daily P&L
+    now['t'] = datetime(2026, 1, 6, 0, 5)
+    assert sim.daily_pnl() == 0.0
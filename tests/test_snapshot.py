@@ -0,0 +1,93 @@
+import pytest
+import numpy as np
+from indicators.snapshot import TailView
+from filters.volatility_filter import VolatilityFilter
+from filters.daily_bias import DailyBias
+from strategy.displacement import DisplacementAnalyzer
+from strategy.entry import EntryLogic
+from tests.helpers import make_frame
+
+def make_indicator_frame(periods=60, seed=7):
+    df = make_frame(periods, "5min", seed, step=0.001, open_noise=0.0005, wick=0.002)
+    rng = np.random.default_rng(seed + 1)
+    df['atr'] = rng.uniform(0.001, 0.003, periods)
+    df['atr_avg'] = 0.002
+    df['ema_20'] = df['close'].rolling(5, min_periods=1).mean()
+    df['rsi'] = rng.uniform(30, 70, periods)
+    df['fvg_bullish'] = df['close'] > df['open']
+    df['regime'] = "TRENDING"
+    return df
+
+def test_snapshot_matches_iloc_row():
+    df = make_indicator_frame()
+    view = TailView.from_frame(df)
+
+    for n in (0, 1, 5):
+        snap = view.prev(n)
+        row = df.iloc[-1 - n]
+        assert snap.time == df.index[-1 - n]
+        assert snap.close == row['close']
+        assert snap.volume == row['volume']
+        assert snap.rsi == row['rsi']
+        assert snap['fvg_bullish'] == row['fvg_bullish']
+        assert snap.get('regime') == "TRENDING"
+        assert snap.get('missing', 0) == 0
+        assert 'atr' in snap and 'missing' not in snap
+
+    # Snapshots are cached per offset and hold plain Python scalars
+    assert view.latest is view.prev(0)
+    assert type(view.latest.close) is float
+    assert type(view.latest['fvg_bullish']) is bool
+    with pytest.raises(AttributeError):
+        view.latest.missing
+
+def test_window_and_bounds():
+    df = make_indicator_frame(10)
+    view = TailView.from_frame(df)
+
+    assert len(view) == 10
+    assert view.time == df.index[-1]
+    np.testing.assert_array_equal(view.window('close', 3), df['close'].iloc[-3:].to_numpy())
+    assert len(view.window('close', 50)) == 10
+    with pytest.raises(IndexError):
+        view.prev(10)
+
+def test_views_are_reused_from_data():
+    df = make_indicator_frame()
+    view = TailView.from_frame(df)
+    assert TailView.of({'m5': df, 'views': {'m5': view}}, 'm5') is view
+    assert isinstance(TailView.of({'m5': df}, 'm5'), TailView)
+    assert TailView.of({'m5': None}, 'm5') is None
+
+def test_filters_agree_on_frame_and_view():
+    df = make_indicator_frame(80)
+    view = TailView.from_frame(df)
+
+    assert VolatilityFilter.is_volatile(view) == VolatilityFilter.is_volatile(df)
+    assert DailyBias.analyze(view) == DailyBias.analyze(df)
+    for direction in ("BUY", "SELL"):
+        assert DisplacementAnalyzer.is_displaced(view, direction) == DisplacementAnalyzer.is_displaced(df, direction)
+        assert DisplacementAnalyzer.is_displaced(view.latest, direction) == DisplacementAnalyzer.is_displaced(df, direction)
+        assert EntryLogic.check_pullback(view, direction) == EntryLogic.check_pullback(df, direction)
+
+def test_precomputed_columns_match_scalar_checks():
+    df = make_indicator_frame(80)
+    df['rsi'] = np.tile([35.0, 45.0, 65.0, 55.0], 20)
+    df['ema_20'] = df['close']
+    df.iloc[10, df.columns.get_loc('high')] = df.iloc[10]['low']  # zero-range bar
+
+    flags = VolatilityFilter.volatile_series(df).to_frame('volatile')
+    flags = flags.join(DisplacementAnalyzer.displaced_series(df)).join(EntryLogic.pullback_series(df))
+    annotated = df.join(flags)
+    assert flags['pullback_buy'].any() and flags['pullback_sell'].any()
+
+    for end in range(2, 81):
+        raw, pre = df.iloc[:end], annotated.iloc[:end]
+        view = TailView.from_frame(pre)
+        assert VolatilityFilter.is_volatile(raw) == flags['volatile'].iloc[end - 1] == VolatilityFilter.is_volatile(view)
+        for direction in ("BUY", "SELL"):
+            col = direction.lower()
+            assert DisplacementAnalyzer.is_displaced(raw, direction) == flags[f'displaced_{col}'].iloc[end - 1]
+            assert DisplacementAnalyzer.is_displaced(view.latest, direction) == flags[f'displaced_{col}'].iloc[end - 1]
+            assert EntryLogic.check_pullback(raw, direction) == EntryLogic.check_pullback(view, direction)
+            assert (EntryLogic.check_pullback(pre, direction) is not None) == flags[f'pullback_{col}'].iloc[end - 1]
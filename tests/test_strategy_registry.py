@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock, patch
+from strategies.registry import StrategyRegistry
+from filters.ai_grader import AIGrader
+
+BUILTINS = {
+    "smc_institutional": "strategies.smc_strategy:SMCStrategy",
+    "breakout_master": "strategies.breakout_strategy:BreakoutStrategy",
+    "price_action_specialist": "strategies.price_action_strategy:PriceActionStrategy",
+}
+
+class PlainStrategy:
+    """Third-party style strategy without an ai_grader argument."""
+    def get_id(self): return "plain"
+    def get_name(self): return "Plain"
+
+def test_registry_shares_one_grader():
+    registry = StrategyRegistry(specs=BUILTINS, enabled=[], use_entry_points=False)
+    strategies = registry.load(["EURUSD=X"])
+
+    assert [s.get_id() for s in strategies] == list(BUILTINS)
+    assert all(s.ai_grader is registry.ai_grader for s in strategies)
+    # Instances are cached
+    assert registry.for_symbol("GBPUSD=X")[0] is strategies[0]
+
+def test_registry_per_symbol_subsets_load_lazily():
+    registry = StrategyRegistry(
+        specs=BUILTINS, enabled=[], symbol_strategies={"GC=F": ["smc_institutional"]}, use_entry_points=False
+    )
+    strategies = registry.load(["GC=F"])
+
+    assert [s.get_id() for s in strategies] == ["smc_institutional"]
+    assert registry.loaded == ["smc_institutional"]
+    assert len(registry.for_symbol("EURUSD=X")) == 3
+
+def test_registry_enablement_and_unknown_ids():
+    registry = StrategyRegistry(specs=BUILTINS, enabled=["breakout_master", "missing"], use_entry_points=False)
+    assert registry.enabled == ["breakout_master"]
+    assert [s.get_id() for s in registry.for_symbol("EURUSD=X")] == ["breakout_master"]
+
+def test_registry_entry_points():
+    ep = MagicMock()
+    ep.name = "plain"
+    ep.load.return_value = PlainStrategy
+
+    with patch("strategies.registry.entry_points", return_value=[ep]):
+        registry = StrategyRegistry(specs={}, enabled=[])
+
+    assert registry.enabled == ["plain"]
+    strategies = registry.for_symbol("EURUSD=X")
+    assert isinstance(strategies[0], PlainStrategy)
+
+def test_disabled_grader_builds_no_client():
+    with patch.dict("os.environ", {"DISABLE_AI_GRADER": "true"}):
+        with patch("filters.ai_grader.AIAnalyst") as mock_analyst:
+            grader = AIGrader()
+            assert grader.active is False
+            mock_analyst.assert_not_called()
@@ -0,0 +1,99 @@
+import json
+import os
+from unittest.mock import patch
+
+from audit.performance_analyzer import PerformanceAnalyzer, StrategyWeights
+
+HEADER = "t,symbol,dir,res,score,strategy_id\n"
+
+def write_rows(path, rows, mode='a'):
+    with open(path, mode) as f:
+        for i, (res, sid) in enumerate(rows):
+            f.write(f"2026-01-12T01:0{i % 10}:00,EURUSD,BUY,{res},9.0,{sid}\n")
+
+def test_weights_follow_appended_rows(tmp_path):
+    journal = tmp_path / "journal.csv"
+    weights_path = tmp_path / "weights.json"
+    journal.write_text(HEADER)
+    write_rows(journal, [('WIN', 'smc_institutional'), ('LOSS', 'smc_institutional'), ('LOSS', 'breakout_master')])
+
+    service = StrategyWeights(str(journal), str(weights_path))
+    weights = service.update()
+    assert weights['smc_institutional'] == 1.25  # 50% WR -> 1 + 0.5 * 0.5
+    assert weights['breakout_master'] == 0.7
+    assert weights['price_action_specialist'] == 1.0
+    assert json.loads(weights_path.read_text()) == weights
+
+    # Appends are folded in from the last offset without re-reading old rows
+    write_rows(journal, [('LOSS', 'smc_institutional')] * 3)
+    offset = service._offset
+    with patch("builtins.open", wraps=open) as opened:
+        weights = service.update()
+    assert service._offset == os.path.getsize(journal) and offset < service._offset
+    assert weights['smc_institutional'] == 0.7  # 20% WR
+    assert service.get('smc_institutional') == 0.7
+    assert opened.call_count == 2  # one tail read, one weights write
+
+    # Nothing new: no recompute, no write
+    assert service.update() is None
+
+def test_partial_lines_and_rewrites(tmp_path):
+    journal = tmp_path / "journal.csv"
+    journal.write_text(HEADER + "2026-01-12T01:00:00,EURUSD,BUY,WIN,9.0,smc_inst")
+    service = StrategyWeights(str(journal), str(tmp_path / "weights.json"))
+    assert service.update() is None  # line not terminated yet
+
+    with open(journal, 'a') as f:
+        f.write("itutional\n")
+    assert service.update()['smc_institutional'] == 1.5
+
+    # A rewritten (truncated) journal is re-read from the start
+    journal.write_text(HEADER)
+    write_rows(journal, [('LOSS', 'smc_institutional')])
+    assert service.update()['smc_institutional'] == 0.7
+
+def test_refresh_reloads_edited_weights_file(tmp_path):
+    weights_path = tmp_path / "weights.json"
+    weights_path.write_text(json.dumps({"breakout_master": 1.3}))
+    service = StrategyWeights(str(tmp_path / "missing.csv"), str(weights_path))
+    assert service.get("breakout_master") == 1.3
+    assert service.get("unknown") == 1.0
+    assert service.refresh() is False
+
+    weights_path.write_text(json.dumps({"breakout_master": 0.7, "extra": 1.1}))
+    assert service.refresh() is True
+    assert service.get("breakout_master") == 0.7
+
+def test_analyzer_uses_shared_service(tmp_path):
+    journal = tmp_path / "journal.csv"
+    journal.write_text(HEADER)
+    write_rows(journal, [('WIN', 'breakout_master')] * 2)
+    analyzer = PerformanceAnalyzer(str(journal))
+    analyzer.weights_path = str(tmp_path / "weights.json")
+
+    assert analyzer.calculate_weights()['breakout_master'] == 1.5
+    # Unchanged journal: served from memory
+    assert analyzer.calculate_weights()['breakout_master'] == 1.5
+    assert analyzer.service is StrategyWeights.shared(str(journal), analyzer.weights_path)
+
+    assert PerformanceAnalyzer(str(tmp_path / "none.csv")).calculate_weights() == {
+        "smc_institutional": 1.0, "breakout_master": 1.0, "price_action_specialist": 1.0
+    }
+
+def test_weights_file_is_sorted_and_only_written_on_change(tmp_path):
+    journal = tmp_path / "journal.csv"
+    weights_path = tmp_path / "weights.json"
+    journal.write_text(HEADER)
+    write_rows(journal, [('LOSS', 'zeta_strategy'), ('WIN', 'alpha_strategy')])
+
+    service = StrategyWeights(str(journal), str(weights_path))
+    service.update()
+    keys = list(json.loads(weights_path.read_text()))
+    assert keys == sorted(keys)
+    assert service.has_strategy_column
+
+    # Another row that leaves every weight as it was does not rewrite the file
+    os.utime(weights_path, (0, 0))
+    write_rows(journal, [('LOSS', 'zeta_strategy')])
+    assert service.update() is not None
+    assert os.path.getmtime(weights_path) == 0
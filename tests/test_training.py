@@ -41,6 +41,20 @@ def create_realistic_sweep_data(num_bars=300):
         'volume': volume
     })
 
+@pytest.fixture(autouse=True)
+def isolated_registry(tmp_path):
+    """Trained models go to a throwaway registry, never training/models."""
+    from training.model_registry import ModelRegistry
+    with patch("training.trainer.ModelRegistry", lambda: ModelRegistry(str(tmp_path / "models"))):
+        yield
+
+@pytest.fixture(autouse=True)
+def isolated_news_archive(tmp_path):
+    """Calendar history comes from a throwaway archive, never database/news_archive.db."""
+    from data.news_archive import NewsArchive
+    with patch("training.data_collector.NewsArchive", lambda: NewsArchive(str(tmp_path / "news_archive.db"))):
+        yield
+
 @pytest.fixture
 def mock_training_data():
     df = pd.DataFrame({
@@ -63,6 +77,21 @@ def test_trainer_with_data(mock_training_data):
                         train_model()
                         mock_save.assert_called()
 
+def test_trainer_registers_version(mock_training_data, tmp_path):
+    """Trainer stores a new registry version with features, window and metrics"""
+    from training.model_registry import FEATURES, ModelHandle, ModelRegistry
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    data = mock_training_data.assign(time=pd.date_range("2026-01-01", periods=60, freq="h").astype(str))
+    with patch("pandas.read_csv", return_value=data):
+        with patch("sqlite3.connect"):
+            with patch("pandas.read_sql_query", return_value=pd.DataFrame()):
+                version = train_model(registry=registry)
+    assert registry.active_version() == version
+    meta = registry.metadata(version)
+    assert meta['features'] == list(FEATURES) and 'accuracy' in meta['metrics']
+    assert meta['train_window']['samples'] == 60 and meta['train_window']['start'].startswith("2026-01-01")
+    assert ModelHandle(registry).predict_proba(data[list(FEATURES)]).shape == (60, 2)
+
 def test_trainer_no_data():
     """Test trainer when CSV doesn't exist"""
     with patch("os.path.exists", return_value=False):
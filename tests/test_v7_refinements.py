@@ -2,7 +2,9 @@ import pytest
 import pandas as pd
 import sqlite3
 import os
-from audit.optimizer import AutoOptimizer
+from unittest.mock import patch
+from config.config import ATR_MULTIPLIER
+from audit.optimizer import AutoOptimizer, MultiplierCache
 from filters.risk_manager import RiskManager
 from strategy.entry import EntryLogic
 
@@ -81,3 +83,41 @@ def test_risk_manager_argument_count():
     res = RiskManager.calculate_lot_size("EURUSD=X", 1.0500, 1.0400)
     assert 'lots' in res
     assert res['lots'] > 0
+
+def test_multiplier_cache_recomputes_on_resolved_count(tmp_path):
+    db_path = str(tmp_path / "signals.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE signals (id INTEGER PRIMARY KEY, symbol TEXT, status TEXT)")
+    for _ in range(5):
+        conn.execute("INSERT INTO signals (symbol, status) VALUES ('EURUSD=X', 'WIN')")
+    conn.commit()
+
+    cache = MultiplierCache(db_path)
+    with patch.object(cache.optimizer, "get_optimized_multipliers", wraps=cache.optimizer.get_optimized_multipliers) as compute:
+        assert cache.get("EURUSD=X") == 1.8
+        assert cache.get("EURUSD=X") == 1.8
+        assert cache.get("GBPUSD=X") == ATR_MULTIPLIER
+        assert compute.call_count == 1
+
+        # A pending signal does not change the resolved count
+        conn.execute("INSERT INTO signals (symbol, status) VALUES ('EURUSD=X', 'PENDING')")
+        conn.commit()
+        assert cache.get("EURUSD=X") == 1.8
+        assert compute.call_count == 1
+
+        # Resolving trades does
+        for _ in range(5):
+            conn.execute("INSERT INTO signals (symbol, status) VALUES ('EURUSD=X', 'BE')")
+        conn.commit()
+        assert cache.get("EURUSD=X") == 1.2
+        assert compute.call_count == 2
+
+        # In-process journal result events invalidate without a DB change
+        cache.on_journal_event('result', {'id': 1, 'status': 'WIN'})
+        cache.get("EURUSD=X")
+        assert compute.call_count == 3
+    conn.close()
+
+    stats = cache.stats()
+    assert stats['lookups'] == 6 and stats['misses'] == 3
+    assert stats['hit_rate'] == 0.5
@@ -1,15 +1,18 @@
-import joblib
 import pandas as pd
-import os
+from training.model_registry import ModelRegistry
 
 def inspect_model():
-    model_path = "training/win_prob_model.joblib"
-    if not os.path.exists(model_path):
+    # V16.0: Inspect the registry's active version
+    registry = ModelRegistry()
+    version = registry.active_version()
+    if version is None:
         print("❌ Model file not found.")
         return
 
-    print(f"🧠 Loading Model: {model_path}")
-    model = joblib.load(model_path)
+    print(f"🧠 Loading Model: {version}")
+    model, meta = registry.load(version)
+    if meta.get('metrics'):
+        print(f"Metrics: {meta['metrics']} | Window: {meta.get('train_window')}")
     
     # Check if it has feature importances (RandomForest/GradientBoosting)
     if hasattr(model, "feature_importances_"):
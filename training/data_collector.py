@@ -1,12 +1,14 @@
 import asyncio
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from config.config import SYMBOLS, EMA_TREND, EMA_FAST, EMA_SLOW
 from data.fetcher import DataFetcher
 from indicators.calculations import IndicatorCalculator
-from strategy.displacement import DisplacementAnalyzer
 from strategy.entry import EntryLogic
+from engine.alignment import TimeframeAlignment
+from data.news_archive import NewsArchive
+from filters.news_filter import NewsFilter
 import logging
 
 # Setup Logging
@@ -19,6 +21,7 @@ async def collect_training_data(days=50):
     
     start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     end_date = datetime.now().strftime("%Y-%m-%d")
+    news_index = NewsArchive().query(start_date, datetime.now(timezone.utc))
     
     for symbol in SYMBOLS:
         logger.info(f"  Processing {symbol}...")
@@ -33,17 +36,21 @@ async def collect_training_data(days=50):
         m15_df = IndicatorCalculator.add_indicators(m15_df, "15m")
         m5_df = IndicatorCalculator.add_indicators(m5_df, "5m")
         
+        # V16.0: M15 bar -> last closed H1 bar, computed once (no look-ahead)
+        alignment = TimeframeAlignment(m15_df.index, {'h1': h1_df.index}, base_tf='m15')
+        
         idx = 100
         while idx < len(m15_df):
             t = m15_df.index[idx]
             latest_m15 = m15_df.iloc[idx]
             
             # 1. H1 Narrative
-            state_h1 = h1_df[h1_df.index <= t]
-            if state_h1.empty: 
+            h1_idx = alignment.position('h1', idx)
+            if h1_idx < 0: 
                 idx += 1
                 continue
-            h1_trend_val = 1 if state_h1.iloc[-1]['close'] > state_h1.iloc[-1][f'ema_{EMA_TREND}'] else -1
+            latest_h1 = h1_df.iloc[h1_idx]
+            h1_trend_val = 1 if latest_h1['close'] > latest_h1[f'ema_{EMA_TREND}'] else -1
             
             # 2. Potential Sweep
             state_m15 = m15_df.iloc[:idx+1]
@@ -67,7 +74,8 @@ async def collect_training_data(days=50):
             rsi = latest_m15['rsi']
             body_ratio = abs(latest_m15['close'] - latest_m15['open']) / (latest_m15['high'] - latest_m15['low']) if (latest_m15['high'] - latest_m15['low']) != 0 else 0
             atr_norm = latest_m15['atr'] / latest_m15['close']
-            displaced = 1 if DisplacementAnalyzer.is_displaced(state_m15, direction) else 0
+            # V16.0: Precomputed displacement column, no per-bar slice needed
+            displaced = 1 if latest_m15[f'displaced_{direction.lower()}'] else 0
             
             # 4. Levels & Outcome
             atr = latest_m15['atr']
@@ -85,12 +93,14 @@ async def collect_training_data(days=50):
                     if future_bar['low'] <= levels['tp2']: win_loss = 1; break
             
             dataset.append({
+                'time': t,
                 'symbol': symbol,
                 'rsi': rsi,
                 'body_ratio': body_ratio,
                 'atr_norm': atr_norm,
                 'displaced': displaced,
                 'h1_trend': h1_trend_val,
+                'news_safe': 1 if NewsFilter.is_news_safe(news_index, symbol, check_time=t) else 0,
                 'outcome': win_loss
             })
             idx += 24 # Avoid overlapping setups for training purity
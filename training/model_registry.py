@@ -0,0 +1,224 @@
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config.config import MODEL_REGISTRY_DIR, MODEL_REGISTRY_KEEP, MODEL_WARMUP_ROWS
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ('rsi', 'body_ratio', 'atr_norm', 'displaced', 'h1_trend')
+LEGACY_MODEL_PATH = "training/win_prob_model.joblib"
+LEGACY_VERSION = "legacy"
+
+
+class ModelRegistry:
+    """
+    V16.0: Versioned win-probability models on disk.
+
+    Each version is <root>/<version>/ with model.joblib and meta.json (features,
+    training window, metrics); <root>/ACTIVE names the version to serve. Versions
+    and the pointer are written to temp paths and renamed into place, so readers
+    never see a partial write. Until a version is registered, the pre-registry
+    training/win_prob_model.joblib is served as version 'legacy'.
+    """
+    ACTIVE_FILE = "ACTIVE"
+
+    def __init__(self, root: str = MODEL_REGISTRY_DIR, legacy_path: str = LEGACY_MODEL_PATH):
+        self.root = root
+        self.legacy_path = legacy_path
+
+    def _path(self, version: str, name: str = "") -> str:
+        return os.path.join(self.root, version, name)
+
+    def versions(self) -> List[str]:
+        """Registered versions, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(v for v in os.listdir(self.root)
+                      if not v.startswith('.') and os.path.exists(self._path(v, "meta.json")))
+
+    def active_version(self) -> Optional[str]:
+        """The version to serve: ACTIVE, else the newest registered one, else 'legacy' (None if no model)."""
+        try:
+            with open(os.path.join(self.root, self.ACTIVE_FILE)) as f:
+                version = f.read().strip()
+            if version == LEGACY_VERSION or os.path.exists(self._path(version, "meta.json")):
+                return version
+        except OSError:
+            pass
+        versions = self.versions()
+        if versions:
+            return versions[-1]
+        return LEGACY_VERSION if os.path.exists(self.legacy_path) else None
+
+    def metadata(self, version: str) -> dict:
+        if version == LEGACY_VERSION:
+            return {'version': LEGACY_VERSION, 'features': list(FEATURES)}
+        with open(self._path(version, "meta.json")) as f:
+            return json.load(f)
+
+    def load(self, version: str) -> Tuple[object, dict]:
+        """(model, metadata) for a version."""
+        path = self.legacy_path if version == LEGACY_VERSION else self._path(version, "model.joblib")
+        return joblib.load(path), self.metadata(version)
+
+    def register(self, model, features=FEATURES, train_window: Optional[dict] = None,
+                 metrics: Optional[dict] = None, warmup_sample: Optional[list] = None,
+                 activate: bool = True) -> str:
+        """Stores a trained model as a new version (activated by default) and returns its name."""
+        os.makedirs(self.root, exist_ok=True)
+        version = base = datetime.now(timezone.utc).strftime("v%Y%m%d-%H%M%S")
+        suffix = 1
+        while os.path.isdir(self._path(version)):
+            suffix += 1
+            version = f"{base}-{suffix}"
+
+        meta = {
+            'version': version,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'features': list(features),
+            'train_window': train_window or {},
+            'metrics': metrics or {},
+            'warmup_sample': warmup_sample or []
+        }
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.root)
+        try:
+            joblib.dump(model, os.path.join(staging, "model.joblib"))
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f, indent=2, default=str)
+            os.replace(staging, self._path(version))
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        logger.info(f"📁 Registered win-probability model {version}")
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str):
+        """Points ACTIVE at `version`; running ModelHandles swap to it on their next refresh()."""
+        if version != LEGACY_VERSION and version not in self.versions():
+            raise ValueError(f"Unknown model version: {version}")
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".active-", dir=self.root)
+        with os.fdopen(fd, "w") as f:
+            f.write(version)
+        os.replace(tmp, os.path.join(self.root, self.ACTIVE_FILE))
+
+    def prune(self, keep: int = MODEL_REGISTRY_KEEP) -> List[str]:
+        """Deletes all but the `keep` newest versions (never the active one); returns the deleted ones."""
+        active = self.active_version()
+        versions = self.versions()
+        removed = [v for v in versions[:-max(keep, 1)] if v != active]
+        for version in removed:
+            shutil.rmtree(self._path(version), ignore_errors=True)
+        if removed:
+            logger.info(f"🧹 Pruned model versions: {', '.join(removed)}")
+        return removed
+
+
+class ModelHandle:
+    """
+    V16.0: The live win-probability model, used wherever a fitted model was.
+
+    The registry's active version is loaded on first use, not at import. Each
+    refresh() checks for a newly activated version, loads it and warms it with a
+    batch predict_proba to the side, then swaps it in with a single reference
+    assignment: a prediction always runs against one complete version, and a
+    version that fails to load or warm never replaces the serving one.
+    """
+
+    def __init__(self, registry: Optional[ModelRegistry] = None, warmup_rows: int = MODEL_WARMUP_ROWS):
+        self.registry = registry or ModelRegistry()
+        self.warmup_rows = warmup_rows
+        self.swaps = 0
+        self._active = None  # (version, model, features)
+        self._resolved = False
+        self._rejected = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        active = self._active
+        return active[0] if active else None
+
+    def current(self):
+        """The serving model, loaded on first use (None when no model is available)."""
+        active = self._active if self._resolved else self._first_load()
+        return active[1] if active else None
+
+    def _first_load(self):
+        with self._lock:
+            if not self._resolved:
+                version = self.registry.active_version()
+                if version is not None:
+                    try:
+                        self._active = self._prepare(version)
+                    except Exception as e:
+                        logger.error(f"Win-probability model {version} failed to load: {e}")
+                        self._rejected = version
+                self._resolved = True
+        return self._active
+
+    def _prepare(self, version: str) -> tuple:
+        model, meta = self.registry.load(version)
+        features = tuple(meta.get('features') or FEATURES)
+        rows = np.asarray(meta.get('warmup_sample') or np.zeros((self.warmup_rows, len(features))), dtype=float)
+        proba = model.predict_proba(pd.DataFrame(rows[:self.warmup_rows], columns=list(features)))
+        if np.shape(proba) != (min(len(rows), self.warmup_rows), 2):
+            raise ValueError(f"warm-up returned shape {np.shape(proba)}")
+        return version, model, features
+
+    def refresh(self) -> bool:
+        """Swaps in the registry's active version if it changed. True when a swap happened."""
+        if not self._resolved:
+            return False  # Not used yet: the first prediction loads the active version
+        version = self.registry.active_version()
+        if version is None or version == self.version or version == self._rejected:
+            return False
+        try:
+            prepared = self._prepare(version)
+        except Exception as e:
+            logger.error(f"Win-probability model {version} rejected, keeping {self.version}: {e}")
+            self._rejected = version
+            return False
+        previous, self._active = self.version, prepared
+        self.swaps += 1
+        logger.info(f"🔁 Win-probability model swapped: {previous} -> {version}")
+        return True
+
+    def predict_proba(self, X):
+        """Class probabilities from the serving version (DataFrame columns ordered to its features)."""
+        active = self._active if self._resolved else self._first_load()
+        if active is None:
+            raise RuntimeError("No win-probability model available")
+        _, model, features = active
+        if isinstance(X, pd.DataFrame):
+            X = X[list(features)]
+        return model.predict_proba(X)
+
+
+if __name__ == "__main__":
+    # python -m training.model_registry [activate <version> | prune]
+    registry = ModelRegistry()
+    if len(sys.argv) == 3 and sys.argv[1] == "activate":
+        registry.activate(sys.argv[2])
+    elif len(sys.argv) == 2 and sys.argv[1] == "prune":
+        registry.prune()
+    active = registry.active_version()
+    for version in registry.versions():
+        meta = registry.metadata(version)
+        print(f"{'*' if version == active else ' '} {version}  metrics={meta.get('metrics')}  window={meta.get('train_window')}")
+    if active == LEGACY_VERSION:
+        print(f"* {LEGACY_VERSION}  ({registry.legacy_path})")
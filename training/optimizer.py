@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from config.config import SYMBOLS
 from data.fetcher import DataFetcher
 from indicators.calculations import IndicatorCalculator
+from engine.alignment import TimeframeAlignment
 
 async def run_optimization():
     print("📈 Starting Parameter Optimization Sweep...")
@@ -41,15 +42,18 @@ async def run_optimization():
                 m15_df = IndicatorCalculator.add_indicators(m15_df, "15m")
                 m5_df = IndicatorCalculator.add_indicators(m5_df, "5m")
                 
+                alignment = TimeframeAlignment(m15_df.index, {'h1': h1_df.index}, base_tf='m15')
+                
                 idx = 50
                 while idx < len(m15_df):
                     t = m15_df.index[idx]
                     latest_m15 = m15_df.iloc[idx]
                     
-                    state_h1 = h1_df[h1_df.index <= t]
-                    if state_h1.empty: idx += 1; continue
+                    h1_idx = alignment.position('h1', idx)
+                    if h1_idx < 0: idx += 1; continue
+                    latest_h1 = h1_df.iloc[h1_idx]
                     
-                    trend = "BULL" if state_h1.iloc[-1]['close'] > state_h1.iloc[-1]['test_ema'] else "BEAR"
+                    trend = "BULL" if latest_h1['close'] > latest_h1['test_ema'] else "BEAR"
                     
                     # Sweep Detection (approx)
                     state_m15 = m15_df.iloc[:idx+1]
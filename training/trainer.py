@@ -2,16 +2,18 @@ import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
-import joblib
 import os
 import sqlite3
 import logging
+from typing import Optional
+from config.config import MODEL_WARMUP_ROWS
+from training.model_registry import FEATURES, ModelRegistry
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def train_model():
+def train_model(registry: Optional[ModelRegistry] = None):
     logger.info("🧠 Training Winning Probability Model (Hybrid Mode)...")
     
     if not os.path.exists("training/historical_data.csv"):
@@ -34,7 +36,7 @@ def train_model():
         logger.warning(f"⚠️ Warning: Dataset too small ({len(df)} samples). Model may be unreliable.")
 
     # Features: RSI, Body Ratio, Normalized ATR, Displaced (Binary), H1 Trend (1/-1)
-    X = df[['rsi', 'body_ratio', 'atr_norm', 'displaced', 'h1_trend']]
+    X = df[list(FEATURES)]
     y = df['outcome']
 
     # Split
@@ -60,9 +62,21 @@ def train_model():
     print("\nReport:")
     print(classification_report(y_test, y_pred))
 
-    # Save
-    joblib.dump(model, "training/win_prob_model.joblib")
-    logger.info("📁 Model saved to training/win_prob_model.joblib")
+    # V16.0: Save as a new registry version; running scanners hot-swap to it
+    window = {'samples': len(df), 'train_samples': len(X_train), 'test_samples': len(X_test)}
+    if 'time' in df:
+        window.update(start=str(df['time'].min()), end=str(df['time'].max()))
+    if 'symbol' in df:
+        window['symbols'] = sorted(df['symbol'].unique())
+    version = (registry or ModelRegistry()).register(
+        model,
+        features=FEATURES,
+        train_window=window,
+        metrics={'accuracy': round(float(acc), 4)},
+        warmup_sample=X_test.head(MODEL_WARMUP_ROWS).values.tolist()
+    )
+    logger.info(f"📁 Model saved as version {version}")
+    return version
 
 if __name__ == "__main__":
     train_model()